@@ -1,8 +1,8 @@
 import pandas as pd
 import re
+import os
+import argparse
 from collections import Counter
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 def clean_text(text):
     if pd.isna(text):
@@ -53,9 +53,46 @@ def extract_locations(text):
         locations.append(location)
     return locations
 
-def analyze_investors():
+def load_investor_text(parquet_dir=None):
+    if parquet_dir:
+        # Only the raw_text column is read from the Parquet dataset
+        from output_sinks import read_dataset
+        return read_dataset(os.path.join(parquet_dir, 'raw'), columns=['raw_text']).rename(columns={'raw_text': 'all_text'})
     # Read the CSV file
-    df = pd.read_csv('investor_data.csv')
+    return pd.read_csv('investor_data.csv')
+
+def plot_investors(investors_df, role_counts, category_counts):
+    # matplotlib and seaborn are slow to import, so text-only runs never load them
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(12, 6))
+    sns.countplot(data=investors_df, y='role', order=role_counts.index)
+    plt.title('Distribution of Investor Roles')
+    plt.tight_layout()
+    plt.savefig('investor_roles.png')
+    
+    if 'min' in investors_df.columns and 'max' in investors_df.columns:
+        plt.figure(figsize=(10, 6))
+        sns.boxplot(data=investors_df[['min', 'max']])
+        plt.title('Investment Range Distribution')
+        plt.ylabel('Amount (K)')
+        plt.tight_layout()
+        plt.savefig('investment_ranges.png')
+    
+    # Create category distribution plot
+    plt.figure(figsize=(15, 8))
+    top_categories = dict(category_counts.most_common(15))
+    plt.barh(list(top_categories.keys()), list(top_categories.values()))
+    plt.title('Top 15 Investment Categories')
+    plt.xlabel('Number of Investors')
+    plt.tight_layout()
+    plt.savefig('investment_categories.png')
+
+def analyze_investors(parquet_dir=None, plots=True):
+    df = load_investor_text(parquet_dir)
     
     # Clean the text data
     df['all_text'] = df['all_text'].apply(clean_text)
@@ -124,28 +161,12 @@ def analyze_investors():
             print(f"{location}: {count}")
         
         # Create visualizations
-        plt.figure(figsize=(12, 6))
-        sns.countplot(data=investors_df, y='role', order=role_counts.index)
-        plt.title('Distribution of Investor Roles')
-        plt.tight_layout()
-        plt.savefig('investor_roles.png')
-        
-        if 'min' in investors_df.columns and 'max' in investors_df.columns:
-            plt.figure(figsize=(10, 6))
-            sns.boxplot(data=investors_df[['min', 'max']])
-            plt.title('Investment Range Distribution')
-            plt.ylabel('Amount (K)')
-            plt.tight_layout()
-            plt.savefig('investment_ranges.png')
-        
-        # Create category distribution plot
-        plt.figure(figsize=(15, 8))
-        top_categories = dict(category_counts.most_common(15))
-        plt.barh(list(top_categories.keys()), list(top_categories.values()))
-        plt.title('Top 15 Investment Categories')
-        plt.xlabel('Number of Investors')
-        plt.tight_layout()
-        plt.savefig('investment_categories.png')
+        if plots:
+            plot_investors(investors_df, role_counts, category_counts)
 
 if __name__ == "__main__":
-    analyze_investors() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Analyze scraped investor list text')
+    parser.add_argument('--parquet', default=None, help='Parquet output directory to read instead of investor_data.csv')
+    parser.add_argument('--no-plots', action='store_true', help='Print the text statistics only, without charts')
+    args = parser.parse_args()
+    analyze_investors(args.parquet, plots=not args.no_plots) 
\ No newline at end of file
@@ -0,0 +1,259 @@
+import argparse
+import gzip
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+LIST_ROW = (
+    '<tr><td><div class="flex"><img src="https://signal-api.nfx.com/images/{i}.jpg">'
+    '<div><a href="/investors/investor-{i}"><strong class="sn-investor-name null">Investor {i}</strong></a> '
+    '<span class="sn-small-link hidden-xs null">Partner</span> '
+    '<a href="/firms/firm-{i}">Firm {i}</a></div></div></td>'
+    '<td class="text-center pt2">$500K ($100K - $2M)</td>'
+    '<td style="max-width: 400px;"><a href="/locations/sf">San Francisco</a><a href="/locations/ny">New York</a></td>'
+    '<td style="max-width: 400px;"><a href="/sectors/saas">SaaS</a><a href="/sectors/fintech">Fintech</a></td></tr>'
+)
+
+SITEMAP_URL = '<url><loc>https://signal.nfx.com/investors/investor-{i}</loc><lastmod>2024-01-01</lastmod></url>'
+
+# Throughput drops or p50 rises larger than this fraction count as regressions
+DEFAULT_TOLERANCE = 0.2
+
+
+def investor_list_html(rows: int) -> str:
+    """A list page shaped like signal.nfx.com's investor tables, with `rows` investors"""
+    body = ''.join(LIST_ROW.format(i=i) for i in range(rows))
+    return (f'<html><head><style>td {{ padding: 4px; }}</style><script>var x = 1;</script></head>'
+            f'<body><header>Signal</header><h1>INVESTORS</h1><table>{body}</table>'
+            f'<footer>NFX</footer></body></html>')
+
+
+def sitemap_xml(urls: int) -> str:
+    entries = ''.join(SITEMAP_URL.format(i=i) for i in range(urls))
+    return (f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>')
+
+
+def write_fixtures(directory: str, rows: int, sitemap_urls: int) -> dict:
+    """Write the synthetic list page and sitemaps; returns their paths"""
+    paths = {
+        'list': os.path.join(directory, f'list_{rows}.html'),
+        'sitemap': os.path.join(directory, f'sitemap_{sitemap_urls}.xml'),
+        'sitemap_gz': os.path.join(directory, f'sitemap_{sitemap_urls}.xml.gz'),
+    }
+    with open(paths['list'], 'w', encoding='utf-8') as f:
+        f.write(investor_list_html(rows))
+    xml = sitemap_xml(sitemap_urls).encode('utf-8')
+    with open(paths['sitemap'], 'wb') as f:
+        f.write(xml)
+    with gzip.open(paths['sitemap_gz'], 'wb') as f:
+        f.write(xml)
+    return paths
+
+
+def _read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _profile_bs4(paths):
+    from bs4 import BeautifulSoup
+    from profile_scraper import ProfileParser
+    parser, pages = ProfileParser(), [_read(p) for p in paths]
+    return lambda i: parser.extract_profile_data(BeautifulSoup(pages[i % len(pages)], 'lxml')), 'pages'
+
+
+def _profile_lxml(paths):
+    from fast_profile_parser import FastProfileParser
+    parser, pages = FastProfileParser(), [_read(p) for p in paths]
+    return lambda i: parser.extract_profile_data(parser.parse(pages[i % len(pages)])), 'pages'
+
+
+def _list_extract(paths):
+    from bs4 import BeautifulSoup
+    from scraper import InvestorListParser
+    parser, html = InvestorListParser(), _read(paths[0])
+    return lambda i: parser.extract_investor_data(BeautifulSoup(html, 'lxml')), 'pages'
+
+
+def _visible_text(paths):
+    from bs4 import BeautifulSoup
+    from scraper import InvestorListParser
+    parser, pages = InvestorListParser(), [_read(p) for p in paths]
+    # extract_all_visible_text decomposes tags, so every iteration parses a fresh soup
+    return lambda i: parser.extract_all_visible_text(BeautifulSoup(pages[i % len(pages)], 'lxml')), 'pages'
+
+
+def _sitemap(paths):
+    from sitemap_stream import SitemapStream, is_investor_profile
+    return lambda i: sum(1 for _ in SitemapStream(paths[0]).urls(is_investor_profile)), 'sitemaps'
+
+
+BENCHMARKS = {
+    'profile_bs4': _profile_bs4,
+    'profile_lxml': _profile_lxml,
+    'list_extract': _list_extract,
+    'visible_text_list': _visible_text,
+    'visible_text_profile': _visible_text,
+    'sitemap_stream': _sitemap,
+    'sitemap_stream_gz': _sitemap,
+}
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    # Nearest-rank percentile
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def run_benchmark(name: str, paths, iterations: int, warmup: int = 1) -> dict:
+    """Time one benchmark; runs in its own process so peak RSS belongs to this benchmark alone"""
+    logging.getLogger().setLevel(logging.WARNING)
+    step, unit = BENCHMARKS[name](paths)
+    for i in range(warmup):
+        step(i)
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        step(i)
+        samples.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    return {
+        'unit': unit,
+        'iterations': iterations,
+        'per_sec': round(iterations / total, 2),
+        'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+        'p99_ms': round(_percentile(samples, 99) * 1000, 3),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE):
+    """Return a message for every benchmark that is slower than the baseline by more than tolerance"""
+    regressions = []
+    for name, result in results['benchmarks'].items():
+        before = baseline.get('benchmarks', {}).get(name)
+        if not before:
+            continue
+        if result['per_sec'] < before['per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['per_sec']} {result['unit']}/s vs baseline {before['per_sec']}")
+        # p99 over a few dozen runs is too noisy to gate on; it is reported, p50 is compared
+        if result['p50_ms'] > before['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {result['p50_ms']} ms vs baseline {before['p50_ms']} ms")
+    return regressions
+
+
+def run_suite(profiles, rows: int = 200, sitemap_urls: int = 50000, iterations: int = 50,
+              sitemap_iterations: int = 5, only=None) -> dict:
+    """Run every benchmark (or those named in `only`), each in a fresh worker process"""
+    profiles = [p for p in profiles if os.path.exists(p)]
+    if not profiles:
+        logger.warning('No profile fixtures found; skipping profile benchmarks')
+    results = {
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'profiles': profiles, 'rows': rows, 'sitemap_urls': sitemap_urls,
+                   'iterations': iterations, 'sitemap_iterations': sitemap_iterations},
+        'benchmarks': {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        fixtures = write_fixtures(directory, rows, sitemap_urls)
+        plan = {
+            'profile_bs4': (profiles, iterations),
+            'profile_lxml': (profiles, iterations),
+            'list_extract': ([fixtures['list']], iterations),
+            'visible_text_list': ([fixtures['list']], iterations),
+            'visible_text_profile': (profiles, iterations),
+            'sitemap_stream': ([fixtures['sitemap']], sitemap_iterations),
+            'sitemap_stream_gz': ([fixtures['sitemap_gz']], sitemap_iterations),
+        }
+        for name, (paths, count) in plan.items():
+            if only and name not in only:
+                continue
+            if not paths:
+                continue
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_benchmark, name, paths, count).result()
+            results['benchmarks'][name] = result
+            logger.info(f"{name}: {result['per_sec']} {result['unit']}/s, p50 {result['p50_ms']} ms, "
+                        f"p99 {result['p99_ms']} ms, peak RSS {result['peak_rss_mb']} MB")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the parsers offline on local HTML fixtures',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            'Runs the profile, list, visible-text and sitemap parsers on the given\n'
+            'fixtures and on synthetic pages, reporting throughput, p50/p99 latency and\n'
+            'peak RSS per benchmark. --save-baseline stores benchmarks/baseline.json;\n'
+            'later runs exit non-zero when throughput or p50 regress beyond --tolerance.'))
+    parser.add_argument('profiles', nargs='*', default=['profile.html'], help='Profile HTML fixtures')
+    parser.add_argument('--rows', type=int, default=200, help='Investors in the synthetic list page')
+    parser.add_argument('--sitemap-urls', type=int, default=50000, help='URLs in the synthetic sitemap')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed runs per page benchmark')
+    parser.add_argument('--sitemap-iterations', type=int, default=5, help='Timed runs per sitemap benchmark')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--output', default=None,
+                        help='Results JSON (defaults to output/benchmarks/bench_<timestamp>.json)')
+    parser.add_argument('--baseline', default=os.path.join('benchmarks', 'baseline.json'),
+                        help='Baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown as a fraction of the baseline before failing')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    results = run_suite(args.profiles, rows=args.rows, sitemap_urls=args.sitemap_urls, iterations=args.iterations,
+                        sitemap_iterations=args.sitemap_iterations, only=args.only)
+
+    output = args.output or os.path.join('output', 'benchmarks', f'bench_{time.strftime("%Y%m%d_%H%M%S")}.json')
+    for path in [output] + ([args.baseline] if args.save_baseline else []):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f'Results written to {path}')
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('params') != results['params']:
+        logger.warning('Baseline was recorded with different parameters; comparing anyway')
+    regressions = compare(results, baseline, args.tolerance)
+    for message in regressions:
+        logger.error(f'Regression: {message}')
+    if not regressions:
+        logger.info(f'No regressions against {args.baseline}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
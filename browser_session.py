@@ -0,0 +1,104 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = 'https://signal.nfx.com'
+
+# Cookies that carry the login; analytics cookies such as _gat expire within a minute and say nothing about it
+AUTH_COOKIES = ('SIGNAL_ACCESS_JWT', 'SIGNAL_ID_JWT')
+
+# Looks for the login markers in the page text inside the browser, so only a boolean crosses the wire
+HAS_LOGIN_MARKER = """
+var text = document.body ? document.body.textContent : '';
+return arguments[0].some(function (marker) { return text.indexOf(marker) !== -1; });
+"""
+
+
+class BrowserSession:
+    def __init__(self, read_cookies, base_url: str = DEFAULT_BASE_URL, rate=None,
+                 expiry_margin: float = 300):
+        """
+        Keeps one authenticated session per Chrome driver
+
+        Cookies are added once when a driver is first used instead of before
+        every page. The session is only re-established when the driver changes,
+        the earliest auth cookie expiry is near, or a page actually redirects to login.
+
+        Args:
+            read_cookies: Callable returning the saved cookie dicts (empty when there are none)
+            base_url (str): Page opened once so cookies can be set on the site's domain
+            rate (RateController): Optional pacing for the base_url navigation
+            expiry_margin (float): Seconds before the earliest auth cookie expiry to refresh the session
+        """
+        self.read_cookies = read_cookies
+        self.base_url = base_url
+        self.rate = rate
+        self.expiry_margin = expiry_margin
+        self._driver = None
+        self.authenticated_at = None
+        self.expires_at = None
+
+    def _activate(self, driver, cookies):
+        self._driver = driver
+        self.authenticated_at = time.time()
+        expiries = [c['expiry'] for c in cookies if c.get('name') in AUTH_COOKIES and c.get('expiry')]
+        self.expires_at = min(expiries) if expiries else None
+
+    def is_active(self, driver) -> bool:
+        if driver is not self._driver:
+            return False
+        return self.expires_at is None or time.time() < self.expires_at - self.expiry_margin
+
+    def ensure(self, driver) -> bool:
+        """Load saved cookies into driver unless its session is still live; False when there are none"""
+        from selenium.common.exceptions import WebDriverException
+
+        if self.is_active(driver):
+            return True
+        cookies = self.read_cookies()
+        if not cookies:
+            return False
+        if self.rate is not None:
+            self.rate.wait(self.base_url)
+        # Cookies can only be set for the domain of the current page
+        driver.get(self.base_url)
+        added = []
+        for cookie in cookies:
+            cookie = dict(cookie)
+            if 'expiry' in cookie and cookie['expiry'] is None:
+                del cookie['expiry']
+            try:
+                driver.add_cookie(cookie)
+                added.append(cookie)
+            except WebDriverException as e:
+                logger.warning(f"Could not add cookie: {cookie.get('name', '')}: {e}")
+        if not added:
+            return False
+        self._activate(driver, added)
+        logger.info(f"Browser session started with {len(added)} cookies")
+        return True
+
+    def mark_authenticated(self, driver, cookies=None):
+        """Record a fresh interactive login on driver"""
+        if cookies is None:
+            cookies = driver.get_cookies()
+        self._activate(driver, cookies)
+
+    def invalidate(self):
+        self._driver = None
+        self.authenticated_at = None
+        self.expires_at = None
+
+    @staticmethod
+    def login_required(driver) -> bool:
+        """True on a login page; checks the URL first and never pulls the page source"""
+        from selenium.common.exceptions import WebDriverException
+        from http_fetcher import LOGIN_MARKERS
+        if 'login' in driver.current_url.lower():
+            return True
+        try:
+            return bool(driver.execute_script(HAS_LOGIN_MARKER, list(LOGIN_MARKERS)))
+        except WebDriverException as e:
+            logger.warning(f"Could not check for a login page: {e}")
+            return False
@@ -0,0 +1,262 @@
+import asyncio
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from browser_session import DEFAULT_BASE_URL
+from crawl_metrics import StageMetrics, add_metrics_arguments, open_metrics
+from http_fetcher import HttpFetcher
+from output_sinks import make_sink
+from page_cache import PageCache
+from rate_control import RateController
+from recrawl import NotModified, RecrawlState
+from sitemap_stream import SitemapStream, is_investor_list, is_investor_profile
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCrawler:
+    def __init__(self, fetch, parse, on_result, on_error=None, concurrency: int = 8,
+                 parse_workers: int = None, metrics: StageMetrics = None, kind: str = 'page'):
+        """
+        Crawl URLs with many fetches in flight
+
+        Fetches and parses run on thread pools, so the event loop only schedules
+        them; requests are paced by the fetcher (HttpFetcher's RateController).
+
+        Args:
+            fetch (callable): Blocking fetch(url) returning HTML, or None on failure; may raise NotModified
+            parse (callable): Blocking parse(url, html) returning a result, or None to defer the URL
+            on_result (callable): on_result(url, result), called on a single writer thread as results complete
+            on_error (callable): Optional on_error(url, error) for failed fetches and parses
+            concurrency (int): Maximum number of requests in flight
+            parse_workers (int): Threads used for parsing (defaults to CPU count)
+            metrics (StageMetrics): Per-stage timings (kept in memory if not given)
+            kind (str): Page kind the timings are labelled with
+        """
+        self.fetch = fetch
+        self.parse = parse
+        self.on_result = on_result
+        self.on_error = on_error
+        self.concurrency = max(1, int(concurrency))
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.metrics = metrics or StageMetrics()
+        self.kind = kind
+        self.deferred = []
+        self.stats = {'succeeded': 0, 'failed': 0, 'deferred': 0, 'unchanged': 0}
+
+    async def _worker(self, work_queue, io_pool, parse_pool, writer):
+        loop = asyncio.get_running_loop()
+        while True:
+            url = await work_queue.get()
+            if url is None:
+                work_queue.task_done()
+                return
+            status = 'failed'
+            try:
+                with self.metrics.stage('fetch_http', kind=self.kind, url=url):
+                    html = await loop.run_in_executor(io_pool, self.fetch, url)
+                if html is None:
+                    raise RuntimeError('Fetch returned no content')
+                with self.metrics.stage('parse_extract', kind=self.kind, url=url):
+                    result = await loop.run_in_executor(parse_pool, self.parse, url, html)
+                if result is None:
+                    self.deferred.append(url)
+                    status = 'deferred'
+                else:
+                    with self.metrics.stage('write', kind=self.kind, url=url):
+                        await loop.run_in_executor(writer, self.on_result, url, result)
+                    status = 'succeeded'
+                self.stats[status] += 1
+            except NotModified:
+                status = 'unchanged'
+                self.stats['unchanged'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"Failed {url}: {str(e)}")
+                if self.on_error:
+                    await loop.run_in_executor(writer, self.on_error, url, str(e))
+            finally:
+                self.metrics.count('crawl_pages_total', kind=self.kind, status=status)
+                work_queue.task_done()
+
+    async def crawl(self, urls) -> dict:
+        """Crawl an iterable of URLs, consuming it lazily, and return run statistics"""
+        started = time.monotonic()
+        # Bounded so a lazy URL source is never materialised in memory
+        work_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        # A single writer thread keeps output sinks free of concurrent writes
+        with ThreadPoolExecutor(max_workers=self.concurrency) as io_pool, \
+                ThreadPoolExecutor(max_workers=self.parse_workers) as parse_pool, \
+                ThreadPoolExecutor(max_workers=1) as writer:
+            workers = [asyncio.create_task(self._worker(work_queue, io_pool, parse_pool, writer))
+                       for _ in range(self.concurrency)]
+            for url in urls:
+                await work_queue.put(url)
+            for _ in workers:
+                await work_queue.put(None)
+            await asyncio.gather(*workers)
+
+        elapsed = time.monotonic() - started
+        self.stats['elapsed'] = round(elapsed, 2)
+        logger.info(f"Crawl finished in {elapsed:.1f}s: {self.stats['succeeded']} succeeded, "
+                    f"{self.stats['failed']} failed, {self.stats['deferred']} deferred to browser, "
+                    f"{self.stats['unchanged']} unchanged")
+        return self.stats
+
+    def run(self, urls) -> dict:
+        return asyncio.run(self.crawl(urls))
+
+
+def open_recrawl(args):
+    """RecrawlState for --incremental runs, kept in output/recrawl.db"""
+    if not args.incremental:
+        return None
+    return RecrawlState(os.path.join(os.getcwd(), 'output', 'recrawl.db'), ttl_days=args.ttl_days)
+
+
+def open_rate(args):
+    """Adaptive per-host pacing shared by the HTTP fetcher and the browser fallback"""
+    return RateController(start_rate=args.start_rate, max_rate=args.max_rate, min_rate=args.min_rate)
+
+
+def crawl_lists(args):
+    """Crawl investor-list pages over HTTP, then hand paginated lists to the browser scraper"""
+    from scraper import SitemapScraper
+
+    cache = PageCache(os.path.join(os.getcwd(), 'output', 'cache')) if args.cache else None
+    recrawl = open_recrawl(args)
+    rate = open_rate(args)
+    fetcher = HttpFetcher(pool_size=args.concurrency, cache=cache, recrawl=recrawl, rate=rate)
+    sink = make_sink(args.output, os.path.join(os.getcwd(), 'output', 'data'))
+    progress = sink if args.output == 'sqlite' else None
+    metrics = open_metrics(args)
+    scraper = SitemapScraper(args.sitemap, fetcher=fetcher, sink=sink, progress=progress, cache=cache, rate=rate,
+                             headless=args.headless, lean=args.lean, base_url=args.base_url, metrics=metrics)
+    try:
+        if recrawl is not None:
+            # Only pages that are new, changed in the sitemap, or past their TTL
+            entries = (e for e in SitemapStream(args.sitemap).entries() if is_investor_list(e[0]))
+            urls = recrawl.select(entries)
+            fetch = fetcher.fetch_if_changed
+        else:
+            urls = (url for url in scraper.iter_sitemap_urls() if not scraper.progress.is_scraped(url))
+            fetch = fetcher.fetch
+
+        def on_result(url, result):
+            raw_data, investors = result
+            if not scraper.save_to_csv([raw_data], investors):
+                raise RuntimeError('Output could not be saved')
+            scraper.save_progress(url)
+            if recrawl is not None:
+                recrawl.commit(url)
+
+        crawler = AsyncCrawler(fetch, scraper.parse_list_html, on_result,
+                               concurrency=args.concurrency, metrics=metrics, kind='list')
+        crawler.run(urls)
+        if crawler.deferred and not args.no_browser:
+            succeeded = scraper.scrape_all(crawler.deferred, skip_scraped=recrawl is None)
+            if recrawl is not None:
+                for url in succeeded:
+                    recrawl.commit(url)
+    finally:
+        scraper.close()
+        if recrawl is not None:
+            recrawl.close()
+
+
+def crawl_profiles(args):
+    """Crawl investor profiles over HTTP, then hand JS-expanded profiles to the browser scraper"""
+    from profile_scraper import ProfileScraper, SitemapScraper as ProfileSitemap
+
+    cache = PageCache(os.path.join(os.getcwd(), 'output', 'cache')) if args.cache else None
+    recrawl = open_recrawl(args)
+    rate = open_rate(args)
+    fetcher = HttpFetcher(pool_size=args.concurrency, cache=cache, recrawl=recrawl, rate=rate)
+    sink = make_sink(args.output, os.getcwd())
+    progress = sink if args.output == 'sqlite' else None
+    metrics = open_metrics(args)
+    scraper = ProfileScraper(data_dir=os.getcwd(), headless=args.headless, fetcher=fetcher,
+                             sink=sink, progress=progress, cache=cache, fast_parser=args.fast_parser,
+                             refresh=recrawl is not None, rate=rate, lean=args.lean,
+                             base_url=args.base_url, metrics=metrics, batch_size=args.batch_size,
+                             on_saved=recrawl.commit_all if recrawl is not None else None)
+    if recrawl is not None:
+        # Only pages that are new, changed in the sitemap, or past their TTL
+        entries = (e for e in SitemapStream(args.sitemap).entries() if is_investor_profile(e[0]))
+        urls = recrawl.select(entries)
+        fetch = fetcher.fetch_if_changed
+    else:
+        sitemap = ProfileSitemap(args.sitemap)
+        # Streamed straight from the sitemap into the crawl queue
+        urls = (url for url in sitemap.iter_investor_links() if not scraper.progress.is_scraped(url))
+        fetch = fetcher.fetch
+
+    def on_result(url, profile):
+        # Recorded as done (and committed to the recrawl state) once its batch is saved
+        scraper.add_profile(url, profile)
+
+    def on_error(url, error):
+        scraper.record_progress(url, 'failed', error=error)
+        scraper.save_error(url, error)
+
+    crawler = AsyncCrawler(fetch, scraper.parse_profile, on_result, on_error=on_error,
+                           concurrency=args.concurrency, metrics=metrics, kind='profile')
+    try:
+        crawler.run(urls)
+        scraper.save_profiles()
+        if not args.no_browser:
+            for url in crawler.deferred:
+                scraper.scrape_profile(url)
+    finally:
+        scraper.save_profiles()
+        scraper.safe_quit_driver()
+        scraper.sink.close()
+        scraper.progress.close()
+        fetcher.close()
+        if cache:
+            cache.close()
+        if recrawl is not None:
+            recrawl.close()
+        metrics.log_summary()
+        metrics.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Asynchronous HTTP crawl of investor lists or profiles')
+    parser.add_argument('target', choices=['lists', 'profiles'], help='Which pages to crawl')
+    parser.add_argument('--sitemap', default='sitemap.xml/sitemap.xml', help='Path or URL of the sitemap')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum number of requests in flight')
+    parser.add_argument('--start-rate', type=float, default=0.3, help='Initial requests per second per host')
+    parser.add_argument('--max-rate', type=float, default=2.0,
+                        help='Ceiling on requests per second per host; the rate adapts below it')
+    parser.add_argument('--min-rate', type=float, default=1 / 60, help='Floor the rate backs off to')
+    parser.add_argument('--batch-size', type=int, default=25, help='Profiles buffered before each save')
+    parser.add_argument('--headless', action='store_true', help='Run the fallback Chrome without a visible window')
+    parser.add_argument('--lean', action='store_true',
+                        help='Headless fallback Chrome that skips images, fonts and media')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL,
+                        help='Site root for the fallback browser\'s login and session cookies')
+    parser.add_argument('--output', choices=['csv', 'parquet', 'sqlite'], default='csv',
+                        help='Output format; sqlite also stores crawl progress')
+    parser.add_argument('--cache', action='store_true', help='Keep raw page HTML in output/cache for re-parsing')
+    parser.add_argument('--no-browser', action='store_true', help='Skip pages that need Chrome instead of falling back')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Refetch only pages that are new, changed in the sitemap, or past --ttl-days, '
+                             'using conditional requests')
+    parser.add_argument('--ttl-days', type=float, default=7, help='Days before an unchanged page is refetched')
+    parser.add_argument('--fast-parser', action='store_true', help='Parse profiles with the single-pass lxml extractor')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.target == 'lists':
+        crawl_lists(args)
+    else:
+        crawl_profiles(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds; browser stages run from milliseconds to tens of seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _label_key(labels: dict):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None) -> str:
+    pairs = list(key) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+class StageMetrics:
+    def __init__(self, jsonl_path: str = None):
+        """
+        Per-stage timings and counters for the crawl pipeline
+
+        stage() times a block into the crawl_stage_seconds histogram, labelled
+        with the page kind and stage name; count() bumps a counter. Every timing
+        is also appended to jsonl_path when given, and render_prometheus() /
+        serve() expose the aggregates in Prometheus text format.
+
+        Args:
+            jsonl_path (str): Optional file that receives one JSON line per timed stage
+        """
+        self.lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._file = None
+        self._server = None
+        if jsonl_path:
+            directory = os.path.dirname(jsonl_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(jsonl_path, 'a', encoding='utf-8')
+
+    def observe(self, stage: str, seconds: float, kind: str = 'page', url: str = None):
+        key = _label_key({'kind': kind, 'stage': stage})
+        with self.lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+            if self._file is not None:
+                record = {'ts': round(time.time(), 3), 'kind': kind, 'stage': stage, 'seconds': round(seconds, 6)}
+                if url:
+                    record['url'] = url
+                self._file.write(json.dumps(record) + '\n')
+
+    @contextmanager
+    def stage(self, stage: str, kind: str = 'page', url: str = None):
+        """Time the enclosed block as one stage; failed stages are timed too"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, kind=kind, url=url)
+
+    def count(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def summary(self) -> dict:
+        """Count, total and mean seconds per (kind, stage)"""
+        with self.lock:
+            return {
+                f"{dict(key)['kind']}/{dict(key)['stage']}": {
+                    'count': h.count, 'total_seconds': round(h.total, 3),
+                    'mean_seconds': round(h.total / h.count, 4) if h.count else 0.0,
+                }
+                for key, h in sorted(self._histograms.items())
+            }
+
+    def render_prometheus(self) -> str:
+        lines = ['# HELP crawl_stage_seconds Time spent in each crawl stage',
+                 '# TYPE crawl_stage_seconds histogram']
+        with self.lock:
+            for key, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float('inf'),), h.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'crawl_stage_seconds_bucket{_format_labels(key, {"le": le})} {cumulative}')
+                lines.append(f'crawl_stage_seconds_sum{_format_labels(key)} {h.total}')
+                lines.append(f'crawl_stage_seconds_count{_format_labels(key)} {h.count}')
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f'# TYPE {name} counter')
+                for (counter, key), value in sorted(self._counters.items()):
+                    if counter == name:
+                        lines.append(f'{name}{_format_labels(key)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """Expose /metrics in Prometheus text format from a background thread"""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render_prometheus().encode('utf-8')
+                self.send_response(200 if self.path.startswith('/metrics') else 404)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f'Serving crawl metrics on http://{host}:{port}/metrics')
+
+    def log_summary(self):
+        for name, stats in self.summary().items():
+            logger.info(f"{name}: {stats['count']} x {stats['mean_seconds']:.3f}s "
+                        f"(total {stats['total_seconds']:.1f}s)")
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def open_metrics(args):
+    """StageMetrics for the --metrics-file / --metrics-port CLI options"""
+    metrics = StageMetrics(jsonl_path=args.metrics_file)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    return metrics
+
+
+def add_metrics_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--metrics-file', default=None, help='Append per-stage timings to this JSONL file')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on this local port at /metrics')
+
+
+def summarize(path: str) -> dict:
+    """Aggregate a metrics JSONL file into count / total / mean / p50 / p95 seconds per kind/stage"""
+    samples = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            samples.setdefault(f"{record['kind']}/{record['stage']}", []).append(record['seconds'])
+    result = {}
+    for name, values in sorted(samples.items()):
+        values.sort()
+        result[name] = {
+            'count': len(values),
+            'total_seconds': round(sum(values), 3),
+            'mean_seconds': round(sum(values) / len(values), 4),
+            'p50_seconds': round(values[(len(values) - 1) // 2], 4),
+            'p95_seconds': round(values[min(len(values) - 1, int(len(values) * 0.95))], 4),
+        }
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Summarize a crawl metrics JSONL file by stage',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            'Crawlers time navigation, settling, Load More, parsing, extraction and\n'
+            'writes per page kind. Record them with --metrics-file metrics.jsonl (one\n'
+            'JSON line per stage) or scrape them live with --metrics-port 9100\n'
+            '(Prometheus /metrics); this prints count, mean, p50 and p95 per stage.'))
+    parser.add_argument('path', help='File written with --metrics-file')
+    args = parser.parse_args()
+    for name, stats in summarize(args.path).items():
+        print(f"{name:32} n={stats['count']:<6} total={stats['total_seconds']:>9.2f}s "
+              f"mean={stats['mean_seconds']:.3f}s p50={stats['p50_seconds']:.3f}s p95={stats['p95_seconds']:.3f}s")
@@ -0,0 +1,220 @@
+import logging
+import os
+import queue
+import random
+import shutil
+import threading
+
+from network_capture import enable_performance_log
+
+logger = logging.getLogger(__name__)
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36'
+]
+
+# Requests a lean driver never makes. Stylesheets still load so visibility checks
+# and native clicks behave as they do in a normal browser.
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav',
+]
+
+LEAN_WINDOW_SIZE = '1280,800'
+
+# Patched chromedriver binaries, one directory per installed Chrome version
+DRIVER_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'nfx-scraper', 'chromedriver')
+
+_patched_path = None
+_patch_lock = threading.Lock()
+
+
+def _is_patched(path: str) -> bool:
+    from undetected_chromedriver.patcher import Patcher
+    return os.path.exists(path) and Patcher(executable_path=path).is_binary_patched(path)
+
+
+def browser_version():
+    """Installed Chrome version, read locally; None if it cannot be determined"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    try:
+        return ChromeDriverManager().driver.get_browser_version_from_os()
+    except Exception as e:
+        logger.warning(f"Could not determine the installed Chrome version: {e}")
+        return None
+
+
+def patched_driver_path(cache_dir: str = DRIVER_CACHE_DIR) -> str:
+    """
+    Path to an undetected-patched chromedriver matching the installed Chrome
+
+    The driver is downloaded and patched once per Chrome version and kept in
+    cache_dir, so later launches (in this process or any other) skip both the
+    download and uc's per-launch patching. The path is resolved once per process.
+    """
+    global _patched_path
+    from undetected_chromedriver.patcher import Patcher
+    from webdriver_manager.chrome import ChromeDriverManager
+    with _patch_lock:
+        if _patched_path is not None:
+            return _patched_path
+        version = browser_version()
+        directory = os.path.join(cache_dir, version or 'unknown')
+        exe_name = 'chromedriver.exe' if os.name == 'nt' else 'chromedriver'
+        target = os.path.join(directory, exe_name)
+        # Without a version the cached copy could be for an older Chrome, so it is rebuilt
+        if version and _is_patched(target):
+            logger.info(f"Using cached chromedriver for Chrome {version}: {target}")
+        else:
+            source = ChromeDriverManager().install()
+            os.makedirs(directory, exist_ok=True)
+            # Patch a private copy and swap it in, so concurrent processes never see a half-written binary
+            staging = f"{target}.{os.getpid()}.tmp"
+            shutil.copyfile(source, staging)
+            os.chmod(staging, 0o755)
+            Patcher(executable_path=staging).patch_exe()
+            os.replace(staging, target)
+            logger.info(f"Cached patched chromedriver for Chrome {version or 'unknown version'}: {target}")
+        _patched_path = target
+        return target
+
+
+def chrome_options(headless: bool = False, lean: bool = False, capture_network: bool = False):
+    """
+    Chrome options shared by every scraper
+
+    A lean profile is always headless, renders no images, returns from
+    driver.get at DOMContentLoaded and uses a smaller viewport. Image URLs are
+    still read from the src attributes, which are in the DOM whether or not the
+    image itself is fetched.
+    """
+    import undetected_chromedriver as uc
+
+    options = uc.ChromeOptions()
+
+    # Anti-detection measures
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-infobars')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-browser-side-navigation')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-notifications')
+    options.add_argument(f'user-agent={random.choice(USER_AGENTS)}')
+
+    if lean:
+        options.add_argument(f'--window-size={LEAN_WINDOW_SIZE}')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+        # Pages are waited on with page_ready, so there is no need to block until every subresource loads
+        options.page_load_strategy = 'eager'
+    else:
+        options.add_argument('--window-size=1920,1080')
+
+    if headless or lean:
+        options.add_argument('--headless=new')
+    if capture_network:
+        enable_performance_log(options)
+    return options
+
+
+def block_resources(driver, patterns=None):
+    """Drop image, font and media requests at the network layer (Chrome DevTools)"""
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns or LEAN_BLOCKED_URLS})
+    except (AttributeError, WebDriverException) as e:
+        logger.warning(f"Could not block resources on this driver: {e}")
+
+
+def create_driver(headless: bool = False, lean: bool = False, capture_network: bool = False):
+    """Start Chrome with the shared options; lean drivers also block heavy resources"""
+    import undetected_chromedriver as uc
+
+    options = chrome_options(headless=headless, lean=lean, capture_network=capture_network)
+    driver = uc.Chrome(options=options, driver_executable_path=patched_driver_path())
+    driver.set_page_load_timeout(30)
+    if lean:
+        block_resources(driver)
+    return driver
+
+
+class DriverFactory:
+    def __init__(self, headless: bool = False, lean: bool = False, capture_network: bool = False):
+        """
+        Hands out Chrome drivers, optionally launched ahead of time
+
+        Drivers started with prespawn() boot in background threads while the
+        caller does other work; get() takes one of those, waits for one that is
+        still starting, or launches a new one when none were requested.
+
+        Args:
+            headless (bool): Run Chrome without a visible window
+            lean (bool): Use the lean profile (see chrome_options)
+            capture_network (bool): Record DevTools network events for network_capture
+        """
+        self.headless = headless
+        self.lean = lean
+        self.capture_network = capture_network
+        self.lock = threading.Lock()
+        self._ready = queue.Queue()
+        self._pending = 0
+        self._closed = False
+
+    def create(self):
+        return create_driver(headless=self.headless, lean=self.lean, capture_network=self.capture_network)
+
+    def _spawn(self):
+        try:
+            driver = self.create()
+        except Exception as e:
+            logger.error(f"Background driver launch failed: {str(e)}")
+            driver = None
+        if driver is not None and self._closed:
+            driver.quit()
+            driver = None
+        # None tells a waiting get() to launch its own driver
+        self._ready.put(driver)
+
+    def prespawn(self, count: int = 1):
+        """Start launching count drivers in the background"""
+        with self.lock:
+            self._pending += count
+        for _ in range(count):
+            threading.Thread(target=self._spawn, daemon=True).start()
+        logger.info(f"Pre-spawning {count} browser(s)")
+
+    def get(self):
+        """A pre-spawned driver if one was requested, otherwise a newly launched one"""
+        with self.lock:
+            prespawned = self._pending > 0
+            if prespawned:
+                self._pending -= 1
+        driver = self._ready.get() if prespawned else None
+        return driver if driver is not None else self.create()
+
+    def close(self):
+        """Quit pre-spawned drivers nobody took"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._ready.get_nowait()
+            except queue.Empty:
+                return
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    logger.error(f"Error closing pre-spawned driver: {str(e)}")
@@ -0,0 +1,335 @@
+import logging
+import re
+import sys
+import time
+
+import lxml.html
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup's get_text() leaves out the contents of these tags
+SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+
+SEE_ALL_INVESTMENTS = re.compile(r'See all .*investments on record')
+
+# Compiled once; used only inside the handful of rows each profile has
+HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+LH_SOLID = etree.XPath('.//*[' + HAS_CLASS.format('lh-solid') + ']')
+VC_LIST_CHIPS = etree.XPath('.//a[' + HAS_CLASS.format('vc-list-chip') + ']')
+LINKS_WITH_HREF = etree.XPath('.//a[@href]')
+F6 = etree.XPath('.//*[' + HAS_CLASS.format('f6') + ']')
+F7 = etree.XPath('.//*[' + HAS_CLASS.format('f7') + ']')
+ROUND_PADDING = etree.XPath('.//div[' + HAS_CLASS.format('round-padding') + ']')
+FIRST_LINK = etree.XPath('.//a')
+
+
+def _strings(el):
+    """Yield the text nodes under el in document order, as BeautifulSoup does"""
+    if el.text:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and child.tag not in SKIP_TEXT_TAGS:
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(el) -> str:
+    return ''.join(_strings(el))
+
+
+def _stripped_text(el, separator: str = '') -> str:
+    return separator.join(s.strip() for s in _strings(el) if s.strip())
+
+
+def _single_string(el):
+    """Equivalent of BeautifulSoup's Tag.string"""
+    children = [c for c in el if c.tag is not etree.Comment]
+    if len(children) == 0:
+        if len(el) == 0:
+            return el.text
+        return None
+    if len(children) == 1 and len(el) == 1 and not el.text and not children[0].tail:
+        return _single_string(children[0])
+    return None
+
+
+class FastProfileParser:
+    """
+    lxml-based equivalent of ProfileParser.extract_profile_data
+
+    The document is walked once, sorting the few nodes each field needs into
+    buckets; only those nodes are then inspected with compiled XPath.
+    Produces exactly the same dict as the BeautifulSoup extractor.
+    """
+
+    def __init__(self):
+        self._class_cache = {}
+
+    def _classes(self, el):
+        classes = self._class_cache.get(el)
+        if classes is None:
+            classes = frozenset(el.get('class', '').split())
+            self._class_cache[el] = classes
+        return classes
+
+    def _has_ancestor(self, el, *required, stop=None):
+        """True if some ancestor of el carries every class in `required`"""
+        parent = el.getparent()
+        while parent is not None and parent is not stop:
+            if self._classes(parent).issuperset(required):
+                return True
+            parent = parent.getparent()
+        return False
+
+    def _nested_in(self, el, inner, outer):
+        """CSS '.outer .inner el': an ancestor with `inner` classes that itself has an ancestor with `outer`"""
+        parent = el.getparent()
+        while parent is not None:
+            if self._classes(parent).issuperset(inner) and self._has_ancestor(parent, *outer):
+                return True
+            parent = parent.getparent()
+        return False
+
+    def _first_descendant(self, el, xpath, *ancestor_classes):
+        for candidate in xpath(el):
+            if not ancestor_classes or self._has_ancestor(candidate, *ancestor_classes):
+                return candidate
+        return None
+
+    def parse(self, html: str):
+        return lxml.html.document_fromstring(html)
+
+    def needs_browser(self, root) -> bool:
+        for button in root.iter('button'):
+            string = _single_string(button)
+            if string is not None and SEE_ALL_INVESTMENTS.search(string):
+                return True
+        return False
+
+    def extract_profile_data(self, root):
+        self._class_cache = {}
+        profile = {
+            'name': '',
+            'current_company': '',
+            'investment_range': '',
+            'investments_on_record': '',
+            'sweet_spot': '',
+            'current_fund_size': '',
+            'experience': [],
+            'sector_rankings': [],
+            'social_links': {},
+            'network_memberships': [],
+            'education': [],
+            'all_previous_investments': [],
+            'image_urls': []
+        }
+
+        carousel_imgs, contact_imgs, thumbnails, storage_imgs = [], [], [], []
+        active_img = None
+        stat_rows, experience_rows, ranking_sections, networks, investment_rows = [], [], [], [], []
+        name_tag = None
+        position_span = None
+        linkset = None
+
+        # Single pass over the document, bucketing candidate nodes per field
+        for el in root.iter(etree.Element):
+            tag = el.tag
+            classes = self._classes(el)
+            if tag == 'img':
+                if self._nested_in(el, ('item',), ('carousel-container-inner',)):
+                    carousel_imgs.append(el)
+                    if active_img is None and self._nested_in(el, ('item', 'active'), ('carousel-container-inner',)):
+                        active_img = el
+                if 'active_storage' in el.get('src', ''):
+                    storage_imgs.append(el)
+            elif tag == 'h1':
+                if name_tag is None and self._has_ancestor(el, 'identity-block'):
+                    name_tag = el
+            elif tag == 'tr':
+                if any(a.tag == 'tbody' and 'past-investments-table-body' in self._classes(a)
+                       for a in el.iterancestors()):
+                    investment_rows.append(el)
+            if not classes:
+                continue
+            if 'contact-card-img' in classes:
+                contact_imgs.append(el)
+            if 'investor-thumbnail' in classes:
+                thumbnails.append(el)
+            if 'line-separated-row' in classes:
+                if 'row' in classes:
+                    stat_rows.append(el)
+                if 'flex' in classes and 'justify-between' in classes:
+                    experience_rows.append(el)
+            if tag == 'span' and position_span is None and el.get('class') == 'section-label lh-solid' \
+                    and _single_string(el) == 'Current Investing Position':
+                position_span = el
+            if tag == 'div' and 'sn-margin-top-30' in classes and 'relative' in classes:
+                ranking_sections.append(el)
+            if linkset is None and 'sn-linkset' in classes:
+                linkset = el
+            if 'mt2' in classes:
+                networks.append(el)
+
+        # Images, in selector order with duplicates dropped
+        for bucket in (carousel_imgs, contact_imgs, thumbnails, storage_imgs):
+            for img in bucket:
+                src = img.get('src')
+                if src is not None and src not in profile['image_urls']:
+                    profile['image_urls'].append(src)
+        if profile['image_urls']:
+            profile['image_url'] = profile['image_urls'][0]
+        if active_img is not None and active_img.get('src') is not None:
+            profile['image_url'] = active_img.get('src')
+
+        # Investment stats
+        for row in stat_rows:
+            label_elem = self._first_descendant(row, LH_SOLID, 'col-xs-5')
+            value_elem = self._first_descendant(row, LH_SOLID, 'col-xs-7')
+            if label_elem is not None and value_elem is not None:
+                label = _text(label_elem).strip(':')
+                value = _text(value_elem).strip()
+
+                if 'Current Investing Position' in label:
+                    profile['current_company'] = value.split(' at ')[-1] if ' at ' in value else value
+                elif 'Investment Range' in label:
+                    profile['investment_range'] = value
+                elif 'Sweet Spot' in label:
+                    profile['sweet_spot'] = value
+                elif 'Current Fund Size' in label:
+                    profile['current_fund_size'] = value
+                elif 'Investments On Record' in label:
+                    profile['investments_on_record'] = value
+
+        profile['name'] = _stripped_text(name_tag).split('(')[0].strip() if name_tag is not None else ''
+
+        if position_span is not None:
+            parent_div = next((a for a in position_span.iterancestors() if a.tag == 'div'), None)
+            company_div = None
+            if parent_div is not None:
+                company_div = next((s for s in parent_div.itersiblings()
+                                    if s.tag == 'div' and 'col-xs-7' in self._classes(s)), None)
+            if company_div is not None:
+                company_links = FIRST_LINK(company_div)
+                profile['current_company'] = _stripped_text(company_links[0]) if company_links \
+                    else _stripped_text(company_div)
+
+        for exp in experience_rows:
+            parts = _stripped_text(exp, '|').split('|')
+            if len(parts) >= 3:
+                profile['experience'].append({
+                    'role': parts[0],
+                    'company': parts[1],
+                    'duration': parts[-1]
+                })
+
+        profile['sector_rankings'] = [
+            _text(a).strip()
+            for section in ranking_sections
+            if 'Sector & Stage Rankings' in _text(section)
+            for a in VC_LIST_CHIPS(section)
+        ]
+
+        if linkset is not None:
+            for link in LINKS_WITH_HREF(linkset):
+                href = link.get('href')
+                if 'linkedin.com' in href:
+                    profile['social_links']['linkedin'] = href
+                elif 'twitter.com' in href:
+                    profile['social_links']['twitter'] = href
+                elif 'angel.co' in href:
+                    profile['social_links']['angellist'] = href
+                elif 'crunchbase.com' in href:
+                    profile['social_links']['crunchbase'] = href
+                elif not any(x in href for x in ['linkedin', 'twitter', 'angel', 'crunchbase']):
+                    profile['social_links']['website'] = href
+
+        # Networks and education share the same .mt2 blocks
+        for network in networks:
+            names = F6(network)
+            counts = F7(network)
+            if names and counts:
+                profile['network_memberships'].append({
+                    'network_name': _text(names[0]).strip(),
+                    'connection_count': ''.join(filter(str.isdigit, _text(counts[0])))
+                })
+        for network in networks:
+            names = F6(network)
+            if names:
+                school = _text(names[0])
+                if 'university' in school.lower() or 'school' in school.lower():
+                    profile['education'].append({
+                        'school': school.strip(),
+                        'degree': 'Not specified',
+                        'year': 'Not specified'
+                    })
+
+        for row in investment_rows:
+            if 'coinvestors-row' in self._classes(row):
+                continue
+            investment = {}
+            children = list(row.iterchildren(etree.Element))
+            stages = [div for cell in row.iter('td') if 'with-coinvestors' in self._classes(cell)
+                      for div in ROUND_PADDING(cell)]
+            stages = list(dict.fromkeys(stages))
+            investment['company'] = _text(stages[0]).strip() if stages else ''
+
+            if stages and len(stages) > 1:
+                stage_info = _text(stages[1]).strip().split('·')
+                if len(stage_info) >= 3:
+                    investment['stage'] = stage_info[0].strip()
+                    investment['date'] = stage_info[1].strip()
+                    investment['round_size'] = stage_info[2].strip()
+
+            # td.with-coinvestors:nth-child(3)
+            third = children[2] if len(children) >= 3 else None
+            total_raised = ROUND_PADDING(third) if third is not None and third.tag == 'td' \
+                and 'with-coinvestors' in self._classes(third) else []
+            investment['total_raised'] = _text(total_raised[0]).strip() if total_raised else ''
+
+            if any(investment.values()):
+                profile['all_previous_investments'].append(investment)
+
+        self._class_cache = {}
+        return profile
+
+
+def check_parity(paths) -> bool:
+    """Compare the fast extractor with the BeautifulSoup one on each HTML file and report timings"""
+    from bs4 import BeautifulSoup
+    from profile_scraper import ProfileParser
+
+    reference, fast = ProfileParser(), FastProfileParser()
+    all_match = True
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        started = time.perf_counter()
+        soup = BeautifulSoup(html, 'lxml')
+        expected = reference.extract_profile_data(soup)
+        expected_browser = reference.needs_browser(soup)
+        reference_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        root = fast.parse(html)
+        actual = fast.extract_profile_data(root)
+        actual_browser = fast.needs_browser(root)
+        fast_time = time.perf_counter() - started
+
+        if actual != expected or actual_browser != expected_browser:
+            all_match = False
+            for key in sorted(set(expected) | set(actual)):
+                if expected.get(key) != actual.get(key):
+                    print(f'{path}: {key} differs\n  expected: {expected.get(key)!r}\n  actual:   {actual.get(key)!r}')
+            if actual_browser != expected_browser:
+                print(f'{path}: needs_browser differs ({expected_browser} vs {actual_browser})')
+        else:
+            print(f'{path}: OK (BeautifulSoup {reference_time * 1000:.1f} ms, lxml {fast_time * 1000:.1f} ms)')
+    return all_match
+
+
+if __name__ == '__main__':
+    files = sys.argv[1:] or ['profile.html']
+    sys.exit(0 if check_parity(files) else 1)
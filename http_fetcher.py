@@ -0,0 +1,126 @@
+import logging
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from recrawl import NotModified, content_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36'
+
+# Text that only appears on the signal.nfx.com login wall
+LOGIN_MARKERS = ('Continue With Google', 'sign up or log in')
+
+
+class HttpFetcher:
+    def __init__(self, cookies=None, pool_size: int = 10, timeout: float = 30, user_agent: str = DEFAULT_USER_AGENT,
+                 cache=None, recrawl=None, rate=None):
+        """
+        Browser-free page fetcher that replays saved session cookies over pooled keep-alive connections
+
+        Args:
+            cookies (list): Cookie dicts as returned by driver.get_cookies()
+            pool_size (int): Maximum number of kept-alive connections per host
+            timeout (float): Request timeout in seconds
+            user_agent (str): User agent sent with every request
+            cache (PageCache): Optional cache that receives every successfully fetched page
+            recrawl (RecrawlState): Optional freshness record used by fetch_if_changed
+            rate (RateController): Optional adaptive per-host pacing; every response is fed back to it
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.recrawl = recrawl
+        self.rate = rate
+        self.session = requests.Session()
+        retries = Retry(total=2, backoff_factor=1, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        if cookies:
+            self.set_cookies(cookies)
+
+    def set_cookies(self, cookies):
+        """Load selenium-style cookie dicts into the session"""
+        for cookie in cookies:
+            try:
+                self.session.cookies.set(
+                    cookie['name'],
+                    cookie['value'],
+                    domain=cookie.get('domain', ''),
+                    path=cookie.get('path', '/')
+                )
+            except Exception as e:
+                logger.warning(f"Could not set cookie: {cookie.get('name', '')}: {e}")
+        logger.info(f"Loaded {len(cookies)} cookies into HTTP session")
+
+    @staticmethod
+    def is_login_page(url: str, html: str) -> bool:
+        return 'login' in url.lower() or any(marker in html for marker in LOGIN_MARKERS)
+
+    def _get(self, url: str, headers=None):
+        if self.rate is not None:
+            self.rate.wait(url)
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+        except requests.RequestException as e:
+            logger.warning(f"HTTP fetch failed for {url}: {e}")
+            if self.rate is not None:
+                self.rate.failure(url, reason='request error')
+            return None
+        elapsed = time.monotonic() - started
+
+        if response.status_code == 304:
+            if self.rate is not None:
+                self.rate.success(url, elapsed)
+            return response
+        if response.status_code != 200:
+            logger.warning(f"HTTP fetch for {url} returned status {response.status_code}")
+            if self.rate is not None and (response.status_code in (403, 429) or response.status_code >= 500):
+                self.rate.failure(url, reason=f'status {response.status_code}')
+            return None
+        if self.is_login_page(response.url, response.text):
+            logger.warning(f"HTTP fetch for {url} was redirected to login")
+            if self.rate is not None:
+                self.rate.failure(url, reason='login redirect', login=True)
+            return None
+        if self.rate is not None:
+            self.rate.success(url, elapsed)
+        if self.cache is not None:
+            self.cache.put(url, response.text)
+        if self.recrawl is not None:
+            self.recrawl.observe(url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                                 content_hash(response.text))
+        return response
+
+    def fetch(self, url: str):
+        """Return the page HTML, or None if the request failed or hit the login wall"""
+        response = self._get(url)
+        if response is None or response.status_code != 200:
+            return None
+        return response.text
+
+    def fetch_if_changed(self, url: str):
+        """
+        Conditional fetch against the last crawl recorded in self.recrawl
+
+        Returns the page HTML or None like fetch(), and raises NotModified on a 304
+        or when the body hashes the same as last time.
+        """
+        response = self._get(url, headers=self.recrawl.validators(url))
+        if response is None:
+            return None
+        if response.status_code == 304 or content_hash(response.text) == self.recrawl.stored_hash(url):
+            self.recrawl.unchanged(url)
+            raise NotModified(url)
+        return response.text
+
+    def close(self):
+        self.session.close()
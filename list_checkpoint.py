@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ListCheckpoints:
+    def __init__(self, directory: str):
+        """
+        Pagination checkpoints for investor lists, one JSON file per list URL
+
+        A checkpoint records how far a list was paginated (Load More clicks and
+        table rows consumed) and the keys of the investors already written to
+        the output sink, so a retry after a crash can fast-forward past those
+        pages and skip rows that are already persisted. The position file is
+        replaced atomically; keys go to an append-only file next to it, so each
+        checkpoint only writes the keys added since the previous one.
+
+        Args:
+            directory (str): Directory holding the checkpoint files
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, suffix: str = '.json') -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + suffix)
+
+    def _load_keys(self, url: str) -> set:
+        keys = set()
+        path = self._path(url, '.keys')
+        if not os.path.exists(path):
+            return keys
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    keys.add(tuple(json.loads(line)))
+                except ValueError:
+                    # A torn last line from a crash; its rows are simply extracted again
+                    continue
+        return keys
+
+    def exists(self, url: str) -> bool:
+        return os.path.exists(self._path(url))
+
+    def load(self, url: str):
+        """The saved state for url, or None when there is no usable checkpoint"""
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint for {url}: {e}")
+            return None
+        if state.get('url') != url:
+            return None
+        state['keys'] = self._load_keys(url)
+        return state
+
+    def save(self, url: str, page: int, row_offset: int, new_keys):
+        """Record that rows up to row_offset (page Load More pages) are written; new_keys are the investors
+        written since the previous checkpoint"""
+        # Keys first: a crash before the position is updated only leaves keys of rows that are already written
+        with open(self._path(url, '.keys'), 'a', encoding='utf-8') as f:
+            for key in new_keys:
+                f.write(json.dumps(list(key)) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        path = self._path(url)
+        staging = f"{path}.{os.getpid()}.tmp"
+        state = {'url': url, 'page': page, 'row_offset': row_offset,
+                 'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        with open(staging, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(staging, path)
+
+    def clear(self, url: str):
+        for suffix in ('.json', '.keys'):
+            try:
+                os.remove(self._path(url, suffix))
+            except FileNotFoundError:
+                pass
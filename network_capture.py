@@ -0,0 +1,142 @@
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Ways the numeric investor id shows up in profile markup and in the site's own API requests
+INVESTOR_ID_PATTERNS = [
+    re.compile(r'data-investor-id=["\'](\d+)["\']'),
+    re.compile(r'["\']?investor_?[iI]d["\']?\s*[:=]\s*["\']?(\d+)'),
+]
+
+# Normalised JSON keys mapped onto the all_previous_investments fields
+INVESTMENT_FIELDS = {
+    'company': ('company', 'companyname', 'firm', 'firmname', 'startup', 'name'),
+    'stage': ('stage', 'roundstage', 'fundingstage', 'series'),
+    'date': ('date', 'announcedon', 'announceddate', 'fundedat', 'rounddate'),
+    'round_size': ('roundsize', 'amount', 'raised', 'roundamount', 'size'),
+    'total_raised': ('totalraised', 'totalfunding', 'companytotalraised', 'totalamountraised'),
+}
+
+
+def enable_performance_log(options):
+    """Ask chromedriver to record DevTools network events for every page"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def drain_json_responses(driver, url_filter=None):
+    """
+    Return [(url, payload)] for JSON responses logged since the last drain
+
+    Reading the performance log empties it, so each call only sees the
+    responses that arrived after the previous one.
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        entries = driver.get_log('performance')
+    except WebDriverException as e:
+        logger.warning(f"Performance log unavailable (was it enabled on the driver?): {e}")
+        return []
+
+    responses = []
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError, TypeError):
+            continue
+        if message.get('method') != 'Network.responseReceived':
+            continue
+        params = message.get('params', {})
+        response = params.get('response', {})
+        if 'json' not in response.get('mimeType', ''):
+            continue
+        if url_filter and not url_filter(response.get('url', '')):
+            continue
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+            responses.append((response['url'], json.loads(body.get('body', ''))))
+        except (WebDriverException, KeyError, ValueError) as e:
+            # Bodies of redirected or evicted responses are no longer available
+            logger.debug(f"Could not read response body for {response.get('url')}: {e}")
+    return responses
+
+
+def derive_investor_id(page_source: str, payloads=()):
+    """Find the profile's numeric investor id in its markup or in the JSON the page loaded"""
+    for pattern in INVESTOR_ID_PATTERNS:
+        match = pattern.search(page_source)
+        if match:
+            return int(match.group(1))
+    for _, payload in payloads:
+        match = INVESTOR_ID_PATTERNS[1].search(json.dumps(payload))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _normalise(key: str) -> str:
+    return re.sub(r'[^a-z]', '', key.lower())
+
+
+def _scalar(value):
+    # Nested objects such as {"company": {"name": ...}} collapse to their name
+    if isinstance(value, dict):
+        for key in ('name', 'displayName', 'label', 'title'):
+            if isinstance(value.get(key), (str, int, float)):
+                return str(value[key]).strip()
+        return ''
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _to_investment(record: dict):
+    keys = {_normalise(k): v for k, v in record.items()}
+    investment = {}
+    for field, candidates in INVESTMENT_FIELDS.items():
+        for candidate in candidates:
+            if candidate in keys:
+                investment[field] = _scalar(keys[candidate])
+                break
+    # A record without a company and at least one round detail is something else
+    if not investment.get('company') or not any(investment.get(f) for f in ('stage', 'date', 'round_size')):
+        return None
+    return {field: investment.get(field, '') for field in INVESTMENT_FIELDS}
+
+
+def _unwrap(item):
+    # GraphQL connections wrap each record as {"node": {...}}
+    if isinstance(item, dict) and isinstance(item.get('node'), dict):
+        return item['node']
+    return item
+
+
+def extract_investments(payloads):
+    """
+    Build all_previous_investments from captured JSON payloads
+
+    Every list of objects in the payloads is tried; the longest list whose
+    records look like funding rounds wins, since the expanded "See all"
+    response supersedes the first page of investments.
+    """
+    best = []
+
+    def walk(value):
+        nonlocal best
+        if isinstance(value, dict):
+            for child in value.values():
+                walk(child)
+        elif isinstance(value, list):
+            records = [_unwrap(item) for item in value]
+            if records and all(isinstance(r, dict) for r in records):
+                investments = [inv for inv in (_to_investment(r) for r in records) if inv]
+                if len(investments) > len(best):
+                    best = investments
+            for item in records:
+                walk(item)
+
+    for _, payload in payloads:
+        walk(payload)
+    return best
@@ -0,0 +1,461 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileCsvWriter:
+    """
+    Appends profiles to a CSV, deduplicating by URL without re-reading the whole file
+
+    A refreshed profile is appended after its old row rather than rewriting the
+    file; readers keep the last row per url, and compact() drops the stale rows.
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.lock = threading.Lock()
+        self._urls = None
+        self._columns = None
+
+    def _load(self):
+        # Only the header and the url column are read, and only once
+        self._urls = set()
+        self._columns = []
+        if os.path.exists(self.output_file) and os.path.getsize(self.output_file) > 0:
+            self._columns = list(pd.read_csv(self.output_file, nrows=0).columns)
+            if 'url' in self._columns:
+                self._urls = set(pd.read_csv(self.output_file, usecols=['url'])['url'])
+            with open(self.output_file, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) not in (b'\n', b'\r'):
+                    # Terminate the last row so appended rows start on their own line
+                    f.write(b'\n')
+
+    def write(self, profiles, replace=False):
+        """
+        Append profiles with unseen URLs; returns (written, total) profile counts
+
+        With replace, profiles whose URL is already in the file are appended again and
+        supersede the old rows.
+        """
+        with self.lock:
+            if self._urls is None:
+                self._load()
+
+            new_data = pd.DataFrame(profiles)
+            if replace:
+                new_data = new_data.drop_duplicates(subset='url', keep='last')
+            else:
+                new_data = new_data[~new_data['url'].isin(self._urls)].drop_duplicates(subset='url')
+            if new_data.empty:
+                return 0, len(self._urls)
+
+            extra_columns = [c for c in new_data.columns if c not in self._columns]
+            if not self._columns:
+                new_data.to_csv(self.output_file, index=False)
+                self._columns = list(new_data.columns)
+            elif extra_columns:
+                # A new field changes the header, so the file is rewritten once for the batch
+                existing_data = pd.read_csv(self.output_file)
+                combined_data = pd.concat([existing_data, new_data], ignore_index=True)
+                combined_data.to_csv(self.output_file, index=False)
+                self._columns = list(combined_data.columns)
+            else:
+                new_data.reindex(columns=self._columns).to_csv(self.output_file, mode='a', header=False, index=False)
+
+            self._urls.update(new_data['url'])
+            return len(new_data), len(self._urls)
+
+    def compact(self):
+        """Rewrite the CSV with the last row per url, atomically replacing the old file"""
+        with self.lock:
+            if not os.path.exists(self.output_file) or os.path.getsize(self.output_file) == 0:
+                return
+            data = pd.read_csv(self.output_file)
+            rows = len(data)
+            data = data.drop_duplicates(subset='url', keep='last')
+            tmp_path = self.output_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                data.to_csv(f, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.output_file)
+            self._urls = set(data['url'])
+            self._columns = list(data.columns)
+        logger.info(f"Compacted {self.output_file} from {rows} to {len(data)} rows")
+
+
+class CsvSink:
+    def __init__(self, data_dir: str, raw_file: str = 'raw_data.csv', investors_file: str = 'validinvestors.csv',
+                 profiles_file: str = 'investor_profiles.csv'):
+        """
+        CSV output; nested fields are stored as Python repr strings
+
+        Args:
+            data_dir (str): Directory the CSV files live in
+            raw_file (str): File name for raw list-page text
+            investors_file (str): File name for investors extracted from list pages
+            profiles_file (str): File name for investor profiles
+        """
+        self.raw_filename = os.path.join(data_dir, raw_file)
+        self.investors_filename = os.path.join(data_dir, investors_file)
+        self.errors_filename = os.path.join(data_dir, 'scraper_errors.csv')
+        self.profiles = ProfileCsvWriter(os.path.join(data_dir, profiles_file))
+        self.lock = threading.Lock()
+
+    def _append(self, filename, rows):
+        df = pd.DataFrame(rows)
+        with self.lock:
+            write_header = not os.path.exists(filename)
+            df.to_csv(filename, mode='a', index=False, header=write_header)
+        return len(df)
+
+    def write_raw(self, rows):
+        if rows:
+            count = self._append(self.raw_filename, rows)
+            logger.info(f'Appended {count} raw records to {self.raw_filename}')
+
+    def write_investors(self, rows):
+        if rows:
+            count = self._append(self.investors_filename, rows)
+            logger.info(f'Appended {count} investor records to {self.investors_filename}')
+
+    def write_profiles(self, rows, replace=False):
+        """Returns (written, total) profile counts; replace overwrites profiles already saved"""
+        if not rows:
+            return 0, 0
+        return self.profiles.write(rows, replace=replace)
+
+    def write_error(self, url, error):
+        with self.lock:
+            pd.DataFrame([{
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'url': url,
+                'error': error
+            }]).to_csv(self.errors_filename, mode='a', header=not os.path.exists(self.errors_filename))
+
+    def flush(self):
+        """Every write is appended to its file before returning, so there is nothing buffered"""
+
+    def describe(self, dataset: str) -> str:
+        return {'raw': self.raw_filename, 'investors': self.investors_filename,
+                'profiles': self.profiles.output_file, 'errors': self.errors_filename}[dataset]
+
+    def close(self):
+        pass
+
+
+def _parquet_schemas():
+    import pyarrow as pa
+
+    string_list = pa.list_(pa.string())
+    return {
+        'raw': pa.schema([
+            ('url', pa.string()),
+            ('raw_text', pa.string()),
+            ('scrape_timestamp', pa.string()),
+            ('error', pa.string()),
+        ]),
+        'investors': pa.schema([
+            ('name', pa.string()),
+            ('company', pa.string()),
+            ('role', pa.string()),
+            ('profile_url', pa.string()),
+            ('company_url', pa.string()),
+            ('image_url', pa.string()),
+            ('investment_range', pa.string()),
+            ('locations', string_list),
+            ('categories', string_list),
+            ('source_url', pa.string()),
+            ('scrape_timestamp', pa.string()),
+        ]),
+        'profiles': pa.schema([
+            ('name', pa.string()),
+            ('current_company', pa.string()),
+            ('investment_range', pa.string()),
+            ('investments_on_record', pa.string()),
+            ('sweet_spot', pa.string()),
+            ('current_fund_size', pa.string()),
+            ('experience', pa.list_(pa.struct([
+                ('role', pa.string()), ('company', pa.string()), ('duration', pa.string())]))),
+            ('sector_rankings', string_list),
+            ('social_links', pa.struct([
+                ('linkedin', pa.string()), ('twitter', pa.string()), ('angellist', pa.string()),
+                ('crunchbase', pa.string()), ('website', pa.string())])),
+            ('network_memberships', pa.list_(pa.struct([
+                ('network_name', pa.string()), ('connection_count', pa.string())]))),
+            ('education', pa.list_(pa.struct([
+                ('school', pa.string()), ('degree', pa.string()), ('year', pa.string())]))),
+            ('all_previous_investments', pa.list_(pa.struct([
+                ('company', pa.string()), ('stage', pa.string()), ('date', pa.string()),
+                ('round_size', pa.string()), ('total_raised', pa.string())]))),
+            ('image_urls', string_list),
+            ('image_url', pa.string()),
+            ('url', pa.string()),
+            ('timestamp', pa.string()),
+            ('status', pa.string()),
+        ]),
+        'errors': pa.schema([
+            ('timestamp', pa.string()),
+            ('url', pa.string()),
+            ('error', pa.string()),
+        ]),
+    }
+
+
+class ParquetSink:
+    def __init__(self, output_dir: str, row_group_size: int = 500, part_rows: int = 5000):
+        """
+        Parquet output with nested fields stored as native list/struct columns
+
+        Each dataset (raw, investors, profiles, errors) is a directory of part files,
+        each holding up to part_rows rows in row groups of row_group_size. Until a
+        part is full its rows live in memory and, once flush() is called, in an
+        fsynced JSON-lines spool next to it, so callers can flush() before recording
+        a page as done without writing a tiny part file every time. A part is
+        written complete and renamed into place, then its spool is removed; close()
+        writes the last, partly filled parts. read_dataset() also reads spools left
+        by a crash, and compact_dataset() merges everything into one part.
+
+        Args:
+            output_dir (str): Root directory for the datasets
+            row_group_size (int): Rows per Parquet row group
+            part_rows (int): Rows per part file
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        self.output_dir = output_dir
+        self.row_group_size = max(1, int(row_group_size))
+        self.part_rows = max(self.row_group_size, int(part_rows))
+        self.schemas = _parquet_schemas()
+        self.lock = threading.Lock()
+        # Rows of each dataset's current part, and how many of them are already in its spool
+        self._rows = {name: [] for name in self.schemas}
+        self._spooled = {name: 0 for name in self.schemas}
+        # Microseconds keep two sinks opened in the same second from sharing part and spool names
+        now = time.time()
+        stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(now))
+        self._run = f"part-{stamp}{int(now * 1e6) % 1000000:06d}-{os.getpid()}"
+        self._parts = 0
+        self._part_names = {}
+        self._profile_urls = None
+
+    def dataset_dir(self, dataset: str) -> str:
+        return os.path.join(self.output_dir, dataset)
+
+    def describe(self, dataset: str) -> str:
+        return self.dataset_dir(dataset)
+
+    def _part_name(self, dataset: str) -> str:
+        if dataset not in self._part_names:
+            # Zero-padded so part names still sort by write time within a run
+            self._parts += 1
+            self._part_names[dataset] = f"{self._run}-{self._parts:06d}"
+        return self._part_names[dataset]
+
+    def _spool(self, dataset: str):
+        rows = self._rows[dataset][self._spooled[dataset]:]
+        if not rows:
+            return
+        directory = self.dataset_dir(dataset)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, spool_name(self._part_name(dataset))), 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._spooled[dataset] = len(self._rows[dataset])
+
+    def _write_part(self, dataset: str):
+        import pyarrow as pa
+
+        rows = self._rows[dataset]
+        if not rows:
+            return
+        directory = self.dataset_dir(dataset)
+        os.makedirs(directory, exist_ok=True)
+        name = self._part_name(dataset)
+        table = pa.Table.from_pylist(rows, schema=self.schemas[dataset])
+        write_part(table, directory, f"{name}.parquet", self.row_group_size)
+        # The part is in place, so its spool is redundant; readers ignore spools that have a part
+        try:
+            os.remove(os.path.join(directory, spool_name(name)))
+        except FileNotFoundError:
+            pass
+        self._rows[dataset] = []
+        self._spooled[dataset] = 0
+        del self._part_names[dataset]
+
+    def _add(self, dataset: str, rows):
+        with self.lock:
+            self._rows[dataset].extend(rows)
+            if len(self._rows[dataset]) >= self.part_rows:
+                self._write_part(dataset)
+
+    def write_raw(self, rows):
+        if rows:
+            self._add('raw', rows)
+
+    def write_investors(self, rows):
+        if rows:
+            self._add('investors', rows)
+
+    def write_profiles(self, rows, replace=False):
+        """
+        Returns (written, total) profile counts
+
+        Parquet parts are immutable, so with replace a refreshed profile is written
+        again; part names sort by write time, so readers keep the last row per url.
+        """
+        with self.lock:
+            if self._profile_urls is None:
+                # Column pruning keeps this to a read of the url column only
+                try:
+                    existing = read_dataset(self.dataset_dir('profiles'), columns=['url'])
+                    self._profile_urls = set(existing['url'])
+                except Exception as e:
+                    logger.error(f"Error reading existing profile URLs: {str(e)}")
+                    self._profile_urls = set()
+            new_rows = []
+            for row in rows:
+                if replace or row.get('url') not in self._profile_urls:
+                    self._profile_urls.add(row.get('url'))
+                    new_rows.append(row)
+        if new_rows:
+            self._add('profiles', new_rows)
+        return len(new_rows), len(self._profile_urls)
+
+    def write_error(self, url, error):
+        self._add('errors', [{'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'), 'url': url, 'error': error}])
+
+    def flush(self):
+        """Make every buffered row durable in its dataset's spool"""
+        with self.lock:
+            for dataset in self._rows:
+                self._spool(dataset)
+
+    def close(self):
+        with self.lock:
+            for dataset in self._rows:
+                self._write_part(dataset)
+
+
+def spool_name(part_name: str) -> str:
+    # Hidden, so only read_dataset's spool pass picks it up
+    return f".{part_name}.jsonl"
+
+
+def write_part(table, directory: str, name: str, row_group_size: int):
+    """Write table as a complete Parquet file: under a hidden name, fsynced, then renamed into place"""
+    import pyarrow.parquet as pq
+
+    staging = os.path.join(directory, f".{name}.tmp")
+    with open(staging, 'wb') as f:
+        pq.write_table(table, f, compression='zstd', row_group_size=row_group_size)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staging, os.path.join(directory, name))
+
+
+def _read_spool(path: str):
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                # A torn last line from a crash; that row was never reported as saved
+                continue
+    return rows
+
+
+def _read_tables(path: str, columns=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names = os.listdir(path) if os.path.isdir(path) else []
+    parts = {name[:-len('.parquet')] for name in names if name.endswith('.parquet') and not name.startswith('.')}
+    # Spools whose part was never written hold the rows a crashed run had flushed
+    spools = {name[1:-len('.jsonl')] for name in names if name.startswith('.part-') and name.endswith('.jsonl')}
+    schema = _parquet_schemas().get(os.path.basename(os.path.normpath(path)))
+    tables = []
+    for name in sorted(parts | spools):
+        try:
+            if name in parts:
+                tables.append(pq.read_table(os.path.join(path, f"{name}.parquet"), columns=columns))
+            else:
+                table = pa.Table.from_pylist(_read_spool(os.path.join(path, spool_name(name))), schema=schema)
+                tables.append(table.select(columns) if columns else table)
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning(f"Skipping unreadable Parquet part {name}: {e}")
+    return tables, parts, spools
+
+
+def read_dataset(path: str, columns=None) -> pd.DataFrame:
+    """Load a Parquet dataset directory, reading only the requested columns
+
+    Unreadable part files (e.g. truncated by a crash) are skipped with a warning.
+    """
+    import pyarrow as pa
+
+    tables, _, _ = _read_tables(path, columns)
+    if not tables:
+        return pd.DataFrame(columns=columns or [])
+    return pa.concat_tables(tables).to_pandas()
+
+
+def compact_dataset(path: str, row_group_size: int = 500):
+    """Merge a dataset's parts and leftover spools into one part; profiles keep the last row per url
+
+    Run it while no crawl is writing to the dataset.
+    """
+    import pyarrow as pa
+
+    tables, parts, spools = _read_tables(path)
+    if len(parts) + len(spools) <= 1:
+        return
+    table = pa.concat_tables(tables)
+    rows = table.num_rows
+    if os.path.basename(os.path.normpath(path)) == 'profiles':
+        urls = table.column('url').to_pylist()
+        last = {url: i for i, url in enumerate(urls)}
+        table = table.take(sorted(last.values()))
+    # Sorts before the part- names of later runs, so their rows still supersede it
+    name = f"compact-{time.strftime('%Y%m%d_%H%M%S')}"
+    write_part(table, path, f"{name}.parquet", row_group_size)
+    for part in parts - {name}:
+        os.remove(os.path.join(path, f"{part}.parquet"))
+    for spool in spools:
+        os.remove(os.path.join(path, spool_name(spool)))
+    logger.info(f"Compacted {path} from {len(parts)} parts and {len(spools)} spools ({rows} rows) "
+                f"to one part of {table.num_rows} rows")
+
+
+def make_sink(kind: str, data_dir: str):
+    """Build the output sink named on the command line"""
+    if kind == 'parquet':
+        return ParquetSink(os.path.join(data_dir, 'parquet'))
+    if kind == 'sqlite':
+        from sqlite_store import SQLiteStore
+        return SQLiteStore(os.path.join(data_dir, 'scraper.db'))
+    return CsvSink(data_dir)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3 or sys.argv[1] != 'compact':
+        print('Usage: python output_sinks.py compact <investor_profiles.csv | parquet dataset directory>')
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if os.path.isdir(sys.argv[2]):
+        compact_dataset(sys.argv[2])
+    else:
+        ProfileCsvWriter(sys.argv[2]).compact()
@@ -0,0 +1,323 @@
+import argparse
+import gzip
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs(last_access);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    kind TEXT,
+    PRIMARY KEY (url, fetched_at)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash);
+CREATE INDEX IF NOT EXISTS idx_pages_kind ON pages(kind);
+"""
+
+
+def page_kind(url: str) -> str:
+    """Classify a signal.nfx.com URL as an investor list or profile page"""
+    if '/investor-lists/' in url:
+        return 'list'
+    if '/investors/' in url:
+        return 'profile'
+    return 'other'
+
+
+class PageCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3):
+        """
+        Compressed, content-addressed on-disk cache of fetched page HTML
+
+        Snapshots are indexed by URL and fetch time; identical HTML is stored
+        once under its SHA-256. When the compressed total exceeds max_bytes the
+        least recently used blobs are evicted along with their snapshots.
+
+        Args:
+            cache_dir (str): Cache root directory
+            max_bytes (int): Size cap for compressed blobs
+        """
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        self.max_bytes = max_bytes
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(INDEX_SCHEMA)
+        self.conn.commit()
+        self._total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.blob_dir, content_hash[:2], f'{content_hash}.html.gz')
+
+    def put(self, url: str, html: str, kind: str = None) -> str:
+        """Store a snapshot of url and return its content hash"""
+        data = html.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute('SELECT size FROM blobs WHERE content_hash = ?', (content_hash,)).fetchone()
+            if row is None:
+                path = self._blob_path(content_hash)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + '.tmp'
+                with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                size = os.path.getsize(path)
+                self.conn.execute('INSERT INTO blobs (content_hash, size, last_access) VALUES (?, ?, ?)',
+                                  (content_hash, size, now))
+                self._total += size
+            else:
+                self.conn.execute('UPDATE blobs SET last_access = ? WHERE content_hash = ?', (now, content_hash))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (url, fetched_at, content_hash, kind) VALUES (?, ?, ?, ?)',
+                (url, now, content_hash, kind or page_kind(url))
+            )
+            self.conn.commit()
+            if self._total > self.max_bytes:
+                self.evict()
+        return content_hash
+
+    def _read_blob(self, content_hash: str):
+        try:
+            with gzip.open(self._blob_path(content_hash), 'rb') as f:
+                return f.read().decode('utf-8')
+        except (OSError, EOFError) as e:
+            logger.warning(f"Unreadable cache blob {content_hash}: {e}")
+            return None
+
+    def get(self, url: str):
+        """Return the latest cached HTML for url, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT content_hash FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute('UPDATE blobs SET last_access = ? WHERE content_hash = ?', (time.time(), row[0]))
+            self.conn.commit()
+        return self._read_blob(row[0])
+
+    def latest(self, kind: str = None):
+        """Return [(url, fetched_at, content_hash)] for the newest snapshot of each URL"""
+        query = ('SELECT url, MAX(fetched_at), content_hash FROM pages '
+                 + ('WHERE kind = ? ' if kind else '') + 'GROUP BY url ORDER BY url')
+        with self.lock:
+            return self.conn.execute(query, (kind,) if kind else ()).fetchall()
+
+    def iter_latest(self, kind: str = None):
+        """Yield (url, fetched_at, html) for the newest snapshot of each URL"""
+        for url, fetched_at, content_hash in self.latest(kind):
+            html = self._read_blob(content_hash)
+            if html is not None:
+                yield url, fetched_at, html
+
+    def evict(self):
+        """Drop least recently used blobs until the cache is under its size cap"""
+        evicted = 0
+        with self.lock:
+            rows = self.conn.execute('SELECT content_hash, size FROM blobs ORDER BY last_access').fetchall()
+            for content_hash, size in rows:
+                if self._total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self._blob_path(content_hash))
+                except FileNotFoundError:
+                    pass
+                self.conn.execute('DELETE FROM blobs WHERE content_hash = ?', (content_hash,))
+                self.conn.execute('DELETE FROM pages WHERE content_hash = ?', (content_hash,))
+                self._total -= size
+                evicted += 1
+            self.conn.commit()
+        if evicted:
+            logger.info(f"Evicted {evicted} cached pages; cache now {self._total / 1024 ** 2:.1f} MB")
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+_parsers = {}
+
+
+def _get_parser(kind: str, fast_parser: bool = False):
+    # One parser per worker process, created on first use
+    key = (kind, fast_parser)
+    if key not in _parsers:
+        if kind == 'profile':
+            from profile_scraper import ProfileParser
+            _parsers[key] = ProfileParser(fast_parser=fast_parser)
+        else:
+            from scraper import InvestorListParser
+            _parsers[key] = InvestorListParser()
+    return _parsers[key]
+
+
+def _read_html(path: str):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+def parse_chunk(kind: str, items, fast_parser: bool = False):
+    """Parse a chunk of (url, path) pages in a worker process; returns a list of results"""
+    parser = _get_parser(kind, fast_parser)
+    results = []
+    for url, path in items:
+        try:
+            html = _read_html(path)
+        except (OSError, EOFError) as e:
+            logger.warning(f"Unreadable page {path}: {e}")
+            continue
+        if kind == 'profile':
+            results.append(parser.parse_profile(url, html, allow_expandable=True))
+        else:
+            results.append(parser.parse_list_html(url, html, allow_paginated=True))
+    return results
+
+
+def _write_results(kind: str, results, sink):
+    if kind == 'profile':
+        # A re-parse exists to pick up parser fixes, so it supersedes profiles already saved
+        sink.write_profiles(results, replace=True)
+    else:
+        sink.write_raw([raw_data for raw_data, _ in results])
+        sink.write_investors([inv for _, investors in results for inv in investors])
+
+
+def parse_pages(items, kind: str, sink, workers: int = None, chunk_size: int = 50, fast_parser: bool = False) -> int:
+    """
+    Parse (url, path) pages across a process pool, writing each chunk to sink as it completes
+
+    Workers read the files themselves, so only paths and parsed results cross
+    process boundaries. At most two chunks per worker are in flight at once.
+    """
+    workers = workers or os.cpu_count() or 1
+    parsed = 0
+    if workers == 1:
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                results = parse_chunk(kind, chunk, fast_parser)
+                _write_results(kind, results, sink)
+                parsed += len(results)
+                chunk = []
+        results = parse_chunk(kind, chunk, fast_parser)
+        _write_results(kind, results, sink)
+        return parsed + len(results)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        chunk = []
+
+        def drain(limit):
+            nonlocal parsed, pending
+            while len(pending) > limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results = future.result()
+                    _write_results(kind, results, sink)
+                    parsed += len(results)
+
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                pending.add(executor.submit(parse_chunk, kind, chunk, fast_parser))
+                chunk = []
+                drain(workers * 2)
+        if chunk:
+            pending.add(executor.submit(parse_chunk, kind, chunk, fast_parser))
+        drain(0)
+    return parsed
+
+
+def _clear_list_output(sink):
+    # Investor rows have no key to replace them by, so list output is rebuilt rather than appended to;
+    # SQLite upserts them and has no files to remove
+    for dataset in ('raw', 'investors'):
+        path = sink.describe(dataset)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.isfile(path):
+            os.remove(path)
+
+
+def reparse(cache: PageCache, kind: str, sink, workers: int = None, fast_parser: bool = False):
+    """Re-run the current parsers over every cached page of one kind and write the results to sink"""
+    started = time.monotonic()
+    if kind == 'list':
+        _clear_list_output(sink)
+    items = [(url, cache._blob_path(content_hash)) for url, _, content_hash in cache.latest(kind)]
+    parsed = parse_pages(items, kind, sink, workers=workers, fast_parser=fast_parser)
+    elapsed = time.monotonic() - started
+    logger.info(f"Re-parsed {parsed} cached {kind} pages in {elapsed:.1f}s ({parsed / max(elapsed, 1e-9):.1f} pages/s)")
+    return parsed
+
+
+def reparse_files(paths, kind: str, sink, workers: int = None, fast_parser: bool = False):
+    """Parse stored HTML files (such as profile.html fixtures), using each file's URI as its URL"""
+    items = [(f'file://{os.path.abspath(path)}', path) for path in paths]
+    if kind == 'list':
+        _clear_list_output(sink)
+    return parse_pages(items, kind, sink, workers=workers, fast_parser=fast_parser)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the raw HTML page cache')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    reparse_parser = subparsers.add_parser('reparse', help='Re-run the parsers over cached pages')
+    reparse_parser.add_argument('--kind', choices=['profile', 'list'], default='profile')
+    reparse_parser.add_argument('--output', choices=['csv', 'parquet', 'sqlite'], default='csv', help='Output format')
+    reparse_parser.add_argument('--data-dir', default=os.path.join('output', 'reparse'),
+                                help='Directory for re-parsed output')
+    reparse_parser.add_argument('--workers', type=int, default=None, help='Parser processes (defaults to CPU count)')
+    reparse_parser.add_argument('--fast-parser', action='store_true',
+                                help='Parse profiles with the single-pass lxml extractor')
+    reparse_parser.add_argument('files', nargs='*', help='HTML files to parse instead of the cache')
+    subparsers.add_parser('evict', help='Enforce the cache size cap')
+    parser.add_argument('--cache-dir', default=os.path.join('output', 'cache'), help='Cache directory')
+    parser.add_argument('--max-mb', type=int, default=2048, help='Cache size cap in megabytes')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    cache = PageCache(args.cache_dir, max_bytes=args.max_mb * 1024 ** 2)
+    try:
+        if args.command == 'evict':
+            cache.evict()
+        else:
+            from output_sinks import make_sink
+            os.makedirs(args.data_dir, exist_ok=True)
+            sink = make_sink(args.output, args.data_dir)
+            try:
+                if args.files:
+                    reparse_files(args.files, args.kind, sink, workers=args.workers, fast_parser=args.fast_parser)
+                else:
+                    reparse(cache, args.kind, sink, workers=args.workers, fast_parser=args.fast_parser)
+            finally:
+                sink.close()
+    finally:
+        cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Counts in-flight fetch/XHR requests and timestamps the last DOM mutation.
+# Idempotent, so it is safe to run both on new documents and after driver.get.
+READINESS_HOOK = """
+(function () {
+    if (window.__readiness) { return; }
+    var state = window.__readiness = {pending: 0, lastChange: Date.now()};
+    function touch() { state.lastChange = Date.now(); }
+    function done() { state.pending = Math.max(0, state.pending - 1); touch(); }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending += 1; touch();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { done(); return response; },
+                function (error) { done(); throw error; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending += 1; touch();
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+    function observe() {
+        new MutationObserver(touch).observe(document.documentElement,
+            {childList: true, subtree: true, characterData: true});
+    }
+    if (document.documentElement) { observe(); } else { document.addEventListener('DOMContentLoaded', observe); }
+})();
+"""
+
+READINESS_STATE = """
+var state = window.__readiness;
+return {
+    ready: document.readyState === 'complete',
+    pending: state ? state.pending : 0,
+    idle_ms: state ? Date.now() - state.lastChange : null
+};
+"""
+
+ROW_COUNT = "return document.querySelectorAll(arguments[0]).length;"
+
+
+def install_readiness_hook(driver):
+    """Inject the readiness hook into every document the driver opens (Chrome DevTools), once per driver"""
+    if getattr(driver, '_readiness_hook_installed', False):
+        return
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': READINESS_HOOK})
+    except (AttributeError, WebDriverException) as e:
+        logger.debug(f"Could not register readiness hook for new documents: {e}")
+    driver._readiness_hook_installed = True
+
+
+def wait_until_quiet(driver, timeout: float = 20, quiet: float = 0.5, poll: float = 0.1) -> bool:
+    """
+    Wait until the document has loaded, no fetch/XHR is in flight and the DOM
+    has not changed for `quiet` seconds; returns False if that never happens within timeout
+    """
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        driver.execute_script(READINESS_HOOK)
+    except WebDriverException as e:
+        logger.debug(f"Could not inject readiness hook: {e}")
+
+    def settled(d):
+        state = d.execute_script(READINESS_STATE)
+        if not state or not state.get('ready') or state.get('pending'):
+            return False
+        idle_ms = state.get('idle_ms')
+        # Without the hook there is no mutation timestamp; readyState alone has to do
+        return idle_ms is None or idle_ms >= quiet * 1000
+
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(settled)
+        logger.debug(f"Page settled after {time.monotonic() - started:.2f}s")
+        return True
+    except TimeoutException:
+        logger.warning(f"Page did not settle within {timeout}s; continuing with what has loaded")
+        return False
+
+
+def count_rows(driver, selector: str) -> int:
+    return driver.execute_script(ROW_COUNT, selector)
+
+
+def wait_for_rows(driver, selector: str, previous: int, timeout: float = 20, quiet: float = 0.5) -> int:
+    """Wait for more than `previous` elements to match selector, then for the page to settle; returns the new count"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: count_rows(d, selector) > previous
+        )
+    except TimeoutException:
+        logger.warning(f"No new rows matching '{selector}' within {timeout}s")
+        return previous
+    # Rows can arrive in several batches; wait for the last one
+    wait_until_quiet(driver, timeout=timeout, quiet=quiet)
+    return count_rows(driver, selector)
@@ -1,113 +1,43 @@
-from selenium.webdriver import Chrome
-from selenium.webdriver.common.by import By
 from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
 import logging
-import pandas as pd
 import time
 import os
 import pickle
 import random
-# Add import at the top
+import queue
+import argparse
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import pprint
-# Add at the top with other imports
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import re
+# Selenium (here and in the browser helpers below), requests and pandas are imported
+# where they are used, so the profile parser stays cheap to import
+from progress_log import ProgressLog
+from page_cache import PageCache
+from sitemap_stream import SitemapStream, is_investor_profile
+from rate_control import RateController
+from page_ready import install_readiness_hook, wait_until_quiet, count_rows, wait_for_rows
+from network_capture import drain_json_responses, derive_investor_id, extract_investments
+from browser_session import BrowserSession, DEFAULT_BASE_URL
+from driver_factory import create_driver, DriverFactory
+from crawl_metrics import StageMetrics, add_metrics_arguments, open_metrics
+from work_queue import add_queue_arguments, open_queue, run_worker, worker_name
 
-class ProfileScraper:
-    def __init__(self, data_dir, headless=True):
-        self.data_dir = data_dir
-        self.profile_data = []
-        self.driver = self.init_driver(headless)
-        self.logger = logging.getLogger(self.__class__.__name__)
-        os.makedirs(data_dir, exist_ok=True)
+def open_progress_log(data_dir):
+    """Open data_dir/progress.log, importing a legacy progress.csv on first use"""
+    return ProgressLog(
+        os.path.join(data_dir, 'progress.log'),
+        legacy_csv=os.path.join(data_dir, 'progress.csv')
+    )
 
-    def init_driver(self, headless):
-        options = uc.ChromeOptions()
-        
-        # Anti-detection measures
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-infobars')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-browser-side-navigation')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-notifications')
-        options.add_argument('--window-size=1920,1080')
-        
-        # Random user agents
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36'
-        ]
-        options.add_argument(f'user-agent={random.choice(user_agents)}')
-        
-        if headless:
-            options.add_argument('--headless=new')
-            
-        return uc.Chrome(options=options)
+class ProfileParser:
+    """Parsing for investor profile pages; needs no browser, so it can run anywhere the HTML is"""
 
-    def load_cookies(self, filename):
-        with open(filename, 'rb') as file:
-            cookies = pickle.load(file)
-            for cookie in cookies:
-                self.driver.add_cookie(cookie)
-
-    def handle_authentication(self):
-        cookie_file = os.path.join(self.data_dir, 'cookies.pkl')
-        
-        # Check for existing valid cookies
-        if os.path.exists(cookie_file):
-            try:
-                if os.path.getsize(cookie_file) > 0:
-                    self.load_cookies(cookie_file)
-                    self.logger.info('Using existing cookies')
-                    return False
-                else:
-                    self.logger.warning('Empty cookies file detected')
-                    os.remove(cookie_file)
-            except (EOFError, pickle.UnpicklingError):
-                self.logger.error('Corrupted cookies file')
-                os.remove(cookie_file)
-    
-        # If no valid cookies, perform fresh authentication
-        self.driver.get('https://signal.nfx.com/login')
-        self.logger.info('Please manually log in within 2 minutes...')
-        
-        # Wait for successful authentication
-        start_time = time.time()
-        while time.time() - start_time < 120:
-            if 'investors' in self.driver.current_url:
-                self.save_cookies(cookie_file)
-                self.logger.info('Login successful, cookies saved')
-                return True
-            time.sleep(5)
-        
-        raise TimeoutError('Authentication timed out')
-    
-        if os.path.exists(cookie_file):
-            os.remove(cookie_file)
-        
-        self.save_cookies(cookie_file)
-        
-        if os.path.getsize(cookie_file) == 0:
-            raise RuntimeError('Failed to save valid cookies')
-        
-        return True
-    
-    def save_cookies(self, filename):
-        cookies = self.driver.get_cookies()
-        if not cookies:
-            self.logger.warning('No cookies to save')
-            return
-        
-        with open(filename, 'wb') as file:
-            pickle.dump(cookies, file)
-        self.logger.info(f'Saved {len(cookies)} cookies to {filename}')
+    def __init__(self, fast_parser=False):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # Use the single-pass lxml extractor in parse_profile
+        self.fast_parser = fast_parser
 
     def extract_profile_data(self, soup):
         profile = {
@@ -255,39 +185,181 @@ class ProfileScraper:
                 if any(investment.values()):
                     profile['all_previous_investments'].append(investment)
         
-        self.logger.debug(f'Extracted profile data:\n{pprint.pformat(profile)}')
         return profile
 
-    def save_profiles(self):
-        if not self.profile_data:
-            return
+    def needs_browser(self, soup):
+        """True if the page hides investments behind the JS-only "See all" button"""
+        return soup.find('button', string=re.compile(r'See all .*investments on record')) is not None
+
+    def parse_profile(self, profile_url, html, allow_expandable=False):
+        """Parse profile HTML into a profile dict; returns None when the browser is required"""
+        if self.fast_parser:
+            from fast_profile_parser import FastProfileParser
+            parser = FastProfileParser()
+            root = parser.parse(html)
+            if not allow_expandable and parser.needs_browser(root):
+                return None
+            profile = parser.extract_profile_data(root)
+        else:
+            soup = BeautifulSoup(html, 'lxml')
+            if not allow_expandable and self.needs_browser(soup):
+                return None
+            profile = self.extract_profile_data(soup)
+        profile.update({
+            'url': profile_url,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'status': 'success'
+        })
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'Extracted profile data:\n{pprint.pformat(profile)}')
+        return profile
+
+class ProfileScraper(ProfileParser):
+    def __init__(self, data_dir, headless=True, lock=None, fetcher=None, progress=None, sink=None, cache=None,
+                 fast_parser=False, refresh=False, rate=None, capture_network=False, lean=False,
+                 driver_factory=None, base_url=DEFAULT_BASE_URL, metrics=None, batch_size=25, on_saved=None):
+        self.data_dir = data_dir
+        self.headless = headless
+        # Lean drivers are headless and skip images, fonts and media (see driver_factory)
+        self.lean = lean
+        # Build investments from captured XHR JSON instead of the rendered table (see network_capture)
+        self.capture_network = capture_network
+        # Optional DriverFactory handing out pre-spawned drivers; it then decides the driver options
+        self.driver_factory = driver_factory
+        # Site root for login and session cookies; points at stand_in_site.py for load tests
+        self.base_url = base_url.rstrip('/')
+        # Per-stage timings, shared by every worker of a pool
+        self.metrics = metrics or StageMetrics()
+        self.fast_parser = fast_parser
+        # Recrawled profiles replace their saved copies instead of being skipped as duplicates
+        self.refresh = refresh
+        # Adaptive per-host pacing for browser page loads, shared by every worker of a pool
+        self.rate = rate or RateController()
+        # Optional PageCache for pages loaded in Chrome; HTTP fetches are cached by the fetcher
+        self.cache = cache
+        self.profile_data = []
+        # Profiles are saved every batch_size scrapes; their URLs are only recorded as done once saved
+        self.batch_size = max(1, int(batch_size))
+        self.unsaved_urls = []
+        # Optional on_saved(urls), called after each batch is saved and recorded
+        self.on_saved = on_saved
+        # Investments read from XHR responses by fetch_profile_browser; empty for HTTP-fetched pages
+        self.captured_investments = []
+        # Guards the shared CSV outputs when several scrapers write to the same data_dir
+        self.lock = lock or threading.RLock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        os.makedirs(data_dir, exist_ok=True)
+        self.progress = progress if progress is not None else open_progress_log(data_dir)
+        if sink is None:
+            from output_sinks import CsvSink
+            sink = CsvSink(data_dir)
+        self.sink = sink
+        # Optional HttpFetcher; Chrome is then only started for pages that need JS
+        self.fetcher = fetcher
+        self.cookie_file = os.path.join(self.data_dir, 'cookies.pkl')
+        # Cookies go into each driver once, not before every profile
+        self.session = BrowserSession(self.saved_cookies, base_url=self.base_url, rate=self.rate)
+        self._driver = None
+        if fetcher is None:
+            self._driver = self.init_driver(headless)
+        else:
+            cookies = self.saved_cookies()
+            if cookies:
+                fetcher.set_cookies(cookies)
 
-        output_file = os.path.join(self.data_dir, 'investor_profiles.csv')
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self.init_driver(self.headless)
+        return self._driver
+
+    def init_driver(self, headless):
+        with self.metrics.stage('driver_start', kind='profile'):
+            if self.driver_factory is not None:
+                return self.driver_factory.get()
+            return create_driver(headless=headless, lean=self.lean, capture_network=self.capture_network)
+
+    def read_cookies(self, filename):
+        with open(filename, 'rb') as file:
+            return pickle.load(file)
+
+    def load_cookies(self, filename):
+        for cookie in self.read_cookies(filename):
+            self.driver.add_cookie(cookie)
+
+    def saved_cookies(self):
+        """Cookies from the last login, or [] when the file is missing, empty or corrupted"""
+        if not os.path.exists(self.cookie_file):
+            return []
+        try:
+            if os.path.getsize(self.cookie_file) > 0:
+                return self.read_cookies(self.cookie_file)
+            self.logger.warning('Empty cookies file detected')
+        except (EOFError, pickle.UnpicklingError):
+            self.logger.error('Corrupted cookies file')
+        os.remove(self.cookie_file)
+        return []
+
+    def handle_authentication(self):
+        """Log in manually in the browser window and save the new cookies"""
+        self.driver.get(f'{self.base_url}/login')
+        self.logger.info('Please manually log in within 2 minutes...')
         
-        # Read existing data if file exists
-        existing_data = pd.DataFrame()
-        if os.path.exists(output_file):
-            existing_data = pd.read_csv(output_file)
+        # Wait for successful authentication
+        start_time = time.time()
+        while time.time() - start_time < 120:
+            if 'investors' in self.driver.current_url:
+                self.save_cookies(self.cookie_file)
+                self.logger.info('Login successful, cookies saved')
+                return True
+            time.sleep(5)
         
-        # Filter out duplicates based on URL
-        new_data = pd.DataFrame(self.profile_data)
-        if not existing_data.empty:
-            new_data = new_data[~new_data['url'].isin(existing_data['url'])]
+        raise TimeoutError('Authentication timed out')
+    
+    def save_cookies(self, filename):
+        cookies = self.driver.get_cookies()
+        if not cookies:
+            self.logger.warning('No cookies to save')
+            return
         
-        # Combine and save
-        combined_data = pd.concat([existing_data, new_data], ignore_index=True)
-        combined_data.to_csv(output_file, index=False)
+        with open(filename, 'wb') as file:
+            pickle.dump(cookies, file)
+        self.logger.info(f'Saved {len(cookies)} cookies to {filename}')
+
+    def add_profile(self, url, profile):
+        """Buffer a scraped profile, saving the buffer once it holds batch_size profiles"""
+        self.profile_data.append(profile)
+        self.unsaved_urls.append(url)
+        if len(self.profile_data) >= self.batch_size:
+            self.save_profiles()
+
+    def save_profiles(self):
+        """Write the buffered profiles, then record their URLs as done; returns the URLs saved"""
+        if not self.profile_data:
+            return []
+
+        new_count, total = self.sink.write_profiles(self.profile_data, replace=self.refresh)
+        # On disk before the URLs are recorded as done
+        self.sink.flush()
         
-        self.logger.info(f'Saved {len(new_data)} new profiles (total {len(combined_data)} unique profiles) to {output_file}')
+        self.logger.info(f'Saved {new_count} new profiles (total {total} unique profiles) to {self.sink.describe("profiles")}')
         self.profile_data = []  # Clear after saving
+        urls, self.unsaved_urls = self.unsaved_urls, []
+        for url in urls:
+            self.record_progress(url, 'success')
+        if self.on_saved:
+            self.on_saved(urls)
+        return urls
+
+    def load_progress(self):
+        """Return the set of URLs already recorded in the progress journal"""
+        return self.progress.urls()
+
+    def record_progress(self, url, status, error=None):
+        self.progress.mark(url, status, error)
 
     def save_error(self, url, error):
-        error_file = os.path.join(self.data_dir, 'scraper_errors.csv')
-        pd.DataFrame([{
-            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'url': url,
-            'error': error
-        }]).to_csv(error_file, mode='a', header=not os.path.exists(error_file))
+        self.sink.write_error(url, error)
 
     def random_sleep(self, min, max):
         time.sleep(random.uniform(min, max))
@@ -296,30 +368,77 @@ class ProfileScraper:
         self.safe_quit_driver()
 
     def safe_quit_driver(self):
-        if hasattr(self, 'driver') and self.driver:
+        if getattr(self, '_driver', None):
             try:
-                self.driver.quit()
+                self._driver.quit()
             except Exception as e:
                 self.logger.error(f'Driver quit error: {str(e)}')
             finally:
-                self.driver = None
-                
-    def scrape_profile(self, profile_url):
-        # Create profile file path before scraping
-        profile_file = os.path.join(self.data_dir, f"profile_scper_data.csv")
+                self._driver = None
+
+    def fetch_profile_http(self, profile_url):
+        """Fetch and parse a profile without Chrome; returns None when the browser is required"""
+        with self._stage('fetch_http', profile_url):
+            html = self.fetcher.fetch(profile_url)
+        if html is None:
+            return None
+        return self.parse_profile_html(profile_url, html)
+
+    def parse_profile_html(self, profile_url, html):
+        """Parse fetched profile HTML into a profile dict; returns None when the browser is required"""
+        with self._stage('parse_extract', profile_url):
+            profile = self.parse_profile(profile_url, html)
+        if profile is None:
+            self.logger.info(f'Falling back to browser for expandable investments: {profile_url}')
+        return profile
+
+    def _stage(self, name, url):
+        return self.metrics.stage(name, kind='profile', url=url)
+
+    def load_page(self, url):
+        """driver.get paced by the rate controller, returning once the page has settled"""
+        install_readiness_hook(self.driver)
+        with self._stage('rate_wait', url):
+            self.rate.wait(url)
+        started = time.monotonic()
+        with self._stage('navigate', url):
+            self.driver.get(url)
+        with self._stage('settle', url):
+            wait_until_quiet(self.driver)
+        # Load time includes settling, so slow XHR-driven pages also count against the rate
+        elapsed = time.monotonic() - started
+        if self.session.login_required(self.driver):
+            self.rate.failure(url, reason='login redirect', login=True)
+        else:
+            self.rate.success(url, elapsed)
+
+    def fetch_profile_browser(self, profile_url):
+        """Load a profile in Chrome, expanding its investments, and return the page HTML"""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+
+        self.captured_investments = []
+        with self._stage('session', profile_url):
+            self.session.ensure(self.driver)
+        self.load_page(profile_url)
         
-        try:
-            # Initialize empty profile file
-            pd.DataFrame().to_csv(profile_file, index=False,mode='a')
-            
-            self.driver.get(profile_url)
-            self.random_sleep(3, 5)
-            
-            # Handle authentication if needed
-            if self.handle_authentication():
-                self.driver.get(profile_url)
-                self.random_sleep(3, 5)
-    
+        # Only an actual login redirect re-establishes the session
+        if self.session.login_required(self.driver):
+            self.logger.warning(f'Redirected to login on {profile_url}; reloading saved cookies')
+            self.metrics.count('crawl_login_redirects_total', kind='profile')
+            with self._stage('login', profile_url):
+                self.session.invalidate()
+                if self.session.ensure(self.driver):
+                    self.load_page(profile_url)
+                if self.session.login_required(self.driver):
+                    self.handle_authentication()
+                    self.session.mark_authenticated(self.driver)
+                    self.load_page(profile_url)
+
+        with self._stage('network_capture', profile_url):
+            payloads = drain_json_responses(self.driver) if self.capture_network else []
+
+        with self._stage('see_all', profile_url):
             # Alternative button handling using JavaScript execution
             try:
                 # Update XPath to match button text pattern
@@ -328,96 +447,227 @@ class ProfileScraper:
                     '//button[starts-with(normalize-space(), "See all") '
                     'and contains(., "investments on record")]'
                 )
-                
+            
                 # Store initial investment count
-                initial_investments = len(self.driver.find_elements(
-                    By.CSS_SELECTOR, 'tbody.past-investments-table-body tr'
-                ))
-                
+                rows_selector = 'tbody.past-investments-table-body tr'
+                initial_investments = count_rows(self.driver, rows_selector)
+            
                 # Click using JavaScript to bypass visibility issues
                 self.driver.execute_script("arguments[0].click();", button)
-                
-                # Wait for investments to load using expected conditions
-                WebDriverWait(self.driver, 15).until(
-                    lambda d: len(d.find_elements(
-                        By.CSS_SELECTOR, 'tbody.past-investments-table-body tr'
-                    )) > initial_investments
-                )
-                
+            
+                if self.capture_network:
+                    # Only the response is needed, not the re-rendered table
+                    wait_until_quiet(self.driver, timeout=15)
+                # Wait until the rows stop arriving, not just for the first new one
+                elif wait_for_rows(self.driver, rows_selector, initial_investments, timeout=15) <= initial_investments:
+                    raise TimeoutException('No additional investments loaded')
+            
                 self.logger.info('Successfully loaded additional investments')
-                
+            
             except Exception as e:
                 self.logger.warning(f'Alternative button handling failed: {str(e)}')
-                # Fallback to direct API call simulation
-                try:
-                    self.driver.execute_script(
-                        "fetch('/investors/load_more_investments', {"
-                        "method: 'POST',"
-                        "headers: {'Content-Type': 'application/json'}, "
-                        "body: JSON.stringify({investor_id: 4109}) "
-                        "})"
-                    )
-                    self.random_sleep(2, 3)
-                except Exception as api_error:
-                    self.logger.error(f'API fallback failed: {str(api_error)}')
-
-            # Parse the updated page source
-            soup = BeautifulSoup(self.driver.page_source, 'lxml')
-            profile = self.extract_profile_data(soup)
-            profile.update({
-                'url': profile_url,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-            })
-            
-            self.profile_data.append(profile)
-            print('\nSuccessfully scraped profile:')
-            pprint.pprint(profile)
-            self.logger.info(f'Successfully scraped: {profile_url}')
+                # Fallback to calling the endpoint directly for this investor
+                investor_id = derive_investor_id(self.driver.page_source, payloads)
+                if investor_id is None:
+                    self.logger.warning(f'No investor id found on {profile_url}; skipping load_more_investments')
+                else:
+                    try:
+                        self.driver.execute_script(
+                            "fetch('/investors/load_more_investments', {"
+                            "method: 'POST',"
+                            "headers: {'Content-Type': 'application/json'}, "
+                            "body: JSON.stringify({investor_id: arguments[0]}) "
+                            "})",
+                            investor_id
+                        )
+                        wait_until_quiet(self.driver, timeout=10)
+                    except Exception as api_error:
+                        self.logger.error(f'API fallback failed: {str(api_error)}')
 
-            # After successful scrape
-            profile.update({
-                'url': profile_url,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'status': 'success'
-            })
-            
-            # Save to pre-created profile file
-            pd.DataFrame([profile]).to_csv(profile_file, index=False)
-            
-            # Also append to main CSV
-            self.save_profiles()
+        if self.capture_network:
+            with self._stage('network_capture', profile_url):
+                payloads += drain_json_responses(self.driver)
+                self.captured_investments = extract_investments(payloads)
+            self.logger.info(f'Captured {len(self.captured_investments)} investments from '
+                             f'{len(payloads)} JSON responses for {profile_url}')
+
+        # The updated page source, with the expanded investments
+        with self._stage('page_source', profile_url):
+            page_source = self.driver.page_source
+        if self.cache is not None:
+            try:
+                self.cache.put(profile_url, page_source)
+            except Exception as e:
+                self.logger.error(f'Error caching page {profile_url}: {str(e)}')
+        return page_source
+                
+    def scrape_profile(self, profile_url):
+        import pandas as pd
+
+        # Create profile file path before scraping
+        profile_file = os.path.join(self.data_dir, f"profile_scper_data.csv")
+        started = time.perf_counter()
+        
+        try:
+            # Initialize empty profile file
+            with self._stage('write', profile_url), self.lock:
+                pd.DataFrame().to_csv(profile_file, index=False,mode='a')
             
-            # Update progress tracking
-            progress_file = os.path.join(self.data_dir, 'progress.csv')
-            progress_data = {
-                'url': [profile_url],
-                'status': ['success'],
-                'timestamp': [time.strftime('%Y-%m-%d %H:%M:%S')],
-                'file_path': [profile_file]
-            }
+            profile = None
+            if self.fetcher is not None:
+                profile = self.fetch_profile_http(profile_url)
+            if profile is None:
+                html = self.fetch_profile_browser(profile_url)
+                # parse_profile honours fast_parser, and sets url, timestamp and status
+                with self._stage('parse_extract', profile_url):
+                    profile = self.parse_profile(profile_url, html, allow_expandable=True)
+            if self.captured_investments:
+                profile['all_previous_investments'] = self.captured_investments
+                self.captured_investments = []
+
+            self.logger.info(f'Successfully scraped: {profile_url}')
             
-            if os.path.exists(progress_file):
-                pd.DataFrame(progress_data).to_csv(progress_file, mode='a', header=False, index=False)
-            else:
-                pd.DataFrame(progress_data).to_csv(progress_file, index=False)
+            with self._stage('write', profile_url):
+                # Save to pre-created profile file
+                with self.lock:
+                    pd.DataFrame([profile]).to_csv(profile_file, index=False)
+                
+                # Appended to the main output in batches; progress is recorded when the batch is saved
+                self.add_profile(profile_url, profile)
+            self.metrics.count('crawl_pages_total', kind='profile', status='success')
+            return True
                 
         except Exception as e:
+            self.rate.failure(profile_url, reason=type(e).__name__)
             # Update progress with failure
-            progress_file = os.path.join(self.data_dir, 'progress.csv')
-            progress_data = {
-                'url': [profile_url],
-                'status': ['failed'],
-                'error': [str(e)],
-                'timestamp': [time.strftime('%Y-%m-%d %H:%M:%S')]
-            }
-            
-            if os.path.exists(progress_file):
-                pd.DataFrame(progress_data).to_csv(progress_file, mode='a', header=False, index=False)
-            else:
-                pd.DataFrame(progress_data).to_csv(progress_file, index=False)
+            self.record_progress(profile_url, 'failed', error=str(e))
             
             self.logger.error(f'Failed to scrape {profile_url}: {str(e)}')
             self.save_error(profile_url, str(e))
+            self.metrics.count('crawl_pages_total', kind='profile', status='failed')
+            return False
+        finally:
+            self.metrics.observe('total', time.perf_counter() - started, kind='profile', url=profile_url)
+
+class DriverPool:
+    """Bounded pool of ProfileScraper workers, each owning one reusable Chrome driver"""
+
+    def __init__(self, data_dir, workers=3, headless=True, fetcher=None, progress=None, sink=None, cache=None,
+                 rate=None, capture_network=False, lean=False, base_url=DEFAULT_BASE_URL, metrics=None,
+                 batch_size=25, on_saved=None):
+        self.data_dir = data_dir
+        self.base_url = base_url
+        self.batch_size = batch_size
+        self.on_saved = on_saved
+        self.metrics = metrics or StageMetrics()
+        self.capture_network = capture_network
+        self.lean = lean
+        self.cache = cache
+        self.workers = max(1, int(workers))
+        self.headless = headless
+        self.fetcher = fetcher
+        self.progress = progress if progress is not None else open_progress_log(data_dir)
+        if sink is None:
+            from output_sinks import CsvSink
+            sink = CsvSink(data_dir)
+        self.sink = sink
+        # One controller for all workers, so the per-host rate covers the whole pool
+        self.rate = rate or RateController()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # One lock shared by every scraper so CSV/progress writes never interleave
+        self.lock = threading.RLock()
+        self._idle = queue.Queue()
+        self._scrapers = []
+        self._create_lock = threading.Lock()
+        self._processed = 0
+        self._successful = 0
+        self.driver_factory = DriverFactory(headless=headless, lean=lean, capture_network=capture_network)
+        if fetcher is None:
+            # Browsers boot in the background while the sitemap is read
+            self.driver_factory.prespawn(self.workers)
+
+    @contextmanager
+    def lease(self):
+        """Borrow an idle scraper, starting a new driver if the pool is not yet full"""
+        scraper = None
+        # Drivers come pre-spawned from the factory, so holding the lock here is brief
+        with self._create_lock:
+            if self._idle.empty() and len(self._scrapers) < self.workers:
+                scraper = ProfileScraper(self.data_dir, headless=self.headless, lock=self.lock,
+                                         fetcher=self.fetcher, progress=self.progress, sink=self.sink,
+                                         cache=self.cache, rate=self.rate, capture_network=self.capture_network,
+                                         lean=self.lean, driver_factory=self.driver_factory,
+                                         base_url=self.base_url, metrics=self.metrics,
+                                         batch_size=self.batch_size, on_saved=self.on_saved)
+                self._scrapers.append(scraper)
+                self.logger.info(f'Started driver {len(self._scrapers)}/{self.workers}')
+        if scraper is None:
+            scraper = self._idle.get()
+        try:
+            yield scraper
+        finally:
+            self._idle.put(scraper)
+
+    def _worker(self, work_queue, total, on_success=None):
+        with self.lease() as scraper:
+            while True:
+                try:
+                    url = work_queue.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    with self.lock:
+                        self._processed += 1
+                        position = self._processed
+                    scraper.logger.info(f"Scraping URL {position}/{total}")
+                    if scraper.scrape_profile(url):
+                        with self.lock:
+                            self._successful += 1
+                        if on_success:
+                            on_success(url)
+                except Exception as e:
+                    scraper.logger.error(f"Failed to scrape {url}")
+                    scraper.logger.error(f"Error details: {str(e)}")
+                    scraper.save_error(url, str(e))
+                finally:
+                    work_queue.task_done()
+
+    def scrape_all(self, urls, on_success=None):
+        """Scrape every URL with up to `workers` drivers and return the number of successes
+
+        on_success(url) is called for each profile that was scraped and saved.
+        """
+        work_queue = queue.Queue()
+        for url in urls:
+            work_queue.put(url)
+        total = work_queue.qsize()
+        self._processed = 0
+        self._successful = 0
+
+        workers = min(self.workers, total)
+        if workers:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._worker, work_queue, total, on_success) for _ in range(workers)]
+                for future in futures:
+                    future.result()
+        # Every profile of this call is saved before it returns
+        for scraper in self._scrapers:
+            scraper.save_profiles()
+        return self._successful
+
+    def close(self):
+        for scraper in self._scrapers:
+            scraper.save_profiles()
+            scraper.safe_quit_driver()
+        self._scrapers = []
+        self._idle = queue.Queue()
+        self.driver_factory.close()
+        self.sink.close()
+        self.progress.close()
+        if self.cache:
+            self.cache.close()
+        self.metrics.log_summary()
+        self.metrics.close()
 
 class SitemapScraper:
     def __init__(self, file_path='sitemap.xml/sitemap.xml'):
@@ -425,17 +675,13 @@ class SitemapScraper:
         self.investor_links = []
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    def iter_investor_links(self):
+        """Lazily yield investor profile URLs from the sitemap (or sitemap index, plain or gzipped)"""
+        return SitemapStream(self.file_path).urls(is_investor_profile)
+
     def parse_local_sitemap(self):
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                sitemap_content = f.read()
-            soup = BeautifulSoup(sitemap_content, 'xml')
-            self.investor_links = [
-                loc.text.strip()
-                for loc in soup.find_all('loc')
-                if '/investors/' in loc.text
-                and not loc.text.startswith('https://signal.nfx.com/investors/#signin')
-            ]
+            self.investor_links = list(self.iter_investor_links())
             self.logger.info(f'Found {len(self.investor_links)} investor profiles in sitemap')
             return True
         except Exception as e:
@@ -447,52 +693,100 @@ class SitemapScraper:
             return self.investor_links[:limit]
         return self.investor_links
 
-if __name__ == '__main__':
-    # Initialize profile scraper
-    scraper = ProfileScraper(data_dir=os.getcwd(), headless=False)
+def main():
+    from scraper import setup_logging
+
+    parser = argparse.ArgumentParser(description='Scrape investor profiles listed in the sitemap')
+    parser.add_argument('--workers', type=int, default=1, help='Number of concurrent browser workers')
+    parser.add_argument('--headless', action='store_true', help='Run Chrome without a visible window')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum number of profiles to scrape')
+    parser.add_argument('--batch-size', type=int, default=25, help='Profiles buffered per worker before each save')
+    parser.add_argument('--fetch', choices=['browser', 'http'], default='browser',
+                        help='Fetch pages with Chrome, or over HTTP with Chrome only as a fallback')
+    parser.add_argument('--output', choices=['csv', 'parquet', 'sqlite'], default='csv',
+                        help='Output format; sqlite also stores crawl progress')
+    parser.add_argument('--cache', action='store_true', help='Keep raw page HTML in output/cache for re-parsing')
+    parser.add_argument('--start-rate', type=float, default=0.2, help='Initial requests per second per host')
+    parser.add_argument('--max-rate', type=float, default=1.0, help='Ceiling on requests per second per host')
+    parser.add_argument('--capture-network', action='store_true',
+                        help='Build investments from the JSON responses the page loads instead of the rendered table')
+    parser.add_argument('--lean', action='store_true',
+                        help='Headless Chrome that skips images, fonts and media for more drivers per host')
+    parser.add_argument('--sitemap', default='sitemap.xml/sitemap.xml', help='Path or URL of the sitemap')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL,
+                        help='Site root for login and session cookies, e.g. a local stand_in_site.py')
+    add_metrics_arguments(parser)
+    add_queue_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging()
+
+    from http_fetcher import HttpFetcher
+    from output_sinks import make_sink
+    # Initialize profile scraper pool
+    cache = PageCache(os.path.join(os.getcwd(), 'output', 'cache')) if args.cache else None
+    rate = RateController(start_rate=args.start_rate, max_rate=args.max_rate)
+    fetcher = HttpFetcher(pool_size=max(10, args.workers), cache=cache, rate=rate) if args.fetch == 'http' else None
+    sink = make_sink(args.output, os.getcwd())
+    progress = sink if args.output == 'sqlite' else None
+    pool = DriverPool(data_dir=os.getcwd(), workers=args.workers, headless=args.headless,
+                      fetcher=fetcher, sink=sink, progress=progress, cache=cache, rate=rate,
+                      capture_network=args.capture_network, lean=args.lean, base_url=args.base_url,
+                      metrics=open_metrics(args), batch_size=args.batch_size)
+
+    if args.queue:
+        # Distributed mode: the shared queue decides which profiles this machine scrapes
+        work_queue = open_queue(args.queue)
+        worker = worker_name()
+        # Acked as soon as each batch is saved, so a crash only repeats the profiles not yet written
+        pool.on_saved = lambda urls: work_queue.ack(worker, urls)
+
+        def process(urls):
+            succeeded = []
+            pool.scrape_all(urls, on_success=succeeded.append)
+            return succeeded
+
+        try:
+            run_worker(work_queue, process, 'profiles', batch_size=max(args.queue_batch, pool.workers),
+                       worker=worker)
+        finally:
+            pool.close()
+            work_queue.close()
+        return
     
     # Initialize and parse sitemap
-    sitemap_scraper = SitemapScraper()
+    sitemap_scraper = SitemapScraper(args.sitemap)
     if sitemap_scraper.parse_local_sitemap():
         # Get all investor URLs
         all_investor_urls = sitemap_scraper.get_investor_links()
         
-        # Check for existing progress file
-        progress_file = os.path.join(os.getcwd(), 'progress.csv')
-        if os.path.exists(progress_file):
-            # Load already scraped URLs
-            progress_df = pd.read_csv(progress_file)
-            scraped_urls = set(progress_df['url'].tolist())
-            
+        # Check for existing progress
+        if len(pool.progress):
             # Filter out already scraped URLs
-            investor_urls = [url for url in all_investor_urls if url not in scraped_urls]
+            investor_urls = [url for url in all_investor_urls if not pool.progress.is_scraped(url)]
             print(f"Resuming from checkpoint - {len(investor_urls)} URLs remaining")
         else:
             investor_urls = all_investor_urls
             print(f"Starting fresh scrape - {len(investor_urls)} URLs to process")
+
+        if args.limit:
+            investor_urls = investor_urls[:args.limit]
         
         total_links = len(investor_urls)
-        successful_scrapes = 0
-
-        for i, url in enumerate(investor_urls, 1):
-            try:
-                scraper.logger.info(f"Scraping URL {i}/{total_links}")
-                scraper.scrape_profile(url)
-                successful_scrapes += 1
-            except Exception as e:
-                scraper.logger.error(f"Failed to scrape {url}")
-                scraper.logger.error(f"Error details: {str(e)}")
-                scraper.save_error(url, str(e))
-            finally:
-                scraper.random_sleep(5, 10)
+        try:
+            successful_scrapes = pool.scrape_all(investor_urls)
+        finally:
+            pool.close()
                 
         # Completion summary
-        scraper.logger.info(f"\n{'='*40}\nScraping completed!\n"
-                          f"Successfully scraped: {successful_scrapes}/{total_links}\n"
-                          f"Failed: {total_links - successful_scrapes}\n"
-                          f"Results saved to: investor_profiles.csv\n"
-                          f"Errors logged to: scraper_errors.csv\n"
-                          f"{'='*40}")
-        
-        scraper.save_profiles()
-        scraper.safe_quit_driver()
\ No newline at end of file
+        pool.logger.info(f"\n{'='*40}\nScraping completed!\n"
+                         f"Workers: {pool.workers}\n"
+                         f"Successfully scraped: {successful_scrapes}/{total_links}\n"
+                         f"Failed: {total_links - successful_scrapes}\n"
+                         f"Results saved to: {sink.describe('profiles')}\n"
+                         f"Errors logged to: {sink.describe('errors')}\n"
+                         f"{'='*40}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressLog:
+    def __init__(self, path: str, fsync_every: int = 20, legacy_json: str = None, legacy_csv: str = None):
+        """
+        Append-only crawl progress journal, one JSON record per line
+
+        The journal is read once into memory; each mark() appends a single line,
+        and lines are fsynced in batches. compact() rewrites the file with only
+        the latest status per URL.
+
+        Args:
+            path (str): Journal file path
+            fsync_every (int): Number of appended lines between fsyncs
+            legacy_json (str): Old progress.json list of URLs to import on first use
+            legacy_csv (str): Old progress.csv (url,status,...) to import on first use
+        """
+        self.path = path
+        self.fsync_every = max(1, int(fsync_every))
+        self._lock = threading.Lock()
+        self._status = {}
+        self._pending = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        is_new = not os.path.exists(self.path)
+        if not is_new:
+            self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if not is_new and self._ends_mid_line():
+            # Terminate a torn last line so the next record starts cleanly
+            self._file.write('\n')
+            self._file.flush()
+        if is_new:
+            self._import_legacy(legacy_json, legacy_csv)
+
+    def _load(self):
+        skipped = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self._status[record['url']] = record.get('status', 'success')
+                except (ValueError, KeyError, TypeError):
+                    # A torn last line from a crash mid-write is simply ignored
+                    skipped += 1
+        if skipped:
+            logger.warning(f"Skipped {skipped} unreadable lines in {self.path}")
+        logger.info(f"Loaded progress for {len(self._status)} URLs from {self.path}")
+
+    def _ends_mid_line(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def _import_legacy(self, legacy_json, legacy_csv):
+        imported = 0
+        try:
+            if legacy_json and os.path.exists(legacy_json):
+                with open(legacy_json, 'r') as f:
+                    for url in json.load(f):
+                        self.mark(url, 'success')
+                        imported += 1
+            if legacy_csv and os.path.exists(legacy_csv):
+                with open(legacy_csv, 'r', encoding='utf-8', newline='') as f:
+                    for row in csv.DictReader(f):
+                        if row.get('url'):
+                            self.mark(row['url'], row.get('status') or 'success')
+                            imported += 1
+        except Exception as e:
+            logger.error(f"Error importing legacy progress: {e}")
+        if imported:
+            self.flush()
+            logger.info(f"Imported {imported} legacy progress records into {self.path}")
+
+    def is_scraped(self, url: str) -> bool:
+        return url in self._status
+
+    def __contains__(self, url: str) -> bool:
+        return self.is_scraped(url)
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def status(self, url: str):
+        return self._status.get(url)
+
+    def urls(self, status: str = None) -> set:
+        """Return recorded URLs, optionally only those with the given status"""
+        with self._lock:
+            if status is None:
+                return set(self._status)
+            return {url for url, s in self._status.items() if s == status}
+
+    def mark(self, url: str, status: str = 'success', error: str = None):
+        record = {'url': url, 'status': status, 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')}
+        if error is not None:
+            record['error'] = error
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self._status[url] = status
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self.fsync_every:
+                os.fsync(self._file.fileno())
+                self._pending = 0
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def compact(self):
+        """Rewrite the journal with one line per URL, atomically replacing the old file"""
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            self._file.flush()
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for url, status in self._status.items():
+                    f.write(json.dumps({'url': url, 'status': status}) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self._pending = 0
+        logger.info(f"Compacted {self.path} to {len(self._status)} records")
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3 or sys.argv[1] != 'compact':
+        print('Usage: python progress_log.py compact <progress.log>')
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    progress = ProgressLog(sys.argv[2])
+    progress.compact()
+    progress.close()
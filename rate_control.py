@@ -0,0 +1,97 @@
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class HostRate:
+    """Pacing state for one host: current request rate and the next free token slot"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.next_slot = 0.0
+
+
+class RateController:
+    def __init__(self, start_rate: float = 0.2, max_rate: float = 1.0, min_rate: float = 1 / 60,
+                 increase: float = 0.05, decrease: float = 0.5, slow_seconds: float = 8.0, burst: int = 1,
+                 jitter: float = 0.2):
+        """
+        Per-host token bucket whose rate is tuned by AIMD feedback
+
+        Each healthy response adds `increase` requests/second up to max_rate; an
+        error, a response slower than slow_seconds, or a login redirect multiplies
+        the rate by `decrease` (a login redirect drops straight to min_rate).
+        Slots are reserved without holding a lock while waiting, so concurrent
+        callers are spread out rather than serialized.
+
+        Args:
+            start_rate (float): Initial requests per second for a new host
+            max_rate (float): Ceiling in requests per second per host
+            min_rate (float): Floor in requests per second per host
+            increase (float): Additive increase per healthy response
+            decrease (float): Multiplicative decrease on a bad response
+            slow_seconds (float): Responses slower than this count as a sign of load
+            burst (int): Requests that may go out back to back after an idle period
+            jitter (float): Random extra delay as a fraction of the interval
+        """
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.start_rate = min(max(start_rate, self.min_rate), max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_seconds = slow_seconds
+        self.burst = max(1, int(burst))
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self._hosts = {}
+
+    def _host(self, url: str) -> HostRate:
+        host = urlparse(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostRate(self.start_rate)
+        return state
+
+    def reserve(self, url: str) -> float:
+        """Claim the next request slot for url's host; returns the seconds to wait before sending"""
+        with self.lock:
+            state = self._host(url)
+            interval = 1.0 / state.rate
+            now = time.monotonic()
+            # Idle time banks at most `burst` tokens
+            slot = max(state.next_slot, now - (self.burst - 1) * interval)
+            state.next_slot = slot + interval * (1 + random.uniform(0, self.jitter))
+        return max(0.0, slot - now)
+
+    def wait(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def success(self, url: str, elapsed: float = None):
+        """Feed back a healthy response; slow ones still count against the rate"""
+        if elapsed is not None and elapsed > self.slow_seconds:
+            self.failure(url, reason=f'slow response ({elapsed:.1f}s)')
+            return
+        with self.lock:
+            state = self._host(url)
+            state.rate = min(self.max_rate, state.rate + self.increase)
+
+    def failure(self, url: str, reason: str = 'error', login: bool = False):
+        """Feed back a failed, throttled or login-walled response"""
+        with self.lock:
+            state = self._host(url)
+            old_rate = state.rate
+            state.rate = self.min_rate if login else max(self.min_rate, state.rate * self.decrease)
+            # Push the next slot out so requests already queued also slow down
+            state.next_slot = max(state.next_slot, time.monotonic() + 1.0 / state.rate)
+        logger.info(f"Backing off {urlparse(url).netloc} after {reason}: "
+                    f"{old_rate:.2f} -> {state.rate:.2f} requests/s")
+
+    def rate(self, url: str) -> float:
+        with self.lock:
+            return self._host(url).rate
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    lastmod TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+class NotModified(Exception):
+    """Raised by a conditional fetch when the page has not changed since it was last crawled"""
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class RecrawlState:
+    def __init__(self, db_path: str, ttl_days: float = 7, batch_size: int = 50):
+        """
+        Per-URL freshness record that drives incremental recrawls
+
+        Keeps each page's sitemap <lastmod>, its ETag / Last-Modified response
+        headers and a hash of its HTML. A URL is due again when it has never been
+        crawled, its sitemap lastmod changed, or its TTL expired; due pages are
+        then fetched with conditional requests. Response metadata is held back
+        until commit(), so a page that fetched but failed to parse stays due.
+
+        Args:
+            db_path (str): SQLite database path
+            ttl_days (float): Days after which a page is refetched even if unchanged
+            batch_size (int): Commits grouped into one transaction
+        """
+        self.db_path = db_path
+        self.ttl = ttl_days * 86400
+        self.batch_size = max(1, int(batch_size))
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._pending = 0
+        # Sitemap lastmod and response metadata for due URLs, until commit()
+        self._lastmod = {}
+        self._observed = {}
+        self.stats = {'due': 0, 'skipped': 0, 'unchanged': 0}
+
+    def _row(self, url: str):
+        with self.lock:
+            return self.conn.execute(
+                'SELECT lastmod, etag, last_modified, content_hash, checked_at FROM pages WHERE url = ?', (url,)
+            ).fetchone()
+
+    def is_due(self, url: str, lastmod: str = None) -> bool:
+        row = self._row(url)
+        if row is None:
+            return True
+        stored_lastmod, _, _, _, checked_at = row
+        if lastmod and lastmod != stored_lastmod:
+            return True
+        return time.time() - checked_at > self.ttl
+
+    def select(self, entries):
+        """Lazily filter (url, lastmod) sitemap entries down to the URLs that are due"""
+        for url, lastmod in entries:
+            if self.is_due(url, lastmod):
+                self.stats['due'] += 1
+                if lastmod:
+                    self._lastmod[url] = lastmod
+                yield url
+            else:
+                self.stats['skipped'] += 1
+
+    def validators(self, url: str) -> dict:
+        """Conditional request headers from the last committed crawl of url"""
+        row = self._row(url)
+        headers = {}
+        if row is not None:
+            if row[1]:
+                headers['If-None-Match'] = row[1]
+            if row[2]:
+                headers['If-Modified-Since'] = row[2]
+        return headers
+
+    def stored_hash(self, url: str):
+        row = self._row(url)
+        return row[3] if row else None
+
+    def observe(self, url: str, etag: str = None, last_modified: str = None, html_hash: str = None):
+        """Hold a fresh response's metadata until the page is committed"""
+        with self.lock:
+            self._observed[url] = (etag, last_modified, html_hash)
+
+    def _write(self, url: str, etag, last_modified, html_hash):
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO pages (url, lastmod, etag, last_modified, content_hash, checked_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET lastmod=COALESCE(excluded.lastmod, lastmod), '
+                'etag=COALESCE(excluded.etag, etag), last_modified=COALESCE(excluded.last_modified, last_modified), '
+                'content_hash=COALESCE(excluded.content_hash, content_hash), checked_at=excluded.checked_at',
+                (url, self._lastmod.pop(url, None), etag, last_modified, html_hash, time.time())
+            )
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self.flush()
+
+    def commit(self, url: str):
+        """Record url as freshly crawled using the metadata observed when it was fetched"""
+        with self.lock:
+            etag, last_modified, html_hash = self._observed.pop(url, (None, None, None))
+            self._write(url, etag, last_modified, html_hash)
+
+    def commit_all(self, urls):
+        for url in urls:
+            self.commit(url)
+
+    def unchanged(self, url: str):
+        """Record a 304 or identical-content response: the stored copy is still current"""
+        with self.lock:
+            self.stats['unchanged'] += 1
+            self._observed.pop(url, None)
+            self._write(url, None, None, None)
+
+    def flush(self):
+        with self.lock:
+            self.conn.commit()
+            self._pending = 0
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.flush()
+                self.conn.close()
+                self.conn = None
+        logger.info(f"Recrawl: {self.stats['due']} due, {self.stats['skipped']} still fresh, "
+                    f"{self.stats['unchanged']} unchanged on refetch")
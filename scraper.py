@@ -1,50 +1,283 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
-from urllib.parse import urlparse
 import time
 import logging
 from typing import List, Dict
-import xml.etree.ElementTree as ET
 import os
 import json
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import argparse
 import random
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import base64
-from cryptography.fernet import Fernet
 from contextlib import contextmanager
+from progress_log import ProgressLog
+from page_cache import PageCache
+from sitemap_stream import SitemapStream, is_investor_list
+from rate_control import RateController
+from page_ready import install_readiness_hook, wait_until_quiet, count_rows, wait_for_rows
+from browser_session import BrowserSession, DEFAULT_BASE_URL
+from driver_factory import create_driver
+from crawl_metrics import StageMetrics, add_metrics_arguments, open_metrics
+from work_queue import add_queue_arguments, open_queue, run_worker
+from list_checkpoint import ListCheckpoints
 
-# Set up logging with more detailed format
-output_dir = os.path.join(os.getcwd(), 'output', 'logs')
-os.makedirs(output_dir, exist_ok=True)
-log_file = os.path.join(output_dir, f'scraper_{time.strftime("%Y%m%d_%H%M%S")}.log')
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(log_file)
-    ]
-)
+# Selenium, requests, pandas and cryptography are imported on the code paths that use
+# them, so the list parser can be imported without pulling in the browser stack
 logger = logging.getLogger(__name__)
 
-class SitemapScraper:
-    def __init__(self, sitemap_path: str, delay: float = 1.0):
+
+def setup_logging():
+    """Log to the console and to a timestamped file in output/logs"""
+    output_dir = os.path.join(os.getcwd(), 'output', 'logs')
+    os.makedirs(output_dir, exist_ok=True)
+    log_file = os.path.join(output_dir, f'scraper_{time.strftime("%Y%m%d_%H%M%S")}.log')
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(log_file)
+        ]
+    )
+
+# outerHTML of the first table's rows from a given offset, so pagination only transfers new rows
+NEW_TABLE_ROWS = """
+var table = document.querySelector('table');
+if (!table) { return []; }
+return Array.prototype.slice.call(table.querySelectorAll('tr'), arguments[0]).map(function (row) {
+    return row.outerHTML;
+});
+"""
+
+# 'Load More Investors' button, matched case-insensitively
+LOAD_MORE_XPATH = ("//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+                   "'abcdefghijklmnopqrstuvwxyz'), 'load more investors')]")
+
+class InvestorListParser:
+    """Parsing for investor-list pages; needs no browser, so it can run anywhere the HTML is"""
+
+    def extract_investor_data(self, soup: BeautifulSoup) -> List[Dict]:
+        investors = []
+        try:
+            # First find the table containing investor data
+            table = soup.find('table')
+            if not table:
+                logger.warning("No table found on the page")
+                return []
+    
+            # Find all investor rows - they are tr elements containing td with flex div
+            investor_rows = table.find_all('tr')
+            logger.info(f"Found {len(investor_rows)} investor rows on the page")
+            investors = self.extract_investor_rows(investor_rows)
+        except Exception as e:
+            logger.error(f"Error extracting investor data: {str(e)}")
+        
+        logger.info(f"Extracted {len(investors)} investors from the page")
+        return investors
+
+    def extract_investor_rows(self, investor_rows) -> List[Dict]:
+        """Extract investors from table rows; used for whole pages and for rows appended by Load More"""
+        investors = []
+        for row in investor_rows:
+            try:
+                # Get the first td that contains the investor info
+                cell = row.find('td')
+                if not cell:
+                    continue
+                    
+                investor = self._extract_single_investor(cell)
+                if investor:  # Remove validation check, accept all non-None investors
+                    # Add investment range if available
+                    range_cell = row.find('td', class_='text-center pt2')
+                    if range_cell:
+                        investor['investment_range'] = range_cell.get_text(strip=True)
+                    else:
+                        investor['investment_range'] = ''
+                    
+                    # Add location and categories
+                    location_cell = row.find('td', attrs={'style': 'max-width: 400px;'})
+                    if location_cell:
+                        investor['locations'] = [a.get_text(strip=True) for a in location_cell.find_all('a')]
+                    else:
+                        investor['locations'] = []
+                    
+                    categories_cell = row.find_all('td', attrs={'style': 'max-width: 400px;'})[-1]
+                    if categories_cell:
+                        investor['categories'] = [a.get_text(strip=True) for a in categories_cell.find_all('a')]
+                    else:
+                        investor['categories'] = []
+                    
+                    investors.append(investor)
+            except Exception as e:
+                logger.error(f"Error extracting investor row data: {str(e)}")
+                continue
+        return investors
+
+    def extract_all_visible_text(self, soup: BeautifulSoup) -> str:
+        """Extract all visible text from the page, excluding scripts, styles, and hidden elements."""
+        # Remove script and style elements
+        for element in soup(['script', 'style', 'noscript', 'header', 'footer', 'svg', 'img']):
+            element.decompose()
+        # Remove hidden elements
+        for tag in soup.find_all(style=True):
+            if 'display:none' in tag['style'] or 'visibility:hidden' in tag['style']:
+                tag.decompose()
+        # Get all visible text
+        text = soup.get_text(separator=' ', strip=True)
+        # Collapse multiple spaces
+        import re
+        text = re.sub(r'\s+', ' ', text)
+        return text
+
+    def has_load_more(self, soup: BeautifulSoup) -> bool:
+        """True if the list is paginated behind the JS-only 'Load More Investors' button"""
+        return any('load more investors' in button.get_text().lower() for button in soup.find_all('button'))
+
+    def parse_list_html(self, url: str, html: str, allow_paginated: bool = False):
+        """Parse fetched list HTML into (raw_data, investors); returns None when the browser is required"""
+        soup = BeautifulSoup(html, 'lxml')
+        if not allow_paginated and self.has_load_more(soup):
+            logger.info(f"Falling back to browser for paginated list: {url}")
+            return None
+
+        investors = []
+        seen = set()
+        for investor in self.extract_investor_data(soup):
+            investor_key = (investor['name'], investor['company'], investor['role'])
+            if investor_key not in seen:
+                seen.add(investor_key)
+                investor['source_url'] = url
+                investor['scrape_timestamp'] = time.strftime('%Y-%m-%d %H:%M:%S')
+                investors.append(investor)
+
+        raw_data = {
+            'url': url,
+            'raw_text': self.extract_all_visible_text(soup),
+            'scrape_timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        logger.info(f"Total unique investors extracted: {len(investors)}")
+        return raw_data, investors
+
+    def _extract_single_investor(self, cell):
+        # try:
+        #     investor = {
+        #         'name': '',
+        #         'company': '',
+        #         'role': '',
+        #         'profile_url': '',
+        #         'company_url': '',
+        #         'image_url': ''
+        #     }
+            
+        #     # Find the main div containing investor info
+        #     info_div = cell.find('div', class_='flex')
+        #     if not info_div:
+        #         return None  # Return None for invalid entries instead of empty data
+            
+        #     # Extract image URL
+        #     img_tag = info_div.find('img')
+        #     if img_tag and img_tag.get('src'):
+        #         investor['image_url'] = img_tag['src']
+            
+        #     # Find the div containing name and other details
+        #     details_div = info_div.find('div', recursive=False)  # Get immediate div child
+        #     if details_div:
+        #         # Extract name and profile URL
+        #         name_link = details_div.find('a', href=lambda x: x and '/investors/' in x)
+        #         if name_link:
+        #             investor['name'] = name_link.get_text(strip=True)
+        #             investor['profile_url'] = 'https://signal.nfx.com' + name_link['href']
+                
+        #         # Extract company name and URL
+        #         company_link = details_div.find('a', href=lambda x: x and '/firms/' in x)
+        #         if company_link:
+        #             investor['company'] = company_link.get_text(strip=True)
+        #             investor['company_url'] = 'https://signal.nfx.com' + company_link['href']
+                
+        #         # Extract role
+        #         role_elem = details_div.find(['span', 'div'], class_=lambda x: x and any(c in x for c in ['role', 'title', 'position']))
+        #         if role_elem:
+        #             investor['role'] = role_elem.get_text(strip=True)
+            
+        #     # Only return investor if we found at least name or company
+        #     return investor if investor['name'] or investor['company'] else None
+            
+        # except Exception as e:
+        #     logger.error(f"Error extracting investor data: {str(e)}")
+        #     return None
+        try:
+            investor = {
+                'name': '',
+                'company': '',
+                'role': '',
+                'profile_url': '',
+                'company_url': '',
+                'image_url': ''
+            }
+            
+            # Find the main div containing investor info
+            info_div = cell.find('div', class_='flex')
+            if not info_div:
+                return None  # Return None for invalid entries instead of empty data
+            
+            # Extract image URL
+            img_tag = info_div.find('img')
+            if img_tag and img_tag.get('src'):
+                investor['image_url'] = img_tag['src']
+            
+            # Extract name
+            name_tag = info_div.find('strong', class_='sn-investor-name null')
+            if name_tag:
+                investor['name'] = name_tag.get_text(strip=True)
+                investor['profile_url'] = name_tag.find_parent('a')['href']
+            
+            # Extract company
+            company_tag = info_div.find('a', href=True)
+            if company_tag:
+                investor['company'] = company_tag.get_text(strip=True)
+                investor['company_url'] = company_tag['href']
+            
+            # Extract role
+            role_tag = info_div.find('span', class_='sn-small-link hidden-xs null')
+            if role_tag:
+                investor['role'] = role_tag.get_text(strip=True)
+            
+            return investor
+        except Exception as e:
+            logger.error(f"Error extracting investor data: {str(e)}")
+            return None
+
+class SitemapScraper(InvestorListParser):
+    def __init__(self, sitemap_path: str, delay: float = 1.0, fetcher: 'HttpFetcher' = None, sink=None,
+                 progress=None, cache=None, rate: RateController = None, headless: bool = False,
+                 lean: bool = False, base_url: str = DEFAULT_BASE_URL, metrics: StageMetrics = None,
+                 checkpoints: ListCheckpoints = None, checkpoint_every: int = 5):
         """
         Initialize the scraper with sitemap path and delay between requests
         
         Args:
             sitemap_path (str): Path to the sitemap file
             delay (float): Delay between requests in seconds
+            fetcher (HttpFetcher): Optional HTTP backend; Chrome is then only started for paginated lists
+            sink: Output sink for raw text and investors (defaults to CSV files in output/data)
+            progress: Progress tracker (defaults to the output/progress.log journal)
+            cache (PageCache): Optional raw HTML cache for pages loaded in Chrome
+            rate (RateController): Adaptive per-host pacing for page loads (created if not given)
+            headless (bool): Run Chrome without a visible window
+            lean (bool): Headless Chrome that skips images, fonts and media (see driver_factory)
+            base_url (str): Site root for login and session cookies
+            metrics (StageMetrics): Per-stage timings (kept in memory if not given)
+            checkpoints (ListCheckpoints): Pagination checkpoints (defaults to output/checkpoints)
+            checkpoint_every (int): Load More pages between writes of the investors found so far
         """
         self.sitemap_path = sitemap_path
         self.delay = delay
+        self.fetcher = fetcher
+        self.cache = cache
+        self.rate = rate or RateController()
+        self.headless = headless
+        self.lean = lean
+        self.base_url = base_url.rstrip('/')
+        self.metrics = metrics or StageMetrics()
+        self.checkpoint_every = max(1, int(checkpoint_every))
         
         # Create output directory structure
         self.output_dir = os.path.join(os.getcwd(), 'output')
@@ -57,12 +290,19 @@ class SitemapScraper:
         os.makedirs(self.data_dir, exist_ok=True)
         os.makedirs(self.logs_dir, exist_ok=True)
         os.makedirs(self.cookies_dir, exist_ok=True)
+        self.checkpoints = checkpoints or ListCheckpoints(os.path.join(self.output_dir, 'checkpoints'))
+        
+        if sink is None:
+            from output_sinks import CsvSink
+            sink = CsvSink(self.data_dir)
+        self.sink = sink
         
         # Update file paths
         self.cookies_file = os.path.join(self.cookies_dir, 'cookies.enc')
         self.key_file = os.path.join(self.cookies_dir, 'key.key')
         
         # Generate or load encryption key
+        from cryptography.fernet import Fernet
         if not os.path.exists(self.key_file):
             self.key = Fernet.generate_key()
             with open(self.key_file, 'wb') as f:
@@ -73,35 +313,52 @@ class SitemapScraper:
         
         self.cipher_suite = Fernet(self.key)
         
-        # Set up Chrome options with enhanced anti-detection
-        options = uc.ChromeOptions()
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-infobars')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-browser-side-navigation')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-notifications')
-        options.add_argument('--window-size=1920,1080')
+        # Append-only progress journal, migrated from progress.json on first run
+        if progress is None:
+            progress = ProgressLog(
+                os.path.join(self.output_dir, 'progress.log'),
+                legacy_json=os.path.join(self.output_dir, 'progress.json')
+            )
+        self.progress = progress
         
-        # Add random user agent
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36'
-        ]
-        options.add_argument(f'user-agent={random.choice(user_agents)}')
+        # Cookies go into each driver once, not before every page
+        self.session = BrowserSession(self.read_cookies, base_url=self.base_url, rate=self.rate)
         
-        # Initialize the Chrome driver with service
-        service = Service(ChromeDriverManager().install())
-        self.driver = uc.Chrome(options=options, service=service)
-        self.driver.set_page_load_timeout(30)
+        self._driver = None
+        if fetcher is None:
+            self._driver = self.init_driver()
+        else:
+            cookies = self.read_cookies()
+            if cookies:
+                fetcher.set_cookies(cookies)
         
         logger.info(f"Initialized scraper with sitemap path: {sitemap_path}")
 
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self.init_driver()
+        return self._driver
+
+    def init_driver(self):
+        """Start Chrome with anti-detection options from the cached, pre-patched driver binary"""
+        with self.metrics.stage('driver_start', kind='list'):
+            return create_driver(headless=self.headless, lean=self.lean)
+
+    def close(self):
+        """Quit the driver if one was started"""
+        if self._driver:
+            self._driver.quit()
+            self._driver = None
+        if self.fetcher:
+            self.fetcher.close()
+        if self.cache:
+            self.cache.close()
+        self.sink.close()
+        self.progress.close()
+        self.metrics.log_summary()
+        self.metrics.close()
+
     @contextmanager
     def managed_driver(self):
         """Context manager for the Chrome driver"""
@@ -136,30 +393,28 @@ class SitemapScraper:
         except Exception as e:
             logger.error(f"Error saving cookies: {str(e)}")
 
-    def load_cookies(self):
-        """Load cookies from encrypted file"""
+    def read_cookies(self) -> List[Dict]:
+        """Decrypt the cookies file, returning an empty list if it is missing or unreadable"""
         try:
             if not os.path.exists(self.cookies_file):
                 logger.warning("No cookies file found")
-                return False
+                return []
                 
             with open(self.cookies_file, 'rb') as f:
                 encrypted_data = f.read()
             
             decrypted_data = self.cipher_suite.decrypt(encrypted_data)
-            cookies = json.loads(decrypted_data)
-            
-            # Navigate to base domain before adding cookies
-            self.driver.get("https://signal.nfx.com")
-            
-            for cookie in cookies:
-                if 'expiry' in cookie and cookie['expiry'] is None:
-                    del cookie['expiry']
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception as e:
-                    logger.warning(f"Could not add cookie: {cookie.get('name', '')}: {e}")
-            
+            return json.loads(decrypted_data)
+        except Exception as e:
+            logger.error(f"Error reading cookies: {str(e)}")
+            return []
+
+    def load_cookies(self):
+        """Reload cookies from the encrypted file into the driver, replacing the current session"""
+        try:
+            self.session.invalidate()
+            if not self.session.ensure(self.driver):
+                return False
             logger.info("Cookies loaded successfully")
             return True
         except Exception as e:
@@ -221,7 +476,7 @@ class SitemapScraper:
                 print("After logging in, come back here and press Enter.")
                 print("=====================\n")
                 input("Press Enter to open the browser window...")
-                self.driver.get("https://signal.nfx.com/login")
+                self.driver.get(f"{self.base_url}/login")
                 self.random_sleep()
                 input("Please log in in the browser window and press Enter when done...")
                 # Verify login was successful
@@ -237,43 +492,29 @@ class SitemapScraper:
             logger.error(f"Error during authentication: {str(e)}")
             return False
     def load_progress(self):
-        progress_file = os.path.join(self.output_dir, 'progress.json')
-        try:
-            if os.path.exists(progress_file):
-                with open(progress_file, 'r') as f:
-                    return set(json.load(f))
-        except Exception as e:
-            logger.error(f"Error loading progress: {e}")
-        return set()
+        return self.progress.urls()
 
-    def save_progress(self, url: str):
-        progress_file = os.path.join(self.output_dir, 'progress.json')
+    def save_progress(self, url: str, status: str = 'success', error: str = None):
         try:
-            scraped = self.load_progress()
-            scraped.add(url)
-            with open(progress_file, 'w') as f:
-                json.dump(list(scraped), f)
+            self.progress.mark(url, status, error)
         except Exception as e:
             logger.error(f"Error saving progress: {e}")
+    def iter_sitemap_urls(self):
+        """Lazily yield investor list URLs from the sitemap (or sitemap index, plain or gzipped)"""
+        logger.info(f"Reading sitemap file from: {self.sitemap_path}")
+        count = 0
+        for url in SitemapStream(self.sitemap_path).urls(is_investor_list):
+            count += 1
+            logger.debug(f"Found investor list URL: {url}")
+            yield url
+        logger.info(f"Found {count} investor list URLs in sitemap")
+        if count == 0:
+            logger.warning("No investor list URLs found in sitemap!")
+
     def get_sitemap_urls(self) -> List[str]:
         """Extract URLs from the local sitemap file"""
         try:
-            logger.info(f"Reading sitemap file from: {self.sitemap_path}")
-            # Parse local XML file
-            tree = ET.parse(self.sitemap_path)
-            root = tree.getroot()
-            
-            # Extract URLs (handling both standard sitemap and sitemap index)
-            urls = []
-            for url in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
-                if 'signal.nfx.com/investor-lists' in url.text:
-                    urls.append(url.text)
-                    logger.debug(f"Found investor list URL: {url.text}")
-            
-            logger.info(f"Found {len(urls)} investor list URLs in sitemap")
-            if len(urls) == 0:
-                logger.warning("No investor list URLs found in sitemap!")
-            return urls
+            return list(self.iter_sitemap_urls())
         except Exception as e:
             logger.error(f"Error parsing sitemap: {str(e)}")
             return []
@@ -283,108 +524,124 @@ class SitemapScraper:
         sleep_time = random.uniform(min_seconds, max_seconds)
         time.sleep(sleep_time)
 
-    def extract_investor_data(self, soup: BeautifulSoup) -> List[Dict]:
-        investors = []
-        try:
-            # First find the table containing investor data
-            table = soup.find('table')
-            if not table:
-                logger.warning("No table found on the page")
-                return []
-    
-            # Find all investor rows - they are tr elements containing td with flex div
-            investor_rows = table.find_all('tr')
-            logger.info(f"Found {len(investor_rows)} investor rows on the page")
-            
-            for row in investor_rows:
-                try:
-                    # Get the first td that contains the investor info
-                    cell = row.find('td')
-                    if not cell:
-                        continue
-                        
-                    investor = self._extract_single_investor(cell)
-                    if investor:  # Remove validation check, accept all non-None investors
-                        # Add investment range if available
-                        range_cell = row.find('td', class_='text-center pt2')
-                        if range_cell:
-                            investor['investment_range'] = range_cell.get_text(strip=True)
-                        else:
-                            investor['investment_range'] = ''
-                        
-                        # Add location and categories
-                        location_cell = row.find('td', attrs={'style': 'max-width: 400px;'})
-                        if location_cell:
-                            investor['locations'] = [a.get_text(strip=True) for a in location_cell.find_all('a')]
-                        else:
-                            investor['locations'] = []
-                        
-                        categories_cell = row.find_all('td', attrs={'style': 'max-width: 400px;'})[-1]
-                        if categories_cell:
-                            investor['categories'] = [a.get_text(strip=True) for a in categories_cell.find_all('a')]
-                        else:
-                            investor['categories'] = []
-                        
-                        investors.append(investor)
-                except Exception as e:
-                    logger.error(f"Error extracting investor row data: {str(e)}")
-                    continue
-        except Exception as e:
-            logger.error(f"Error extracting investor data: {str(e)}")
-        
-        logger.info(f"Extracted {len(investors)} investors from the page")
-        return investors
+    def cache_page(self, url: str, html: str):
+        if self.cache is not None:
+            try:
+                self.cache.put(url, html)
+            except Exception as e:
+                logger.error(f"Error caching page {url}: {str(e)}")
 
-    def extract_all_visible_text(self, soup: BeautifulSoup) -> str:
-        """Extract all visible text from the page, excluding scripts, styles, and hidden elements."""
-        # Remove script and style elements
-        for element in soup(['script', 'style', 'noscript', 'header', 'footer', 'svg', 'img']):
-            element.decompose()
-        # Remove hidden elements
-        for tag in soup.find_all(style=True):
-            if 'display:none' in tag['style'] or 'visibility:hidden' in tag['style']:
-                tag.decompose()
-        # Get all visible text
-        text = soup.get_text(separator=' ', strip=True)
-        # Collapse multiple spaces
-        import re
-        text = re.sub(r'\s+', ' ', text)
-        return text
+    def _stage(self, name: str, url: str):
+        return self.metrics.stage(name, kind='list', url=url)
+
+    def load_page(self, url: str):
+        """driver.get paced by the rate controller, returning once the page has settled"""
+        install_readiness_hook(self.driver)
+        with self._stage('rate_wait', url):
+            self.rate.wait(url)
+        started = time.monotonic()
+        with self._stage('navigate', url):
+            self.driver.get(url)
+        with self._stage('settle', url):
+            wait_until_quiet(self.driver)
+        # Load time includes settling, so slow XHR-driven pages also count against the rate
+        elapsed = time.monotonic() - started
+        if self.session.login_required(self.driver):
+            self.rate.failure(url, reason='login redirect', login=True)
+        else:
+            self.rate.success(url, elapsed)
+
+    def scrape_page_http(self, url: str):
+        """Scrape a single-page list without Chrome; returns None when the browser is required"""
+        with self._stage('fetch_http', url):
+            html = self.fetcher.fetch(url)
+        if html is None:
+            return None
+        with self._stage('parse_extract', url):
+            return self.parse_list_html(url, html)
+
+    def fast_forward(self, url: str, rows: int):
+        """Click Load More, without extracting anything, until the table has at least `rows` rows"""
+        from selenium.webdriver.common.by import By
+
+        current = count_rows(self.driver, 'table tr')
+        clicks = 0
+        while current < rows:
+            load_more = self.driver.find_elements(By.XPATH, LOAD_MORE_XPATH)
+            if not load_more or not load_more[0].is_enabled():
+                break
+            load_more[0].click()
+            after = wait_for_rows(self.driver, 'table tr', current)
+            if after <= current:
+                break
+            current = after
+            clicks += 1
+        if current < rows:
+            logger.warning(f"Only {current} of {rows} checkpointed rows are on {url} now; continuing from there")
+        logger.info(f"Fast-forwarded {url} with {clicks} Load More clicks to {current} rows")
+
+    def save_checkpoint(self, url: str, investors: list, page: int, row_offset: int):
+        """Write the investors found since the last checkpoint, then record how far the list got"""
+        if investors:
+            self.sink.write_investors(investors)
+            self.sink.flush()
+        # Recorded after the rows are written, so a crash in between repeats a batch instead of losing it
+        self.checkpoints.save(url, page, row_offset,
+                              [(inv['name'], inv['company'], inv['role']) for inv in investors])
+        investors.clear()
 
     def scrape_page(self, url: str, max_retries: int = 3) -> tuple:
-        """Scrape a page and return both raw text and investor data"""
-        all_investors_list = []  # Initialize the list outside the loop
+        """Scrape a page and return both raw text and investor data
+
+        On paginated lists, investors are written to the sink every
+        checkpoint_every pages as the list is paginated, and only those not yet
+        written are returned. A retry, in this run or a later one, resumes from
+        the last checkpoint instead of page 1.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        if self.fetcher is not None:
+            result = self.scrape_page_http(url)
+            if result is not None:
+                return result
+
         for attempt in range(max_retries):
             try:
                 logger.info(f"Scraping page: {url} (Attempt {attempt + 1}/{max_retries})")
-                self.load_cookies()
-                self.driver.get(url)
-                self.random_sleep(5, 8)  # Increased initial wait time
+                with self._stage('session', url):
+                    self.session.ensure(self.driver)
+                self.load_page(url)
                 
-                if self.handle_authentication():
-                    self.load_cookies()
-                    self.driver.get(url)
-                    self.random_sleep(5, 8)
+                # Only an actual login redirect re-establishes the session
+                if self.session.login_required(self.driver):
+                    logger.warning("Redirected to login page, reloading saved cookies")
+                    self.metrics.count('crawl_login_redirects_total', kind='list')
+                    with self._stage('login', url):
+                        if self.load_cookies():
+                            self.load_page(url)
+                        if self.session.login_required(self.driver):
+                            if not self.handle_authentication():
+                                raise Exception("Authentication failed")
+                            self.session.mark_authenticated(self.driver)
+                            self.load_page(url)
                 
                 # Wait for any content to load first
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                
-                # Check if we're on a login page
-                if "login" in self.driver.current_url.lower():
-                    logger.warning("Redirected to login page, attempting to authenticate")
-                    if not self.handle_authentication():
-                        raise Exception("Authentication failed")
-                    self.driver.get(url)
-                    self.random_sleep(5, 8)
+                with self._stage('wait_body', url):
+                    WebDriverWait(self.driver, 20).until(
+                        EC.presence_of_element_located((By.TAG_NAME, "body"))
+                    )
                 
                 # Get page source and create soup object
-                page_source = self.driver.page_source
-                soup = BeautifulSoup(page_source, 'lxml')
+                with self._stage('page_source', url):
+                    page_source = self.driver.page_source
+                with self._stage('parse', url):
+                    soup = BeautifulSoup(page_source, 'lxml')
                 
                 # Always extract raw text first
-                raw_text = self.extract_all_visible_text(soup)
+                with self._stage('extract', url):
+                    raw_text = self.extract_all_visible_text(soup)
                 raw_data = {
                     'url': url,
                     'raw_text': raw_text,
@@ -395,43 +652,80 @@ class SitemapScraper:
                 table = soup.find('table')
                 if not table:
                     logger.info(f"No table found on page: {url}")
+                    self.cache_page(url, page_source)
                     return raw_data, []
                 
-                all_investors = set()  # Use a set to track unique investors
+                # Investors up to a checkpoint's row_offset are already in the sink
+                checkpoint = self.checkpoints.load(url)
+                all_investors = checkpoint['keys'] if checkpoint else set()  # Use a set to track unique investors
+                all_investors_list = []  # Investors not yet written by a checkpoint
                 page_num = 1
+                # Rows of the first table already extracted; each Load More only pulls the rows after it
+                investor_rows = table.find_all('tr')
+                row_offset = len(investor_rows)
+                if checkpoint and checkpoint['row_offset'] > row_offset:
+                    logger.info(f"Resuming {url} after page {checkpoint['page']}: "
+                                f"{len(all_investors)} investors already saved")
+                    with self._stage('resume', url):
+                        self.fast_forward(url, checkpoint['row_offset'])
+                    page_num = checkpoint['page']
+                    with self._stage('row_source', url):
+                        new_rows = self.driver.execute_script(NEW_TABLE_ROWS, checkpoint['row_offset'])
+                    row_offset = checkpoint['row_offset'] + len(new_rows)
+                    with self._stage('parse', url):
+                        investor_rows = BeautifulSoup(f"<table>{''.join(new_rows)}</table>", 'lxml').find_all('tr')
                 
                 while True:
-                    # Extract investors from current page
-                    investors = self.extract_investor_data(soup)
+                    # Extract investors from the rows added by the last page load
+                    with self._stage('extract', url):
+                        investors = self.extract_investor_rows(investor_rows)
                     if investors:
                         # Create tuples of key fields to identify unique investors
                         for investor in investors:
                             investor_key = (investor['name'], investor['company'], investor['role'])
                             if investor_key not in all_investors:
                                 all_investors.add(investor_key)
+                                investor['source_url'] = url
+                                investor['scrape_timestamp'] = time.strftime('%Y-%m-%d %H:%M:%S')
                                 all_investors_list.append(investor)
                         logger.info(f"Extracted {len(investors)} investors from page {page_num} (Total unique: {len(all_investors)})")
                     
+                    # Stream rows to the sink as pagination goes, so a crash only repeats the last few pages
+                    if page_num % self.checkpoint_every == 0:
+                        with self._stage('checkpoint', url):
+                            self.save_checkpoint(url, all_investors_list, page_num, row_offset)
+                    
                     # Look for 'Load More Investors' button with case-insensitive match
-                    load_more = self.driver.find_elements(By.XPATH, "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'load more investors')]")
+                    load_more = self.driver.find_elements(By.XPATH, LOAD_MORE_XPATH)
                     if not load_more or not load_more[0].is_enabled():
                         break
                     
-                    # Click load more and wait
-                    load_more[0].click()
-                    self.random_sleep(3.0, 5.0)  # Longer delay for loading
+                    # Click load more and wait for the appended rows to arrive
+                    with self._stage('load_more', url):
+                        rows_before = count_rows(self.driver, 'table tr')
+                        load_more[0].click()
+                        rows_after = wait_for_rows(self.driver, 'table tr', rows_before)
+                    if rows_after <= rows_before:
+                        logger.warning(f"Load More added no rows after page {page_num}; stopping pagination")
+                        break
                     page_num += 1
                     
-                    # Get updated page source
+                    # Pull only the appended rows instead of re-serializing and re-parsing the whole page
+                    with self._stage('row_source', url):
+                        new_rows = self.driver.execute_script(NEW_TABLE_ROWS, row_offset)
+                    row_offset += len(new_rows)
+                    with self._stage('parse', url):
+                        investor_rows = BeautifulSoup(f"<table>{''.join(new_rows)}</table>", 'lxml').find_all('tr')
+                
+                # The full page is serialized once, for the raw text and the cache
+                with self._stage('page_source', url):
                     page_source = self.driver.page_source
+                with self._stage('parse', url):
                     soup = BeautifulSoup(page_source, 'lxml')
                 
-                # Add metadata to investors
-                for inv in all_investors_list:
-                    inv['source_url'] = url
-                    inv['scrape_timestamp'] = time.strftime('%Y-%m-%d %H:%M:%S')
-                
-                raw_text = self.extract_all_visible_text(soup)
+                self.cache_page(url, page_source)
+                with self._stage('extract', url):
+                    raw_text = self.extract_all_visible_text(soup)
                 raw_data = {
                     'url': url,
                     'raw_text': raw_text,
@@ -443,8 +737,9 @@ class SitemapScraper:
                 
             except Exception as e:
                 logger.error(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
+                # The backed-off rate spaces out the retry's page load
+                self.rate.failure(url, reason=type(e).__name__)
                 if attempt < max_retries - 1:
-                    self.random_sleep(5.0, 10.0)  # Longer delay between retries
                     continue
                 else:
                     logger.error(f"All attempts failed for {url}")
@@ -456,140 +751,100 @@ class SitemapScraper:
                         'error': str(e)
                     }, []
 
-    def _extract_single_investor(self, cell):
-        # try:
-        #     investor = {
-        #         'name': '',
-        #         'company': '',
-        #         'role': '',
-        #         'profile_url': '',
-        #         'company_url': '',
-        #         'image_url': ''
-        #     }
-            
-        #     # Find the main div containing investor info
-        #     info_div = cell.find('div', class_='flex')
-        #     if not info_div:
-        #         return None  # Return None for invalid entries instead of empty data
-            
-        #     # Extract image URL
-        #     img_tag = info_div.find('img')
-        #     if img_tag and img_tag.get('src'):
-        #         investor['image_url'] = img_tag['src']
-            
-        #     # Find the div containing name and other details
-        #     details_div = info_div.find('div', recursive=False)  # Get immediate div child
-        #     if details_div:
-        #         # Extract name and profile URL
-        #         name_link = details_div.find('a', href=lambda x: x and '/investors/' in x)
-        #         if name_link:
-        #             investor['name'] = name_link.get_text(strip=True)
-        #             investor['profile_url'] = 'https://signal.nfx.com' + name_link['href']
-                
-        #         # Extract company name and URL
-        #         company_link = details_div.find('a', href=lambda x: x and '/firms/' in x)
-        #         if company_link:
-        #             investor['company'] = company_link.get_text(strip=True)
-        #             investor['company_url'] = 'https://signal.nfx.com' + company_link['href']
-                
-        #         # Extract role
-        #         role_elem = details_div.find(['span', 'div'], class_=lambda x: x and any(c in x for c in ['role', 'title', 'position']))
-        #         if role_elem:
-        #             investor['role'] = role_elem.get_text(strip=True)
-            
-        #     # Only return investor if we found at least name or company
-        #     return investor if investor['name'] or investor['company'] else None
-            
-        # except Exception as e:
-        #     logger.error(f"Error extracting investor data: {str(e)}")
-        #     return None
-        try:
-            investor = {
-                'name': '',
-                'company': '',
-                'role': '',
-                'profile_url': '',
-                'company_url': '',
-                'image_url': ''
-            }
-            
-            # Find the main div containing investor info
-            info_div = cell.find('div', class_='flex')
-            if not info_div:
-                return None  # Return None for invalid entries instead of empty data
-            
-            # Extract image URL
-            img_tag = info_div.find('img')
-            if img_tag and img_tag.get('src'):
-                investor['image_url'] = img_tag['src']
-            
-            # Extract name
-            name_tag = info_div.find('strong', class_='sn-investor-name null')
-            if name_tag:
-                investor['name'] = name_tag.get_text(strip=True)
-                investor['profile_url'] = name_tag.find_parent('a')['href']
-            
-            # Extract company
-            company_tag = info_div.find('a', href=True)
-            if company_tag:
-                investor['company'] = company_tag.get_text(strip=True)
-                investor['company_url'] = company_tag['href']
-            
-            # Extract role
-            role_tag = info_div.find('span', class_='sn-small-link hidden-xs null')
-            if role_tag:
-                investor['role'] = role_tag.get_text(strip=True)
-            
-            return investor
-        except Exception as e:
-            logger.error(f"Error extracting investor data: {str(e)}")
-            return None
-
-    def save_to_csv(self, raw_data_list, investors_list):
+    def save_to_csv(self, raw_data_list, investors_list) -> bool:
+        """Write raw page data and investors to the configured output sink; False if they could not be saved"""
         try:
-            # Define consistent filenames
-            raw_filename = os.path.join(self.data_dir, 'raw_data.csv')
-            investors_filename = os.path.join(self.data_dir, 'validinvestors.csv')
-
             # Write/append raw data
             if not raw_data_list:
-                return
-                
-            raw_df = pd.DataFrame(raw_data_list)
-            write_header = not os.path.exists(raw_filename)
-            raw_df.to_csv(raw_filename, mode='a', index=False, header=write_header)
-            logger.info(f'Appended {len(raw_df)} raw records to {raw_filename}')
+                return True
+            self.sink.write_raw(raw_data_list)
 
             # Write/append investors data
             if investors_list:
-                investors_df = pd.DataFrame(investors_list)
-                write_header = not os.path.exists(investors_filename)
-                investors_df.to_csv(investors_filename, mode='a', index=False, header=write_header)
-                logger.info(f'Appended {len(investors_df)} investor records to {investors_filename}')
+                self.sink.write_investors(investors_list)
 
+            # On disk before the caller records the page as done
+            self.sink.flush()
+            return True
         except Exception as e:
-            logger.error(f'Error saving data to CSV: {str(e)}')
+            logger.error(f'Error saving data to output sink: {str(e)}')
+            return False
 
-    def scrape_all(self, urls: List[str], limit: int = None):
-        scraped_urls = self.load_progress()
-        new_urls = [url for url in urls if url not in scraped_urls]
+    def scrape_all(self, urls: List[str], limit: int = None, skip_scraped: bool = True) -> List[str]:
+        """Scrape each URL (by default only those not yet in the progress log); returns the URLs that succeeded"""
+        # Lists with a pagination checkpoint failed part-way and are resumed, whatever the progress log says
+        new_urls = [url for url in urls
+                    if not (skip_scraped and self.progress.is_scraped(url)) or self.checkpoints.exists(url)]
+        succeeded = []
         
         for i, url in enumerate(new_urls):
             if limit and i >= limit:
                 break
             try:
-                raw_data, investors = self.scrape_page(url)
-                self.save_to_csv([raw_data], investors)
-                self.save_progress(url)
+                with self._stage('total', url):
+                    raw_data, investors = self.scrape_page(url)
+                with self._stage('write', url):
+                    if not self.save_to_csv([raw_data], investors):
+                        raise RuntimeError('Output could not be saved')
+                    if 'error' in raw_data:
+                        self.save_progress(url, 'failed', raw_data['error'])
+                    else:
+                        self.save_progress(url)
+                        self.checkpoints.clear(url)
+                if 'error' in raw_data:
+                    self.metrics.count('crawl_pages_total', kind='list', status='failed')
+                else:
+                    self.metrics.count('crawl_pages_total', kind='list', status='success')
+                    succeeded.append(url)
                 logger.info(f"Successfully processed: {url}")
             except Exception as e:
                 logger.error(f"Failed {url}: {str(e)}")
+        return succeeded
 
 def main():
-    sitemap_path = r'sitemap.xml\sitemap.xml'  # Raw string for Windows paths
-    scraper = SitemapScraper(sitemap_path)
+    parser = argparse.ArgumentParser(description='Scrape investor lists from the sitemap')
+    parser.add_argument('--sitemap', default=r'sitemap.xml\sitemap.xml', help='Path to the sitemap file')  # Raw string for Windows paths
+    parser.add_argument('--fetch', choices=['browser', 'http'], default='browser',
+                        help='Fetch pages with Chrome, or over HTTP with Chrome only as a fallback')
+    parser.add_argument('--output', choices=['csv', 'parquet', 'sqlite'], default='csv',
+                        help='Output format; sqlite also stores crawl progress')
+    parser.add_argument('--cache', action='store_true', help='Keep raw page HTML in output/cache for re-parsing')
+    parser.add_argument('--start-rate', type=float, default=0.2, help='Initial requests per second per host')
+    parser.add_argument('--max-rate', type=float, default=1.0, help='Ceiling on requests per second per host')
+    parser.add_argument('--headless', action='store_true', help='Run Chrome without a visible window')
+    parser.add_argument('--lean', action='store_true',
+                        help='Headless Chrome that skips images, fonts and media for more drivers per host')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL,
+                        help='Site root for login and session cookies, e.g. a local stand_in_site.py')
+    add_metrics_arguments(parser)
+    parser.add_argument('--checkpoint-every', type=int, default=5,
+                        help='Load More pages between saves of a list\'s investors and pagination position '
+                             '(kept in output/checkpoints); a retry fast-forwards to the last one')
+    add_queue_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging()
+    from http_fetcher import HttpFetcher
+    from output_sinks import make_sink
+    cache = PageCache(os.path.join(os.getcwd(), 'output', 'cache')) if args.cache else None
+    rate = RateController(start_rate=args.start_rate, max_rate=args.max_rate)
+    fetcher = HttpFetcher(cache=cache, rate=rate) if args.fetch == 'http' else None
+    sink = make_sink(args.output, os.path.join(os.getcwd(), 'output', 'data'))
+    progress = sink if args.output == 'sqlite' else None
+    scraper = SitemapScraper(args.sitemap, fetcher=fetcher, sink=sink, progress=progress, cache=cache, rate=rate,
+                             headless=args.headless, lean=args.lean, base_url=args.base_url,
+                             metrics=open_metrics(args), checkpoint_every=args.checkpoint_every)
     
     try:
+        if args.queue:
+            # Distributed mode: the shared queue decides which lists this machine scrapes
+            work_queue = open_queue(args.queue)
+            try:
+                run_worker(work_queue, lambda urls: scraper.scrape_all(urls, skip_scraped=False), 'lists',
+                           batch_size=args.queue_batch)
+            finally:
+                work_queue.close()
+            return
         urls = scraper.get_sitemap_urls()
         if urls:
             scraper.scrape_all(urls)
@@ -598,7 +853,7 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}")
     finally:
-        scraper.driver.quit()
+        scraper.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
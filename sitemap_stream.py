@@ -0,0 +1,140 @@
+import argparse
+import gzip
+import io
+import logging
+import os
+import sys
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+# Matched on the path alone, so sitemaps from a stand-in site (see stand_in_site.py) classify the same way
+def is_investor_profile(url: str) -> bool:
+    parsed = urlparse(url)
+    return '/investors/' in parsed.path and parsed.fragment != 'signin'
+
+
+def is_investor_list(url: str) -> bool:
+    return urlparse(url).path.startswith('/investor-lists')
+
+
+class SitemapStream:
+    def __init__(self, source: str, timeout: float = 30):
+        """
+        Streaming reader for sitemaps and sitemap indexes, plain or gzipped
+
+        Entries are parsed with iterparse and cleared as soon as they are read,
+        so memory stays flat however many <loc> entries the files contain.
+        Child sitemaps of an index are followed depth-first; a child is read from
+        the index's directory when a file of the same name exists there, and
+        downloaded otherwise.
+
+        Args:
+            source (str): Path or URL of a sitemap or sitemap index
+            timeout (float): Timeout for downloading remote sitemaps
+        """
+        self.source = source
+        self.timeout = timeout
+
+    def _open(self, location: str):
+        """Open a sitemap as a binary stream, transparently un-gzipping it"""
+        if urlparse(location).scheme in ('http', 'https'):
+            import requests
+            response = requests.get(location, stream=True, timeout=self.timeout)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # urllib3 closes an exhausted body by default, which BufferedReader then reports as a read of a closed file
+            response.raw.auto_close = False
+            stream = io.BufferedReader(response.raw)
+        else:
+            stream = open(location, 'rb')
+        if stream.peek(2)[:2] == GZIP_MAGIC:
+            return gzip.GzipFile(fileobj=stream)
+        return stream
+
+    def _resolve(self, loc: str, parent: str) -> str:
+        # Prefer a local copy of the child next to the index (how sitemap.xml/ is laid out)
+        if urlparse(parent).scheme not in ('http', 'https'):
+            candidate = os.path.join(os.path.dirname(parent), os.path.basename(urlparse(loc).path))
+            if os.path.exists(candidate):
+                return candidate
+        return loc
+
+    def entries(self, location: str = None, _seen=None):
+        """Yield (loc, lastmod) for every page URL, following sitemap indexes"""
+        location = location or self.source
+        seen = _seen if _seen is not None else set()
+        if location in seen:
+            return
+        seen.add(location)
+
+        children = []
+        stream = self._open(location)
+        try:
+            root = None
+            depth = 0
+            loc = lastmod = None
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    depth += 1
+                    continue
+                depth -= 1
+                name = _local_name(elem.tag)
+                # Only direct children of <url>/<sitemap>; extensions such as <image:loc> sit deeper
+                if depth == 2 and name == 'loc':
+                    loc = (elem.text or '').strip()
+                elif depth == 2 and name == 'lastmod':
+                    lastmod = (elem.text or '').strip() or None
+                elif depth == 1 and name in ('url', 'sitemap'):
+                    if loc:
+                        if name == 'sitemap':
+                            children.append(self._resolve(loc, location))
+                        else:
+                            yield loc, lastmod
+                    loc = lastmod = None
+                    # Drop finished entries so the tree never grows
+                    root.clear()
+        finally:
+            stream.close()
+
+        for child in children:
+            try:
+                yield from self.entries(child, seen)
+            # requests.RequestException is an OSError, so download failures land here too
+            except (OSError, ET.ParseError) as e:
+                logger.error(f"Error reading child sitemap {child}: {str(e)}")
+
+    def urls(self, predicate=None):
+        """Yield page URLs lazily, optionally filtered by predicate(url)"""
+        for loc, _ in self.entries():
+            if predicate is None or predicate(loc):
+                yield loc
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream URLs out of a sitemap or sitemap index')
+    parser.add_argument('source', help='Sitemap path or URL (.xml or .xml.gz)')
+    parser.add_argument('--kind', choices=['profiles', 'lists', 'all'], default='all')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    predicate = {'profiles': is_investor_profile, 'lists': is_investor_list, 'all': None}[args.kind]
+    count = 0
+    for url in SitemapStream(args.source).urls(predicate):
+        sys.stdout.write(url + '\n')
+        count += 1
+    logger.info(f"Streamed {count} URLs from {args.source}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS raw_pages (
+    url TEXT PRIMARY KEY,
+    raw_text TEXT,
+    scrape_timestamp TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS investors (
+    investor_key TEXT PRIMARY KEY,
+    name TEXT,
+    company TEXT,
+    role TEXT,
+    profile_url TEXT,
+    company_url TEXT,
+    image_url TEXT,
+    investment_range TEXT,
+    locations TEXT,
+    categories TEXT,
+    source_url TEXT,
+    scrape_timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_investors_name ON investors(name);
+CREATE INDEX IF NOT EXISTS idx_investors_company ON investors(company);
+CREATE INDEX IF NOT EXISTS idx_investors_profile_url ON investors(profile_url);
+CREATE TABLE IF NOT EXISTS investor_sectors (
+    investor_key TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    PRIMARY KEY (investor_key, sector)
+);
+CREATE INDEX IF NOT EXISTS idx_investor_sectors_sector ON investor_sectors(sector);
+CREATE TABLE IF NOT EXISTS profiles (
+    url TEXT PRIMARY KEY,
+    name TEXT,
+    current_company TEXT,
+    investment_range TEXT,
+    investments_on_record TEXT,
+    sweet_spot TEXT,
+    current_fund_size TEXT,
+    experience TEXT,
+    sector_rankings TEXT,
+    social_links TEXT,
+    network_memberships TEXT,
+    education TEXT,
+    image_urls TEXT,
+    image_url TEXT,
+    timestamp TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles(name);
+CREATE INDEX IF NOT EXISTS idx_profiles_company ON profiles(current_company);
+CREATE TABLE IF NOT EXISTS profile_sectors (
+    profile_url TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    PRIMARY KEY (profile_url, sector)
+);
+CREATE INDEX IF NOT EXISTS idx_profile_sectors_sector ON profile_sectors(sector);
+CREATE TABLE IF NOT EXISTS investments (
+    profile_url TEXT NOT NULL,
+    company TEXT,
+    stage TEXT,
+    date TEXT,
+    round_size TEXT,
+    total_raised TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_investments_profile_url ON investments(profile_url);
+CREATE INDEX IF NOT EXISTS idx_investments_company ON investments(company);
+CREATE TABLE IF NOT EXISTS crawl_status (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    error TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_status_status ON crawl_status(status);
+CREATE TABLE IF NOT EXISTS errors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT,
+    error TEXT,
+    timestamp TEXT
+);
+"""
+
+PROFILE_JSON_FIELDS = ['experience', 'sector_rankings', 'social_links', 'network_memberships', 'education', 'image_urls']
+PROFILE_TEXT_FIELDS = ['name', 'current_company', 'investment_range', 'investments_on_record', 'sweet_spot',
+                       'current_fund_size', 'image_url', 'timestamp', 'status']
+
+
+class SQLiteStore:
+    def __init__(self, db_path: str, batch_size: int = 50):
+        """
+        Embedded SQLite store for scraped entities and crawl state
+
+        Acts both as an output sink (write_raw / write_investors / write_profiles /
+        write_error) and as a progress tracker (mark / urls / is_scraped), so one
+        database replaces the separate CSV and progress files. Writes and progress
+        updates are grouped into transactions of batch_size rows; flush() and
+        close() commit whatever is pending.
+
+        Args:
+            db_path (str): Database file path
+            batch_size (int): Rows written per transaction
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, int(batch_size))
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._pending = 0
+        logger.info(f"Opened SQLite store at {db_path}")
+
+    def describe(self, dataset: str) -> str:
+        return f"{self.db_path} ({dataset})"
+
+    @staticmethod
+    def _timestamp():
+        return time.strftime('%Y-%m-%d %H:%M:%S')
+
+    def _commit(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def _written(self, count: int = 1):
+        # Called with the lock held; commits once batch_size rows are pending
+        self._pending += count
+        if self._pending >= self.batch_size:
+            self._commit()
+
+    # Output sink
+
+    def write_raw(self, rows):
+        if not rows:
+            return
+        with self.lock:
+            self.conn.executemany(
+                'INSERT INTO raw_pages (url, raw_text, scrape_timestamp, error) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET raw_text=excluded.raw_text, '
+                'scrape_timestamp=excluded.scrape_timestamp, error=excluded.error',
+                [(r.get('url'), r.get('raw_text'), r.get('scrape_timestamp'), r.get('error')) for r in rows]
+            )
+            self._written(len(rows))
+        logger.info(f'Upserted {len(rows)} raw records into {self.db_path}')
+
+    def write_investors(self, rows):
+        if not rows:
+            return
+        with self.lock:
+            for r in rows:
+                key = r.get('profile_url') or f"{r.get('name', '')}|{r.get('company', '')}|{r.get('role', '')}"
+                self.conn.execute(
+                    'INSERT INTO investors (investor_key, name, company, role, profile_url, company_url, image_url, '
+                    'investment_range, locations, categories, source_url, scrape_timestamp) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(investor_key) DO UPDATE SET name=excluded.name, company=excluded.company, '
+                    'role=excluded.role, profile_url=excluded.profile_url, company_url=excluded.company_url, '
+                    'image_url=excluded.image_url, investment_range=excluded.investment_range, '
+                    'locations=excluded.locations, categories=excluded.categories, '
+                    'source_url=excluded.source_url, scrape_timestamp=excluded.scrape_timestamp',
+                    (key, r.get('name'), r.get('company'), r.get('role'), r.get('profile_url'),
+                     r.get('company_url'), r.get('image_url'), r.get('investment_range'),
+                     json.dumps(r.get('locations', [])), json.dumps(r.get('categories', [])),
+                     r.get('source_url'), r.get('scrape_timestamp'))
+                )
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO investor_sectors (investor_key, sector) VALUES (?, ?)',
+                    [(key, sector) for sector in r.get('categories', [])]
+                )
+            self._written(len(rows))
+        logger.info(f'Upserted {len(rows)} investor records into {self.db_path}')
+
+    def write_profiles(self, rows, replace=True):
+        """Upsert profiles by URL (so replace is always in effect); returns (new, total) profile counts"""
+        if not rows:
+            return 0, 0
+        new_count = 0
+        columns = ['url'] + PROFILE_TEXT_FIELDS + PROFILE_JSON_FIELDS
+        updates = ', '.join(f'{c}=excluded.{c}' for c in columns[1:])
+        with self.lock:
+            for r in rows:
+                url = r.get('url')
+                if not self.conn.execute('SELECT 1 FROM profiles WHERE url = ?', (url,)).fetchone():
+                    new_count += 1
+                values = [url] + [r.get(c) for c in PROFILE_TEXT_FIELDS] + \
+                         [json.dumps(r.get(c)) for c in PROFILE_JSON_FIELDS]
+                self.conn.execute(
+                    f'INSERT INTO profiles ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))}) '
+                    f'ON CONFLICT(url) DO UPDATE SET {updates}',
+                    values
+                )
+                self.conn.execute('DELETE FROM investments WHERE profile_url = ?', (url,))
+                self.conn.executemany(
+                    'INSERT INTO investments (profile_url, company, stage, date, round_size, total_raised) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [(url, i.get('company'), i.get('stage'), i.get('date'), i.get('round_size'), i.get('total_raised'))
+                     for i in r.get('all_previous_investments', [])]
+                )
+                self.conn.execute('DELETE FROM profile_sectors WHERE profile_url = ?', (url,))
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO profile_sectors (profile_url, sector) VALUES (?, ?)',
+                    [(url, sector) for sector in r.get('sector_rankings', [])]
+                )
+            self._written(len(rows))
+            total = self.conn.execute('SELECT COUNT(*) FROM profiles').fetchone()[0]
+        return new_count, total
+
+    def write_error(self, url: str, error: str):
+        with self.lock:
+            self.conn.execute('INSERT INTO errors (url, error, timestamp) VALUES (?, ?, ?)',
+                              (url, error, self._timestamp()))
+            self._written()
+
+    # Progress tracking
+
+    def mark(self, url: str, status: str = 'success', error: str = None):
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO crawl_status (url, status, error, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET status=excluded.status, error=excluded.error, '
+                'updated_at=excluded.updated_at',
+                (url, status, error, self._timestamp())
+            )
+            self._written()
+
+    def status(self, url: str):
+        with self.lock:
+            row = self.conn.execute('SELECT status FROM crawl_status WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else None
+
+    def is_scraped(self, url: str) -> bool:
+        return self.status(url) is not None
+
+    def __contains__(self, url: str) -> bool:
+        return self.is_scraped(url)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM crawl_status').fetchone()[0]
+
+    def urls(self, status: str = None) -> set:
+        with self.lock:
+            if status is None:
+                rows = self.conn.execute('SELECT url FROM crawl_status')
+            else:
+                rows = self.conn.execute('SELECT url FROM crawl_status WHERE status = ?', (status,))
+            return {row[0] for row in rows}
+
+    def flush(self):
+        with self.lock:
+            self._commit()
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self._commit()
+                self.conn.close()
+                self.conn = None
@@ -0,0 +1,406 @@
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = 'stand_in_session'
+
+LIST_ROW = (
+    '<tr><td><div class="flex"><img src="/images/investor-{n}.jpg">'
+    '<div><a href="/investors/investor-{n}"><strong class="sn-investor-name null">Investor {n}</strong></a> '
+    '<span class="sn-small-link hidden-xs null">{role}</span> '
+    '<a href="/firms/firm-{firm}">Firm {firm}</a></div></div></td>'
+    '<td class="text-center pt2">$500K ($100K - $2M)</td>'
+    '<td style="max-width: 400px;"><a href="/locations/sf">San Francisco</a><a href="/locations/ny">New York</a></td>'
+    '<td style="max-width: 400px;"><a href="/sectors/saas">SaaS</a><a href="/sectors/fintech">Fintech</a></td></tr>'
+)
+
+ROLES = ('Partner', 'Principal', 'Associate', 'Managing Partner')
+
+# Appends the next batch of rows the way the real list pages do, through fetch()
+LOAD_MORE_SCRIPT = """
+<script>
+document.getElementById('load-more').addEventListener('click', function () {
+    var button = this, table = document.querySelector('table');
+    button.disabled = true;
+    fetch(location.pathname + '/rows?offset=' + table.querySelectorAll('tr').length)
+        .then(function (r) { return r.json(); })
+        .then(function (data) {
+            table.querySelector('tbody').insertAdjacentHTML('beforeend', data.rows);
+            if (data.done) { button.remove(); } else { button.disabled = false; }
+        });
+});
+</script>
+"""
+
+SEE_ALL_SCRIPT = """
+<script>
+(function () {
+    var button = Array.prototype.find.call(document.querySelectorAll('button'), function (b) {
+        return b.textContent.indexOf('investments on record') !== -1;
+    });
+    if (!button) { return; }
+    button.addEventListener('click', function () {
+        fetch('/investors/load_more_investments', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({investor_id: %d})
+        }).then(function (r) { return r.json(); }).then(function (data) {
+            document.querySelector('tbody.past-investments-table-body').insertAdjacentHTML('beforeend', data.html);
+            button.remove();
+        });
+    });
+})();
+</script>
+"""
+
+LOGIN_PAGE = """<html><head><title>Signal</title></head><body>
+<h1>LOGIN</h1><p>Please sign up or log in to continue.</p><button>Continue With Google</button>
+<script>
+setTimeout(function () {
+    document.cookie = '%s=1; path=/';
+    location.href = '/investors';
+}, %d);
+</script>
+</body></html>"""
+
+INVESTMENT_ROW = (
+    '<tr><td class="with-coinvestors"><div class="round-padding">{company}</div></td>'
+    '<td class="with-coinvestors"><div class="round-padding">{stage}<i class="white-dot-separator"></i>{date}'
+    '<i class="white-dot-separator"></i>{round_size}</div></td>'
+    '<td class="with-coinvestors"><div class="round-padding">{total_raised}</div></td></tr>'
+)
+
+MINIMAL_PROFILE = """<div id="vc-profile" class="container"><div class="relative identity-block">
+<h1 class="f3 f1-ns mv1">Investor<span class="white-50 ml2 f4">(0)</span></h1></div>
+<table><tbody class="past-investments-table-body"></tbody></table>
+<div class="sn-margin-top-10"><button type="button">See all 0 investments on record</button></div></div>"""
+
+H1_NAME = re.compile(r'(<h1[^>]*>)[^<]*(<span[^>]*>)\(\d+\)(</span>)')
+SEE_ALL_BUTTON = re.compile(r'<button[^>]*>\s*See all \d+ investments on record\s*</button>')
+
+
+class StandInSite:
+    def __init__(self, base_url: str, lists: int = 20, profiles: int = 500, rows_per_list: int = 120,
+                 page_size: int = 40, profile_template: str = 'profile.html', expandable: float = 0.2,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, login_rate: float = 0.0,
+                 require_login: bool = False, gzip_sitemaps: bool = False, seed: int = 0):
+        """
+        Synthetic stand-in for signal.nfx.com, for reproducible end-to-end load tests
+
+        Serves a sitemap index, paginated investor lists with a working "Load More
+        Investors" button, profile pages built from profile.html, the "See all"
+        investments endpoint and a /login page that signs the browser in by itself.
+        Latency, 503 errors and login redirects are injected at the given rates.
+
+        Args:
+            base_url (str): Public URL of the server, used in sitemap <loc>s
+            lists (int): Investor lists in the sitemap
+            profiles (int): Investor profiles in the sitemap
+            rows_per_list (int): Investors on each list
+            page_size (int): Rows served per list page and per Load More click
+            profile_template (str): Profile page fragment to serve (a minimal page if missing)
+            expandable (float): Fraction of profiles with a "See all investments" button
+            latency (float): Seconds added to every response
+            jitter (float): Random extra seconds, up to this much
+            error_rate (float): Fraction of page requests answered with 503
+            login_rate (float): Fraction of page requests redirected to /login regardless of the session
+            require_login (bool): Redirect requests without the session cookie to /login
+            gzip_sitemaps (bool): Serve the child sitemaps as .xml.gz
+            seed (int): Seed for the injected latency, errors and redirects
+        """
+        self.base_url = base_url.rstrip('/')
+        self.lists = lists
+        self.profiles = profiles
+        self.rows_per_list = rows_per_list
+        self.page_size = max(1, page_size)
+        self.expandable = expandable
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.login_rate = login_rate
+        self.require_login = require_login
+        self.gzip_sitemaps = gzip_sitemaps
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.started = time.time()
+        if profile_template and os.path.exists(profile_template):
+            with open(profile_template, 'r', encoding='utf-8') as f:
+                self.profile_template = f.read()
+        else:
+            logger.warning(f'Profile template {profile_template} not found; serving a minimal profile page')
+            self.profile_template = MINIMAL_PROFILE
+
+    def _chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def count(self, kind: str, status: int):
+        with self.lock:
+            key = f'{kind} {status}'
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def summary(self) -> dict:
+        with self.lock:
+            elapsed = max(time.time() - self.started, 1e-9)
+            pages = sum(n for key, n in self.stats.items() if key.split()[0] in ('list', 'profile')
+                        and key.split()[1] in ('200', '304'))
+            return {'elapsed_seconds': round(elapsed, 1), 'pages_served': pages,
+                    'pages_per_minute': round(pages * 60 / elapsed, 1), 'responses': dict(self.stats)}
+
+    def delay(self):
+        pause = self.latency
+        if self.jitter > 0:
+            with self.lock:
+                pause += self.random.uniform(0, self.jitter)
+        if pause > 0:
+            time.sleep(pause)
+
+    def should_fail(self) -> bool:
+        return self._chance(self.error_rate)
+
+    def should_redirect(self, cookies: str) -> bool:
+        if self.require_login and f'{SESSION_COOKIE}=' not in (cookies or ''):
+            return True
+        return self._chance(self.login_rate)
+
+    # Sitemaps
+
+    def _sitemap_name(self, kind: str) -> str:
+        return f'sitemap-{kind}.xml' + ('.gz' if self.gzip_sitemaps else '')
+
+    def sitemap_index(self) -> str:
+        children = ''.join(f'<sitemap><loc>{self.base_url}/{self._sitemap_name(kind)}</loc></sitemap>'
+                           for kind in ('lists', 'profiles'))
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{children}</sitemapindex>')
+
+    def sitemap(self, kind: str) -> str:
+        if kind == 'lists':
+            locs = (f'{self.base_url}/investor-lists/list-{i}' for i in range(self.lists))
+        else:
+            locs = (f'{self.base_url}/investors/investor-{n}' for n in range(self.profiles))
+        entries = ''.join(f'<url><loc>{loc}</loc><lastmod>2024-01-01</lastmod></url>' for loc in locs)
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>')
+
+    # Investor lists
+
+    def list_rows(self, list_id: int, offset: int) -> str:
+        end = min(offset + self.page_size, self.rows_per_list)
+        rows = []
+        for k in range(offset, end):
+            n = (list_id * self.rows_per_list + k) % max(1, self.profiles)
+            rows.append(LIST_ROW.format(n=n, role=ROLES[n % len(ROLES)], firm=n % 97))
+        return ''.join(rows)
+
+    def list_page(self, list_id: int) -> str:
+        rows = self.list_rows(list_id, 0)
+        button = ''
+        if self.rows_per_list > self.page_size:
+            button = f'<button id="load-more" type="button">Load More Investors</button>{LOAD_MORE_SCRIPT}'
+        return (f'<html><head><title>Investor list {list_id}</title></head><body>'
+                f'<h1>INVESTORS</h1><table><tbody>{rows}</tbody></table>{button}</body></html>')
+
+    def list_more(self, list_id: int, offset: int) -> str:
+        return json.dumps({'rows': self.list_rows(list_id, offset),
+                           'done': offset + self.page_size >= self.rows_per_list})
+
+    # Profiles
+
+    def is_expandable(self, n: int) -> bool:
+        return int(hashlib.md5(str(n).encode()).hexdigest(), 16) % 1000 < self.expandable * 1000
+
+    def investments(self, n: int):
+        return [{'company': f'Company {n}-{k}', 'stage': ('Seed', 'Series A', 'Series B')[k % 3],
+                 'date': f'Jan {2015 + k % 10}', 'round_size': f'${k + 1}M', 'total_raised': f'${(k + 1) * 5}M'}
+                for k in range(8 + n % 15)]
+
+    def profile_page(self, n: int) -> str:
+        body = H1_NAME.sub(lambda m: f'{m.group(1)}Investor {n}{m.group(2)}({n}){m.group(3)}',
+                           self.profile_template, count=1)
+        script = ''
+        if self.is_expandable(n):
+            body = SEE_ALL_BUTTON.sub(
+                f'<button type="button" class="sn-light-greyblue-accent-button btn">'
+                f'See all {len(self.investments(n))} investments on record</button>', body, count=1)
+            script = SEE_ALL_SCRIPT % n
+        else:
+            body = SEE_ALL_BUTTON.sub('', body)
+        return (f'<html><head><title>Investor {n}</title></head>'
+                f'<body data-investor-id="{n}">{body}{script}</body></html>')
+
+    def more_investments(self, n: int) -> str:
+        investments = self.investments(n)
+        rows = ''.join(INVESTMENT_ROW.format(**{k: html.escape(v) for k, v in inv.items()}) for inv in investments)
+        return json.dumps({'investor_id': n, 'investments': investments, 'html': rows})
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    site: StandInSite = None
+
+    def log_message(self, format, *args):
+        logger.debug(f'{self.address_string()} {format % args}')
+
+    def _send(self, kind: str, status: int, body: bytes = b'', content_type: str = 'text/html; charset=utf-8',
+              headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+        self.site.count(kind, status)
+
+    def _send_page(self, kind: str, text: str, content_type: str = 'text/html; charset=utf-8'):
+        body = text.encode('utf-8')
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self._send(kind, 304, headers={'ETag': etag})
+        else:
+            self._send(kind, 200, body, content_type, headers={'ETag': etag})
+
+    def _redirect(self, kind: str, location: str):
+        self._send(kind, 302, headers={'Location': location})
+
+    def _page_guard(self, kind: str) -> bool:
+        """Inject latency, errors and login redirects; True when the request was already answered"""
+        site = self.site
+        site.delay()
+        if site.should_fail():
+            self._send(kind, 503, b'Service Unavailable', 'text/plain', headers={'Retry-After': '1'})
+            return True
+        if site.should_redirect(self.headers.get('Cookie')):
+            self._redirect(kind, '/login')
+            return True
+        return False
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        site = self.site
+        url = urlparse(self.path)
+        path = url.path.rstrip('/') or '/'
+
+        if path == '/sitemap.xml':
+            return self._send_page('sitemap', site.sitemap_index(), 'application/xml')
+        match = re.fullmatch(r'/sitemap-(lists|profiles)\.xml(\.gz)?', path)
+        if match:
+            xml = site.sitemap(match.group(1)).encode('utf-8')
+            body = gzip.compress(xml) if match.group(2) else xml
+            return self._send('sitemap', 200, body, 'application/gzip' if match.group(2) else 'application/xml')
+        if path == '/login':
+            return self._send('login', 200, (LOGIN_PAGE % (SESSION_COOKIE, 500)).encode('utf-8'))
+        if path == '/investors':
+            return self._send('index', 200, b'<html><body><h1>Investors</h1></body></html>')
+        if path == '/_stats':
+            return self._send('stats', 200, json.dumps(site.summary()).encode('utf-8'), 'application/json')
+
+        match = re.fullmatch(r'/investor-lists/list-(\d+)(/rows)?', path)
+        if match and int(match.group(1)) < site.lists:
+            list_id = int(match.group(1))
+            if match.group(2):
+                site.delay()
+                offset = int(parse_qs(url.query).get('offset', ['0'])[0])
+                return self._send('rows', 200, site.list_more(list_id, offset).encode('utf-8'), 'application/json')
+            if not self._page_guard('list'):
+                self._send_page('list', site.list_page(list_id))
+            return
+        match = re.fullmatch(r'/investors/investor-(\d+)', path)
+        if match and int(match.group(1)) < site.profiles:
+            if not self._page_guard('profile'):
+                self._send_page('profile', site.profile_page(int(match.group(1))))
+            return
+        if path.startswith('/images/'):
+            return self._send('asset', 200, b'', 'image/jpeg')
+        self._send('other', 404, b'Not Found', 'text/plain')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = self.rfile.read(length) if length else b''
+        if urlparse(self.path).path != '/investors/load_more_investments':
+            return self._send('other', 404, b'Not Found', 'text/plain')
+        self.site.delay()
+        try:
+            investor_id = int(json.loads(payload or b'{}').get('investor_id'))
+        except (TypeError, ValueError):
+            return self._send('investments', 400, b'{"error": "investor_id required"}', 'application/json')
+        self._send('investments', 200, self.site.more_investments(investor_id).encode('utf-8'), 'application/json')
+
+
+def serve(site: StandInSite, host: str = '127.0.0.1', port: int = 8000) -> ThreadingHTTPServer:
+    """Start the stand-in site on a background thread; call shutdown() on the result to stop it"""
+    handler = type('BoundStandInHandler', (StandInHandler,), {'site': site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve a local stand-in of signal.nfx.com for load testing',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            'Serves a sitemap index, investor lists with a working Load More button,\n'
+            'profiles built from --profile-template, the See-all investments endpoint\n'
+            'and a self-completing /login. Point the crawlers at it with\n'
+            '  --sitemap http://127.0.0.1:8000/sitemap.xml --base-url http://127.0.0.1:8000\n'
+            'and read served pages/minute from /_stats.'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--lists', type=int, default=20, help='Investor lists in the sitemap')
+    parser.add_argument('--profiles', type=int, default=500, help='Investor profiles in the sitemap')
+    parser.add_argument('--rows-per-list', type=int, default=120, help='Investors on each list')
+    parser.add_argument('--page-size', type=int, default=40, help='Rows per list page and per Load More click')
+    parser.add_argument('--profile-template', default='profile.html', help='Profile page fragment to serve')
+    parser.add_argument('--expandable', type=float, default=0.2,
+                        help='Fraction of profiles with a "See all investments" button')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of page requests answered with 503')
+    parser.add_argument('--login-rate', type=float, default=0.0,
+                        help='Fraction of page requests redirected to /login')
+    parser.add_argument('--require-login', action='store_true',
+                        help='Redirect requests without the session cookie to /login')
+    parser.add_argument('--gzip-sitemaps', action='store_true', help='Serve the child sitemaps gzipped')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    site = StandInSite(f'http://{args.host}:{args.port}', lists=args.lists, profiles=args.profiles,
+                       rows_per_list=args.rows_per_list, page_size=args.page_size,
+                       profile_template=args.profile_template, expandable=args.expandable, latency=args.latency,
+                       jitter=args.jitter, error_rate=args.error_rate, login_rate=args.login_rate,
+                       require_login=args.require_login, gzip_sitemaps=args.gzip_sitemaps, seed=args.seed)
+    server = serve(site, args.host, args.port)
+    logger.info(f'Stand-in site on {site.base_url} (sitemap: {site.base_url}/sitemap.xml, stats: {site.base_url}/_stats)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        logger.info(f'Served: {json.dumps(site.summary())}')
+
+
+if __name__ == '__main__':
+    main()
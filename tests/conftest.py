@@ -0,0 +1,31 @@
+import os
+import sys
+
+# The scrapers are flat top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+PROFILE_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profile.html')
+
+
+@pytest.fixture
+def stand_in():
+    """Start stand-in sites on free local ports; stand_in(**options) returns a running StandInSite"""
+    from stand_in_site import StandInSite, serve
+
+    servers = []
+
+    def start(**options):
+        options.setdefault('profile_template', PROFILE_HTML)
+        options.setdefault('expandable', 0)
+        site = StandInSite('http://127.0.0.1', **options)
+        server = serve(site, port=0)
+        site.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        servers.append(server)
+        return site
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
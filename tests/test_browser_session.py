@@ -0,0 +1,69 @@
+import time
+
+from browser_session import BrowserSession
+
+
+class MarkerDriver:
+    """Answers the login-marker script; fails the test if the page source is pulled"""
+
+    def __init__(self, url, has_marker):
+        self.current_url = url
+        self.has_marker = has_marker
+        self.scripts = 0
+
+    @property
+    def page_source(self):
+        raise AssertionError('login_required must not serialize the page')
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return self.has_marker
+
+
+def test_login_required_checks_url_before_the_page():
+    driver = MarkerDriver('https://signal.nfx.com/login', has_marker=False)
+    assert BrowserSession.login_required(driver)
+    assert driver.scripts == 0
+
+
+def test_login_required_detects_markers_without_page_source():
+    assert BrowserSession.login_required(MarkerDriver('https://signal.nfx.com/investors/a', has_marker=True))
+    assert not BrowserSession.login_required(MarkerDriver('https://signal.nfx.com/investors/a', has_marker=False))
+
+
+class CookieDriver:
+    def __init__(self):
+        self.gets = 0
+        self.cookies = []
+
+    def get(self, url):
+        self.gets += 1
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+
+def test_short_lived_analytics_cookies_do_not_end_the_session():
+    now = time.time()
+    cookies = [
+        {'name': 'SIGNAL_ACCESS_JWT', 'value': 'a', 'expiry': int(now + 86400)},
+        {'name': 'SIGNAL_ID_JWT', 'value': 'i', 'expiry': int(now + 86400)},
+        {'name': '_gat', 'value': '1', 'expiry': int(now + 30)},
+        {'name': '_gat_rollup', 'value': '1', 'expiry': int(now + 30)},
+        {'name': '_cfuvid', 'value': 'c', 'expiry': None},
+    ]
+    session = BrowserSession(lambda: cookies, expiry_margin=300)
+    driver = CookieDriver()
+    for _ in range(5):
+        assert session.ensure(driver)
+    assert driver.gets == 1
+    assert len(driver.cookies) == len(cookies)
+
+
+def test_session_refreshes_near_auth_cookie_expiry():
+    cookies = [{'name': 'SIGNAL_ACCESS_JWT', 'value': 'a', 'expiry': int(time.time() + 60)}]
+    session = BrowserSession(lambda: cookies, expiry_margin=300)
+    driver = CookieDriver()
+    session.ensure(driver)
+    session.ensure(driver)
+    assert driver.gets == 2
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from crawl_engine import AsyncCrawler
+from recrawl import NotModified
+
+
+def test_fetches_overlap_and_results_are_written_on_one_thread():
+    in_flight, peak, writers, results = [0], [0], set(), {}
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return f'<html>{url}</html>'
+
+    def on_result(url, result):
+        writers.add(threading.get_ident())
+        results[url] = result
+
+    urls = [f'https://example.com/investors/{n}' for n in range(16)]
+    crawler = AsyncCrawler(fetch, lambda url, html: html.upper(), on_result, concurrency=8)
+    started = time.monotonic()
+    stats = crawler.run(iter(urls))
+    assert stats['succeeded'] == 16
+    assert peak[0] > 1
+    # 16 fetches of 50 ms with 8 in flight, so well under the sequential 0.8 s
+    assert time.monotonic() - started < 0.6
+    assert len(writers) == 1
+    assert results[urls[0]] == f'<html>{urls[0]}</html>'.upper()
+
+
+def test_deferred_unchanged_and_failed_pages():
+    def fetch(url):
+        if url.endswith('same'):
+            raise NotModified(url)
+        if url.endswith('down'):
+            return None
+        return '<html></html>'
+
+    errors = []
+    crawler = AsyncCrawler(fetch, lambda url, html: None if url.endswith('js') else {'url': url},
+                           lambda url, result: None, on_error=lambda url, error: errors.append(url), concurrency=2)
+    stats = crawler.run(['https://example.com/ok', 'https://example.com/js', 'https://example.com/same',
+                         'https://example.com/down'])
+    assert (stats['succeeded'], stats['deferred'], stats['unchanged'], stats['failed']) == (1, 1, 1, 1)
+    assert crawler.deferred == ['https://example.com/js']
+    assert errors == ['https://example.com/down']
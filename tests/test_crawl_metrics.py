@@ -0,0 +1,51 @@
+import pytest
+import requests
+
+from crawl_metrics import StageMetrics, summarize
+
+
+def test_timings_are_journalled_and_summarized(tmp_path):
+    path = tmp_path / 'metrics' / 'metrics.jsonl'
+    metrics = StageMetrics(jsonl_path=str(path))
+    for n in range(1, 21):
+        metrics.observe('navigate', n / 10, kind='profile', url=f'https://signal.nfx.com/investors/{n}')
+    with pytest.raises(ValueError):
+        with metrics.stage('parse', kind='list'):
+            raise ValueError('bad page')
+    metrics.close()
+    # A line cut short by a crash is skipped
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"ts": 1, "kind": "prof')
+
+    summary = summarize(str(path))
+    assert summary['list/parse']['count'] == 1
+    navigate = summary['profile/navigate']
+    assert navigate['count'] == 20
+    assert navigate['total_seconds'] == 21.0
+    assert navigate['p50_seconds'] == 1.0
+    assert navigate['p95_seconds'] == 2.0
+
+
+def test_prometheus_exposition():
+    metrics = StageMetrics()
+    metrics.observe('navigate', 0.3, kind='profile')
+    metrics.observe('navigate', 45, kind='profile')
+    metrics.count('crawl_pages_total', kind='profile', outcome='ok')
+    metrics.count('crawl_pages_total', kind='profile', outcome='ok')
+    text = metrics.render_prometheus()
+    assert 'crawl_stage_seconds_bucket{kind="profile",stage="navigate",le="0.5"} 1' in text
+    assert 'crawl_stage_seconds_bucket{kind="profile",stage="navigate",le="30.0"} 1' in text
+    assert 'crawl_stage_seconds_bucket{kind="profile",stage="navigate",le="+Inf"} 2' in text
+    assert 'crawl_stage_seconds_count{kind="profile",stage="navigate"} 2' in text
+    assert '# TYPE crawl_pages_total counter' in text
+    assert 'crawl_pages_total{kind="profile",outcome="ok"} 2' in text
+
+    metrics.serve(0)
+    port = metrics._server.server_address[1]
+    try:
+        response = requests.get(f'http://127.0.0.1:{port}/metrics', timeout=5)
+        assert response.status_code == 200
+        assert response.text == metrics.render_prometheus()
+    finally:
+        metrics.close()
+    assert metrics._server is None
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from fast_profile_parser import FastProfileParser
+from profile_scraper import ProfileParser
+
+PROFILE_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profile.html')
+
+
+def read_profile():
+    with open(PROFILE_HTML, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def without(html, *selectors):
+    """profile.html with whole sections removed, as on sparse real profiles"""
+    soup = BeautifulSoup(html, 'lxml')
+    for selector in selectors:
+        for el in soup.select(selector):
+            el.decompose()
+    return str(soup)
+
+
+def assert_parity(html):
+    soup = BeautifulSoup(html, 'lxml')
+    fast = FastProfileParser()
+    root = fast.parse(html)
+    assert fast.extract_profile_data(root) == ProfileParser().extract_profile_data(soup)
+    assert fast.needs_browser(root) == ProfileParser().needs_browser(soup)
+
+
+def test_parity_on_profile_fixture():
+    html = read_profile()
+    assert ProfileParser().extract_profile_data(BeautifulSoup(html, 'lxml'))['all_previous_investments']
+    assert_parity(html)
+
+
+@pytest.mark.parametrize('selectors', [
+    ('.identity-block h1',),
+    ('.sn-linkset', '.mt2'),
+    ('tbody.past-investments-table-body',),
+    ('.line-separated-row', 'div.sn-margin-top-30.relative'),
+    ('.carousel-container-inner', 'img'),
+    ('button',),
+])
+def test_parity_with_missing_sections(selectors):
+    assert_parity(without(read_profile(), *selectors))
+
+
+def test_parity_on_empty_page():
+    assert_parity('<html><head><title>Investor</title></head><body><p>Nothing here</p></body></html>')
@@ -0,0 +1,29 @@
+from http_fetcher import HttpFetcher
+from rate_control import RateController
+from stand_in_site import SESSION_COOKIE
+
+
+def test_fetches_pages_over_pooled_http(stand_in):
+    site = stand_in(profiles=5)
+    fetcher = HttpFetcher(pool_size=2)
+    try:
+        html = fetcher.fetch(f'{site.base_url}/investors/investor-3')
+        assert 'Investor 3' in html
+        assert fetcher.fetch(f'{site.base_url}/investors/investor-99') is None
+    finally:
+        fetcher.close()
+
+
+def test_login_wall_needs_the_saved_session_cookie(stand_in):
+    site = stand_in(profiles=5, require_login=True)
+    url = f'{site.base_url}/investors/investor-1'
+    rate = RateController(start_rate=50, max_rate=50, min_rate=5)
+    fetcher = HttpFetcher(rate=rate)
+    try:
+        assert fetcher.fetch(url) is None
+        # A login redirect drops the host straight to the slowest pace
+        assert rate.rate(url) == 5
+        fetcher.set_cookies([{'name': SESSION_COOKIE, 'value': '1'}])
+        assert 'Investor 1' in fetcher.fetch(url)
+    finally:
+        fetcher.close()
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after(statement):
+    # A fresh interpreter, since other tests load selenium into this one
+    script = f"import sys\n{statement}\nprint(sorted({{m.split('.')[0] for m in sys.modules}}))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=REPO, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def test_parsers_do_not_import_selenium():
+    loaded = loaded_after('import fast_profile_parser, page_cache')
+    assert "'selenium'" not in loaded
+
+
+def test_reparse_and_crawl_engine_do_not_import_the_browser_stack():
+    loaded = loaded_after('import page_cache, profile_scraper, scraper, crawl_engine\n'
+                          'page_cache._get_parser("profile"); page_cache._get_parser("list")')
+    assert "'selenium'" not in loaded
+    assert "'undetected_chromedriver'" not in loaded
@@ -0,0 +1,35 @@
+import os
+
+from list_checkpoint import ListCheckpoints
+
+URL = 'https://example.com/list/seed-investors'
+
+
+def test_save_appends_only_new_keys(tmp_path):
+    checkpoints = ListCheckpoints(str(tmp_path))
+    checkpoints.save(URL, 5, 100, [('Ann', 'Acme', 'Partner')])
+    keys_file = checkpoints._path(URL, '.keys')
+    size = os.path.getsize(keys_file)
+    checkpoints.save(URL, 10, 200, [('Bob', 'Beta', 'Principal')])
+    with open(keys_file, encoding='utf-8') as f:
+        lines = f.readlines()
+    # The second checkpoint only adds its own key instead of rewriting the first
+    assert len(lines) == 2
+    assert os.path.getsize(keys_file) < 2 * size + 10
+
+    state = checkpoints.load(URL)
+    assert state['page'] == 10 and state['row_offset'] == 200
+    assert state['keys'] == {('Ann', 'Acme', 'Partner'), ('Bob', 'Beta', 'Principal')}
+
+
+def test_torn_key_line_and_clear(tmp_path):
+    checkpoints = ListCheckpoints(str(tmp_path))
+    checkpoints.save(URL, 5, 100, [('Ann', 'Acme', 'Partner')])
+    with open(checkpoints._path(URL, '.keys'), 'a', encoding='utf-8') as f:
+        f.write('["Bob", "Be')
+    assert checkpoints.load(URL)['keys'] == {('Ann', 'Acme', 'Partner')}
+
+    checkpoints.clear(URL)
+    assert not checkpoints.exists(URL)
+    assert not os.path.exists(checkpoints._path(URL, '.keys'))
+    assert checkpoints.load(URL) is None
@@ -0,0 +1,115 @@
+import os
+
+import pandas as pd
+
+from output_sinks import CsvSink, ParquetSink, ProfileCsvWriter, compact_dataset, read_dataset
+
+
+def profile(n, status='success'):
+    return {
+        'name': f'Investor {n}', 'current_company': f'Firm {n}', 'investment_range': '$1M - $5M',
+        'experience': [{'role': 'Partner', 'company': f'Firm {n}', 'duration': '2019 - Present'}],
+        'sector_rankings': ['Fintech', 'SaaS'],
+        'social_links': {'linkedin': f'https://linkedin.com/in/{n}', 'twitter': None, 'angellist': None,
+                         'crunchbase': None, 'website': None},
+        'all_previous_investments': [{'company': 'Acme', 'stage': 'Seed', 'date': 'Jan 2020',
+                                      'round_size': '$2M', 'total_raised': '$2M'}],
+        'url': f'https://signal.nfx.com/investors/investor-{n}', 'status': status,
+    }
+
+
+def parts(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.parquet'))
+
+
+def test_parquet_round_trip_keeps_nested_fields(tmp_path):
+    sink = ParquetSink(str(tmp_path))
+    sink.write_profiles([profile(1), profile(2)])
+    sink.close()
+    data = read_dataset(sink.dataset_dir('profiles'))
+    assert list(data['url']) == [profile(1)['url'], profile(2)['url']]
+    assert list(data['sector_rankings'][0]) == ['Fintech', 'SaaS']
+    assert data['experience'][0][0]['role'] == 'Partner'
+    assert data['social_links'][1]['linkedin'] == 'https://linkedin.com/in/2'
+
+
+def test_parquet_flush_per_batch_does_not_write_a_part_each_time(tmp_path):
+    sink = ParquetSink(str(tmp_path), row_group_size=10, part_rows=20)
+    for n in range(47):
+        sink.write_profiles([profile(n)])
+        sink.flush()
+    sink.close()
+    directory = sink.dataset_dir('profiles')
+    assert len(parts(directory)) == 3
+    assert not [name for name in os.listdir(directory) if name.startswith('.')]
+    assert len(read_dataset(directory)) == 47
+
+
+def test_parquet_flushed_rows_survive_a_crash_and_compact(tmp_path):
+    sink = ParquetSink(str(tmp_path))
+    sink.write_profiles([profile(1), profile(2)])
+    sink.flush()
+    sink.write_profiles([profile(3)])  # Never flushed, so lost with the process
+    directory = sink.dataset_dir('profiles')
+    assert parts(directory) == []
+    assert set(read_dataset(directory, columns=['url'])['url']) == {profile(1)['url'], profile(2)['url']}
+
+    # A later run knows the flushed profiles and refreshes one of them
+    rerun = ParquetSink(str(tmp_path))
+    assert rerun.write_profiles([profile(2, status='refreshed'), profile(3)]) == (1, 3)
+    assert rerun.write_profiles([profile(2, status='refreshed')], replace=True) == (1, 3)
+    rerun.close()
+
+    compact_dataset(directory)
+    assert len(parts(directory)) == 1
+    assert not [name for name in os.listdir(directory) if name.startswith('.')]
+    data = read_dataset(directory).set_index('url')
+    assert len(data) == 3
+    assert data.loc[profile(2)['url'], 'status'] == 'refreshed'
+
+
+def test_csv_profiles_are_appended_and_compacted(tmp_path):
+    sink = CsvSink(str(tmp_path))
+    assert sink.write_profiles([profile(1), profile(2)]) == (2, 2)
+    assert sink.write_profiles([profile(2)]) == (0, 2)
+    assert sink.write_profiles([profile(2, status='refreshed')], replace=True) == (1, 2)
+    path = sink.profiles.output_file
+    assert len(pd.read_csv(path)) == 3
+    ProfileCsvWriter(path).compact()
+    data = pd.read_csv(path)
+    assert len(data) == 2
+    assert data.set_index('url').loc[profile(2)['url'], 'status'] == 'refreshed'
+
+
+def test_csv_writer_appends_after_an_unterminated_row_and_widens_the_header(tmp_path):
+    path = tmp_path / 'investor_profiles.csv'
+    path.write_text('name,url\nInvestor 1,https://signal.nfx.com/investors/investor-1')
+    writer = ProfileCsvWriter(str(path))
+    assert writer.write([{'name': 'Investor 2', 'url': profile(2)['url']}]) == (1, 2)
+    # A profile with a new field rewrites the file once with the wider header
+    assert writer.write([dict(profile(3), extra='x')]) == (1, 3)
+    data = pd.read_csv(path)
+    assert list(data['name']) == ['Investor 1', 'Investor 2', 'Investor 3']
+    assert 'extra' in data.columns
+
+
+def test_profiles_are_saved_in_batches_before_progress_is_recorded(tmp_path):
+    from http_fetcher import HttpFetcher
+    from profile_scraper import ProfileScraper
+
+    saved = []
+    # With a fetcher no browser is started up front
+    scraper = ProfileScraper(str(tmp_path), fetcher=HttpFetcher(), batch_size=2, on_saved=saved.append)
+    try:
+        scraper.add_profile(profile(1)['url'], profile(1))
+        assert not scraper.progress.is_scraped(profile(1)['url'])
+        assert not os.path.exists(scraper.sink.profiles.output_file)
+        scraper.add_profile(profile(2)['url'], profile(2))
+        assert scraper.progress.urls('success') == {profile(1)['url'], profile(2)['url']}
+        scraper.add_profile(profile(3)['url'], profile(3))
+        assert scraper.save_profiles() == [profile(3)['url']]
+    finally:
+        scraper.sink.close()
+        scraper.progress.close()
+    assert saved == [[profile(1)['url'], profile(2)['url']], [profile(3)['url']]]
+    assert len(pd.read_csv(scraper.sink.profiles.output_file)) == 3
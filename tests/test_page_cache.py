@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+
+from output_sinks import CsvSink
+from page_cache import PageCache, parse_pages, reparse
+from stand_in_site import StandInSite
+
+BASE_URL = 'http://127.0.0.1:8000'
+PROFILE_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profile.html')
+
+
+def fill_cache(tmp_path, profiles=3, lists=2):
+    site = StandInSite(BASE_URL, lists=lists, profiles=100, rows_per_list=10, page_size=10,
+                       profile_template=PROFILE_HTML, expandable=0)
+    cache = PageCache(str(tmp_path / 'cache'))
+    for n in range(profiles):
+        cache.put(f'{BASE_URL}/investors/investor-{n}', site.profile_page(n))
+    for list_id in range(lists):
+        cache.put(f'{BASE_URL}/investor-lists/list-{list_id}', site.list_page(list_id))
+    return cache
+
+
+def test_reparse_twice_replaces_profiles(tmp_path):
+    cache = fill_cache(tmp_path)
+    sink = CsvSink(str(tmp_path))
+    assert reparse(cache, 'profile', sink, workers=1) == 3
+    # A second pass, as after a parser fix, writes every profile again instead of skipping saved URLs
+    written = []
+    original = sink.write_profiles
+    sink.write_profiles = lambda rows, replace=False: written.append(original(rows, replace=replace))
+    assert reparse(cache, 'profile', sink, workers=1) == 3
+    assert written == [(3, 3)]
+    sink.profiles.compact()
+    assert len(pd.read_csv(sink.profiles.output_file)) == 3
+    cache.close()
+
+
+def test_reparse_twice_does_not_duplicate_investors(tmp_path):
+    cache = fill_cache(tmp_path)
+    sink = CsvSink(str(tmp_path))
+    reparse(cache, 'list', sink, workers=1)
+    first = pd.read_csv(sink.investors_filename)
+    reparse(cache, 'list', sink, workers=1)
+    second = pd.read_csv(sink.investors_filename)
+    assert len(first) == 20
+    assert len(second) == len(first)
+    assert len(pd.read_csv(sink.raw_filename)) == 2
+    cache.close()
+
+
+class CollectingSink:
+    def __init__(self):
+        self.profiles = []
+
+    def write_profiles(self, rows, replace=False):
+        self.profiles.extend(rows)
+        return len(rows), len(self.profiles)
+
+
+def test_process_pool_parses_the_same_profiles_as_one_process(tmp_path):
+    cache = fill_cache(tmp_path, profiles=7)
+    items = [(url, cache._blob_path(content_hash)) for url, _, content_hash in cache.latest('profile')]
+    serial, pooled = CollectingSink(), CollectingSink()
+    assert parse_pages(items, 'profile', serial, workers=1, chunk_size=2) == 7
+    assert parse_pages(items, 'profile', pooled, workers=2, chunk_size=2) == 7
+    strip = lambda rows: sorted((dict(r, timestamp=None) for r in rows), key=lambda r: r['url'])
+    assert strip(pooled.profiles) == strip(serial.profiles)
+    assert {r['name'] for r in serial.profiles} == {f'Investor {n}' for n in range(7)}
+    cache.close()
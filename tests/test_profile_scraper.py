@@ -0,0 +1,85 @@
+import os
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from profile_scraper import ProfileScraper
+from rate_control import RateController
+
+PROFILE_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profile.html')
+
+
+class FakeDriver:
+    """Just enough of a Chrome driver to load one settled profile page"""
+
+    def __init__(self, html):
+        self.page_source = html
+        self.current_url = 'about:blank'
+
+    def get(self, url):
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        if 'document.readyState' in script:
+            return {'ready': True, 'pending': 0, 'idle_ms': 10000}
+        if 'querySelectorAll' in script:
+            return 0
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def find_element(self, by, value):
+        raise NoSuchElementException(value)
+
+    def get_log(self, kind):
+        return []
+
+    def quit(self):
+        pass
+
+
+class FakeFactory:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get(self):
+        return self.driver
+
+
+@pytest.mark.parametrize('capture_network', [False, True])
+def test_scrape_profile_in_browser(tmp_path, capture_network):
+    with open(PROFILE_HTML, 'r', encoding='utf-8') as f:
+        driver = FakeDriver(f.read())
+    scraper = ProfileScraper(str(tmp_path), driver_factory=FakeFactory(driver), capture_network=capture_network,
+                             rate=RateController(start_rate=100, max_rate=100), batch_size=1)
+    url = 'https://signal.nfx.com/investors/jane-doe'
+    try:
+        assert scraper.scrape_profile(url)
+    finally:
+        scraper.sink.close()
+        scraper.progress.close()
+    assert scraper.capture_network is capture_network
+    assert scraper.progress.urls('success') == {url}
+
+
+def test_scrape_profile_honours_fast_parser_and_prints_nothing(tmp_path, monkeypatch, capsys):
+    import fast_profile_parser
+
+    calls = []
+    extract = fast_profile_parser.FastProfileParser.extract_profile_data
+    monkeypatch.setattr(fast_profile_parser.FastProfileParser, 'extract_profile_data',
+                        lambda self, root: calls.append(root) or extract(self, root))
+    monkeypatch.setattr(ProfileScraper, 'extract_profile_data',
+                        lambda self, soup: pytest.fail('BeautifulSoup extractor used with fast_parser'))
+    with open(PROFILE_HTML, 'r', encoding='utf-8') as f:
+        driver = FakeDriver(f.read())
+    scraper = ProfileScraper(str(tmp_path), driver_factory=FakeFactory(driver), fast_parser=True,
+                             rate=RateController(start_rate=100, max_rate=100), batch_size=1)
+    try:
+        assert scraper.scrape_profile('https://signal.nfx.com/investors/jane-doe')
+    finally:
+        scraper.sink.close()
+        scraper.progress.close()
+    assert len(calls) == 1
+    assert capsys.readouterr().out == ''
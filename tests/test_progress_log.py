@@ -0,0 +1,56 @@
+import json
+
+from progress_log import ProgressLog
+
+
+def test_journal_replays_after_a_truncated_line(tmp_path):
+    path = str(tmp_path / 'progress.log')
+    progress = ProgressLog(path)
+    progress.mark('https://signal.nfx.com/investors/a')
+    progress.mark('https://signal.nfx.com/investors/b', 'failed', 'Timed out')
+    progress.close()
+    # A crash mid-write leaves half a record without its newline
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://signal.nfx.com/investors/c", "sta')
+
+    progress = ProgressLog(path)
+    assert progress.urls() == {'https://signal.nfx.com/investors/a', 'https://signal.nfx.com/investors/b'}
+    assert progress.status('https://signal.nfx.com/investors/b') == 'failed'
+    assert progress.is_scraped('https://signal.nfx.com/investors/a')
+    progress.mark('https://signal.nfx.com/investors/b')
+    progress.close()
+
+    # The record after the torn line starts on its own line and replays
+    progress = ProgressLog(path)
+    assert progress.urls('success') == {'https://signal.nfx.com/investors/a', 'https://signal.nfx.com/investors/b'}
+    progress.close()
+
+
+def test_compact_keeps_the_latest_status_per_url(tmp_path):
+    path = str(tmp_path / 'progress.log')
+    progress = ProgressLog(path)
+    for status in ('failed', 'failed', 'success'):
+        progress.mark('https://signal.nfx.com/investors/a', status)
+    progress.compact()
+    progress.mark('https://signal.nfx.com/investors/b')
+    progress.close()
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [(r['url'][-1], r['status']) for r in records] == [('a', 'success'), ('b', 'success')]
+
+
+def test_legacy_progress_is_imported_once(tmp_path):
+    legacy_json = tmp_path / 'progress.json'
+    legacy_json.write_text(json.dumps(['https://signal.nfx.com/investor-lists/a']))
+    legacy_csv = tmp_path / 'progress.csv'
+    legacy_csv.write_text('url,status\nhttps://signal.nfx.com/investors/b,failed\n')
+    path = str(tmp_path / 'progress.log')
+    progress = ProgressLog(path, legacy_json=str(legacy_json), legacy_csv=str(legacy_csv))
+    assert progress.status('https://signal.nfx.com/investor-lists/a') == 'success'
+    assert progress.status('https://signal.nfx.com/investors/b') == 'failed'
+    progress.close()
+
+    legacy_json.write_text(json.dumps(['https://signal.nfx.com/investor-lists/z']))
+    progress = ProgressLog(path, legacy_json=str(legacy_json), legacy_csv=str(legacy_csv))
+    assert len(progress) == 2
+    progress.close()
@@ -0,0 +1,52 @@
+import pytest
+
+from http_fetcher import HttpFetcher
+from rate_control import RateController
+
+URL = 'https://signal.nfx.com/investors/a'
+
+
+def test_additive_increase_multiplicative_decrease():
+    rate = RateController(start_rate=0.5, max_rate=1.0, min_rate=0.1, increase=0.2, decrease=0.5, jitter=0)
+    rate.success(URL, elapsed=0.1)
+    assert rate.rate(URL) == pytest.approx(0.7)
+    for _ in range(5):
+        rate.success(URL)
+    assert rate.rate(URL) == 1.0
+    rate.failure(URL, reason='status 429')
+    assert rate.rate(URL) == 0.5
+    rate.success(URL, elapsed=30)
+    assert rate.rate(URL) == 0.25
+    rate.failure(URL, reason='login redirect', login=True)
+    assert rate.rate(URL) == 0.1
+    rate.failure(URL)
+    assert rate.rate(URL) == 0.1
+    # Hosts are paced independently
+    assert rate.rate('https://example.com/') == 0.5
+
+
+def test_reserve_spaces_requests_by_the_current_rate():
+    rate = RateController(start_rate=2.0, max_rate=2.0, jitter=0)
+    delays = [rate.reserve(URL) for _ in range(3)]
+    assert delays[0] == 0
+    assert delays[1] == pytest.approx(0.5, abs=0.05)
+    assert delays[2] == pytest.approx(1.0, abs=0.05)
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.url = URL
+        self.text = ''
+        self.headers = {}
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_fetcher_backs_off_on_throttling(status, monkeypatch):
+    rate = RateController(start_rate=1.0, max_rate=1.0, min_rate=0.1, jitter=0)
+    fetcher = HttpFetcher(rate=rate)
+    monkeypatch.setattr(rate, 'wait', lambda url: None)
+    monkeypatch.setattr(fetcher.session, 'get', lambda url, **kwargs: StubResponse(status))
+    assert fetcher.fetch(URL) is None
+    assert rate.rate(URL) == 0.5
+    fetcher.close()
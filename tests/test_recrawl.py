@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from http_fetcher import HttpFetcher
+from recrawl import NotModified, RecrawlState
+
+
+def test_lastmod_and_ttl_decide_what_is_due(tmp_path):
+    state = RecrawlState(str(tmp_path / 'recrawl.db'))
+    entries = [('https://signal.nfx.com/investors/a', '2024-01-01'), ('https://signal.nfx.com/investors/b', '2024-01-01')]
+    assert list(state.select(entries)) == ['https://signal.nfx.com/investors/a', 'https://signal.nfx.com/investors/b']
+    state.commit('https://signal.nfx.com/investors/a')
+    # b was fetched but never committed (e.g. it failed to parse), so it stays due
+    state.observe('https://signal.nfx.com/investors/b', etag='"b"')
+
+    assert list(state.select(entries)) == ['https://signal.nfx.com/investors/b']
+    assert list(state.select([('https://signal.nfx.com/investors/a', '2024-02-01')])) == ['https://signal.nfx.com/investors/a']
+    assert state.stats == {'due': 4, 'skipped': 1, 'unchanged': 0}
+    state.close()
+
+    expired = RecrawlState(str(tmp_path / 'recrawl.db'), ttl_days=0)
+    time.sleep(0.01)
+    assert list(expired.select([('https://signal.nfx.com/investors/a', None)])) == ['https://signal.nfx.com/investors/a']
+    expired.close()
+
+
+def wait_for(stats, key):
+    # The stand-in counts a response after writing it
+    deadline = time.monotonic() + 2
+    while key not in stats and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return stats.get(key)
+
+
+def test_unchanged_page_is_not_fetched_again(tmp_path, stand_in):
+    site = stand_in(profiles=5)
+    url = f'{site.base_url}/investors/investor-1'
+    state = RecrawlState(str(tmp_path / 'recrawl.db'))
+    fetcher = HttpFetcher(recrawl=state)
+
+    html = fetcher.fetch_if_changed(url)
+    assert '<html' in html.lower()
+    assert state.validators(url) == {}
+    state.commit(url)
+    assert 'If-None-Match' in state.validators(url)
+
+    with pytest.raises(NotModified):
+        fetcher.fetch_if_changed(url)
+    assert wait_for(site.stats, 'profile 304') == 1
+    assert state.stats['unchanged'] == 1
+    fetcher.close()
+    state.close()
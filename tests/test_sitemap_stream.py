@@ -0,0 +1,43 @@
+import gzip
+
+from sitemap_stream import SitemapStream, is_investor_list, is_investor_profile
+
+URLSET = ('<?xml version="1.0" encoding="UTF-8"?>'
+          '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+          'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">{}</urlset>')
+
+
+def url_entry(loc, lastmod=None):
+    lastmod = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+    # The image extension's <image:loc> must not be read as a page URL
+    return f'<url><loc>{loc}</loc>{lastmod}<image:image><image:loc>{loc}.jpg</image:loc></image:image></url>'
+
+
+def test_local_index_with_gzipped_parts(tmp_path):
+    profiles = [f'https://signal.nfx.com/investors/investor-{n}' for n in range(500)]
+    with gzip.open(tmp_path / 'sitemap-profiles.xml.gz', 'wt', encoding='utf-8') as f:
+        f.write(URLSET.format(''.join(url_entry(url, '2024-01-02') for url in profiles)))
+    (tmp_path / 'sitemap-lists.xml').write_text(
+        URLSET.format(url_entry('https://signal.nfx.com/investor-lists/top-seed-investors')))
+    (tmp_path / 'sitemap.xml').write_text(
+        '<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        # Children resolve to the files next to the index, as in the sitemap.xml/ folder
+        '<sitemap><loc>https://signal.nfx.com/sitemap-lists.xml</loc></sitemap>'
+        '<sitemap><loc>https://signal.nfx.com/sitemap-profiles.xml.gz</loc></sitemap>'
+        '</sitemapindex>')
+
+    stream = SitemapStream(str(tmp_path / 'sitemap.xml'))
+    entries = list(stream.entries())
+    assert entries[0] == ('https://signal.nfx.com/investor-lists/top-seed-investors', None)
+    assert entries[1:] == [(url, '2024-01-02') for url in profiles]
+    assert list(stream.urls(is_investor_list)) == ['https://signal.nfx.com/investor-lists/top-seed-investors']
+    assert sum(1 for _ in stream.urls(is_investor_profile)) == 500
+
+
+def test_remote_gzipped_sitemaps(stand_in):
+    site = stand_in(lists=3, profiles=40, gzip_sitemaps=True)
+    stream = SitemapStream(f'{site.base_url}/sitemap.xml')
+    urls = stream.urls(is_investor_profile)
+    assert next(urls) == f'{site.base_url}/investors/investor-0'
+    assert len(list(urls)) == 39
+    assert len(list(stream.urls(is_investor_list))) == 3
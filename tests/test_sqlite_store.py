@@ -0,0 +1,53 @@
+import sqlite3
+
+from sqlite_store import SQLiteStore
+
+
+def committed(db_path, table):
+    # A second connection only sees committed transactions
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def investor(n):
+    return {'name': f'Investor {n}', 'company': f'Firm {n}', 'role': 'Partner',
+            'profile_url': f'https://signal.nfx.com/investors/investor-{n}', 'categories': ['Fintech']}
+
+
+def test_writes_are_committed_in_batches(tmp_path):
+    db_path = str(tmp_path / 'scraper.db')
+    store = SQLiteStore(db_path, batch_size=5)
+    store.write_investors([investor(n) for n in range(3)])
+    store.write_error('https://signal.nfx.com/investors/x', 'Timed out')
+    assert committed(db_path, 'investors') == 0
+    store.write_raw([{'url': 'https://signal.nfx.com/investor-lists/a', 'raw_text': 'INVESTORS'}])
+    assert committed(db_path, 'investors') == 3
+    assert committed(db_path, 'errors') == 1
+
+    store.write_investors([investor(3)])
+    assert committed(db_path, 'investors') == 3
+    store.flush()
+    assert committed(db_path, 'investors') == 4
+    store.mark('https://signal.nfx.com/investor-lists/a')
+    store.close()
+    assert committed(db_path, 'crawl_status') == 1
+
+
+def test_profiles_upsert_and_progress(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'scraper.db'))
+    url = 'https://signal.nfx.com/investors/investor-1'
+    profile = {'url': url, 'name': 'Investor 1', 'sector_rankings': ['Fintech', 'SaaS'],
+               'all_previous_investments': [{'company': 'Acme', 'stage': 'Seed'}]}
+    assert store.write_profiles([profile]) == (1, 1)
+    assert store.write_profiles([dict(profile, name='Investor One', sector_rankings=['SaaS'])]) == (0, 1)
+    assert store.conn.execute('SELECT name FROM profiles').fetchone()[0] == 'Investor One'
+    assert store.conn.execute('SELECT COUNT(*) FROM profile_sectors').fetchone()[0] == 1
+
+    assert not store.is_scraped(url)
+    store.mark(url, 'failed', 'Timed out')
+    assert store.is_scraped(url) and url in store
+    assert store.urls('failed') == {url}
+    store.close()
@@ -0,0 +1,58 @@
+import json
+import time
+
+import requests
+
+from stand_in_site import SESSION_COOKIE
+
+
+def get(site, path, **kwargs):
+    return requests.get(f'{site.base_url}{path}', timeout=5, allow_redirects=False, **kwargs)
+
+
+def test_list_pages_load_more_until_done(stand_in):
+    site = stand_in(lists=2, profiles=100, rows_per_list=50, page_size=20)
+    page = get(site, '/investor-lists/list-1')
+    assert page.status_code == 200
+    assert 'Load More Investors' in page.text
+    done = [json.loads(get(site, f'/investor-lists/list-1/rows?offset={offset}').text)['done']
+               for offset in (20, 40)]
+    assert done == [False, True]
+    assert get(site, '/investor-lists/list-2').status_code == 404
+
+
+def test_profile_etag_answers_304(stand_in):
+    site = stand_in(profiles=3)
+    first = get(site, '/investors/investor-2')
+    assert first.status_code == 200
+    assert 'Investor 2' in first.text
+    second = get(site, '/investors/investor-2', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert second.content == b''
+
+
+def test_injected_errors_and_login_wall(stand_in):
+    failing = stand_in(profiles=3, error_rate=1)
+    response = get(failing, '/investors/investor-0')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+    walled = stand_in(profiles=3, require_login=True)
+    redirect = get(walled, '/investors/investor-0')
+    assert redirect.status_code == 302
+    assert redirect.headers['Location'] == '/login'
+    assert SESSION_COOKIE in get(walled, '/login').text
+    assert get(walled, '/investors/investor-0', cookies={SESSION_COOKIE: '1'}).status_code == 200
+
+
+def test_stats_count_served_pages(stand_in):
+    site = stand_in(profiles=3)
+    for n in range(3):
+        get(site, f'/investors/investor-{n}')
+    # The server counts a response after sending it
+    deadline = time.monotonic() + 2
+    while site.stats.get('profile 200', 0) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    summary = get(site, '/_stats').json()
+    assert summary['pages_served'] == 3
+    assert summary['responses']['profile 200'] == 3
@@ -0,0 +1,36 @@
+import time
+
+from work_queue import RemoteQueue, WorkQueue, run_worker, serve
+
+
+def test_expired_lease_is_requeued(tmp_path):
+    work_queue = WorkQueue(str(tmp_path / 'queue.db'), lease_seconds=0.2)
+    work_queue.enqueue(['a', 'b'], 'lists')
+    assert work_queue.claim('w1', 'lists', 2) == ['a', 'b']
+    assert work_queue.claim('w2', 'lists', 2) == []
+    time.sleep(0.3)
+    assert work_queue.claim('w2', 'lists', 2) == ['a', 'b']
+    work_queue.close()
+
+
+def test_remote_worker_heartbeats_at_the_coordinators_lease(tmp_path):
+    work_queue = WorkQueue(str(tmp_path / 'queue.db'), lease_seconds=0.6)
+    work_queue.enqueue(['a'], 'profiles')
+    server = serve(work_queue, port=0)
+    remote = RemoteQueue(f'http://127.0.0.1:{server.server_address[1]}')
+    try:
+        assert remote.lease_seconds == 0.6
+
+        def slow(urls):
+            # Outlives the lease several times over; renewals must keep it from being re-queued
+            time.sleep(1.5)
+            assert work_queue.claim('other', 'profiles', 1) == []
+            return urls
+
+        stats = run_worker(remote, slow, 'profiles', batch_size=1, worker='w1', poll=0.1)
+        assert stats['succeeded'] == 1
+        assert work_queue.stats('profiles')['done'] == 1
+    finally:
+        server.shutdown()
+        remote.close()
+        work_queue.close()
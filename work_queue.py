@@ -0,0 +1,470 @@
+import argparse
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_queue_claim ON queue(kind, status, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_queue_worker ON queue(worker, status);
+"""
+
+DEFAULT_QUEUE_DB = os.path.join('output', 'queue.db')
+DEFAULT_PORT = 8800
+
+# Remote enqueues are sent in chunks so a whole sitemap never sits in one request
+ENQUEUE_CHUNK = 1000
+
+
+def worker_name() -> str:
+    """Identifies this process in leases: hostname and pid"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    def __init__(self, db_path: str = DEFAULT_QUEUE_DB, lease_seconds: float = 900, max_attempts: int = 3):
+        """
+        SQLite work queue of crawl URLs with leases
+
+        A claimed URL is leased to one worker until lease_seconds pass; the
+        worker acks it when done, fails it to give it back, or extends the lease
+        while it is still working. A lease that runs out (the worker crashed or
+        lost its machine) puts the URL back in the queue on the next claim, until
+        it has been attempted max_attempts times.
+
+        Several processes may share the database file on one machine. Workers on
+        other machines should reach it through serve() / RemoteQueue, since
+        SQLite locking over network filesystems is not reliable.
+
+        Args:
+            db_path (str): Queue database path
+            lease_seconds (float): How long a claim lasts without an extend()
+            max_attempts (int): Claims per URL before it is marked failed
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, int(max_attempts))
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.RLock()
+        # Autocommit mode, so claims can take the write lock up front with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def _transaction(self, sql_calls):
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = sql_calls(self.conn)
+                self.conn.execute('COMMIT')
+                return result
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+    def enqueue(self, urls, kind: str) -> int:
+        """Add URLs not already queued (in any state); returns how many were new"""
+        added = 0
+        batch = []
+
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany('INSERT OR IGNORE INTO queue (url, kind, updated_at) VALUES (?, ?, ?)',
+                             [(url, kind, time.time()) for url in batch])
+            return conn.total_changes - before
+
+        for url in urls:
+            batch.append(url)
+            if len(batch) >= ENQUEUE_CHUNK:
+                added += self._transaction(insert)
+                batch = []
+        if batch:
+            added += self._transaction(insert)
+        return added
+
+    def claim(self, worker: str, kind: str, count: int = 1) -> list:
+        """Lease up to count pending URLs of kind to worker, re-queueing expired leases first"""
+        def take(conn):
+            now = time.time()
+            expired = conn.execute(
+                "UPDATE queue SET status='failed', worker=NULL, error='lease expired', updated_at=? "
+                "WHERE kind=? AND status='leased' AND lease_expires < ? AND attempts >= ?",
+                (now, kind, now, self.max_attempts)).rowcount
+            requeued = conn.execute(
+                "UPDATE queue SET status='pending', worker=NULL, updated_at=? "
+                "WHERE kind=? AND status='leased' AND lease_expires < ?",
+                (now, kind, now)).rowcount
+            if expired or requeued:
+                logger.warning(f"Expired leases: {requeued} {kind} URLs re-queued, {expired} given up")
+            urls = [row[0] for row in conn.execute(
+                "SELECT url FROM queue WHERE kind=? AND status='pending' ORDER BY rowid LIMIT ?",
+                (kind, max(1, int(count))))]
+            conn.executemany(
+                "UPDATE queue SET status='leased', worker=?, lease_expires=?, attempts=attempts+1, updated_at=? "
+                "WHERE url=?",
+                [(worker, now + self.lease_seconds, now, url) for url in urls])
+            return urls
+
+        return self._transaction(take)
+
+    def extend(self, worker: str, urls) -> int:
+        """Renew worker's leases on urls; returns how many it still held"""
+        urls = list(urls)
+        if not urls:
+            return 0
+        now = time.time()
+        with self.lock:
+            return self.conn.executemany(
+                "UPDATE queue SET lease_expires=?, updated_at=? WHERE url=? AND worker=? AND status='leased'",
+                [(now + self.lease_seconds, now, url, worker) for url in urls]).rowcount
+
+    def ack(self, worker: str, urls) -> int:
+        """Mark urls done; a URL finished after its lease moved to another worker is still done"""
+        now = time.time()
+        with self.lock:
+            return self.conn.executemany(
+                "UPDATE queue SET status='done', worker=?, lease_expires=NULL, error=NULL, updated_at=? "
+                "WHERE url=? AND status != 'done'",
+                [(worker, now, url) for url in urls]).rowcount
+
+    def fail(self, worker: str, url: str, error: str = None) -> str:
+        """Give a leased URL back for another attempt, or mark it failed once out of attempts"""
+        def release(conn):
+            row = conn.execute("SELECT attempts FROM queue WHERE url=? AND worker=? AND status='leased'",
+                               (url, worker)).fetchone()
+            if row is None:
+                return None
+            status = 'failed' if row[0] >= self.max_attempts else 'pending'
+            conn.execute("UPDATE queue SET status=?, worker=NULL, lease_expires=NULL, error=?, updated_at=? "
+                         "WHERE url=?", (status, error, time.time(), url))
+            return status
+
+        return self._transaction(release)
+
+    def release(self, worker: str) -> int:
+        """Return every URL still leased to worker without counting the attempt (clean shutdown)"""
+        with self.lock:
+            return self.conn.execute(
+                "UPDATE queue SET status='pending', worker=NULL, lease_expires=NULL, "
+                "attempts=MAX(attempts - 1, 0), updated_at=? WHERE worker=? AND status='leased'",
+                (time.time(), worker)).rowcount
+
+    def retry_failed(self, kind: str = None) -> int:
+        """Put failed URLs back in the queue with fresh attempts"""
+        with self.lock:
+            query = "UPDATE queue SET status='pending', attempts=0, error=NULL, updated_at=? WHERE status='failed'"
+            params = [time.time()]
+            if kind:
+                query += ' AND kind=?'
+                params.append(kind)
+            return self.conn.execute(query, params).rowcount
+
+    def stats(self, kind: str = None) -> dict:
+        """URL counts per status, plus how many leases have already expired"""
+        with self.lock:
+            where, params = ('WHERE kind=?', (kind,)) if kind else ('', ())
+            counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+            for status, count in self.conn.execute(
+                    f'SELECT status, COUNT(*) FROM queue {where} GROUP BY status', params):
+                counts[status] = count
+            expired_where = f"{where + ' AND' if where else 'WHERE'} status='leased' AND lease_expires < ?"
+            counts['expired'] = self.conn.execute(
+                f'SELECT COUNT(*) FROM queue {expired_where}', params + (time.time(),)).fetchone()[0]
+        return counts
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+# Methods a coordinator exposes to remote workers
+REMOTE_METHODS = ('enqueue', 'claim', 'extend', 'ack', 'fail', 'release', 'retry_failed', 'stats')
+
+
+class RemoteQueue:
+    def __init__(self, url: str, timeout: float = 30):
+        """
+        Client for a WorkQueue served by a coordinator (see serve())
+
+        Args:
+            url (str): Coordinator address, e.g. http://10.0.0.5:8800
+            timeout (float): Seconds to wait for each call
+        """
+        import requests
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._config = None
+
+    @property
+    def lease_seconds(self) -> float:
+        """The coordinator's lease length, so heartbeats keep pace with it"""
+        if self._config is None:
+            response = self.session.get(f'{self.url}/config', timeout=self.timeout)
+            response.raise_for_status()
+            self._config = response.json()['result']
+        return self._config['lease_seconds']
+
+    def _call(self, method: str, **params):
+        response = self.session.post(f'{self.url}/{method}', json=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['result']
+
+    def enqueue(self, urls, kind: str) -> int:
+        added = 0
+        batch = []
+        for url in urls:
+            batch.append(url)
+            if len(batch) >= ENQUEUE_CHUNK:
+                added += self._call('enqueue', urls=batch, kind=kind)
+                batch = []
+        if batch:
+            added += self._call('enqueue', urls=batch, kind=kind)
+        return added
+
+    def claim(self, worker: str, kind: str, count: int = 1) -> list:
+        return self._call('claim', worker=worker, kind=kind, count=count)
+
+    def extend(self, worker: str, urls) -> int:
+        return self._call('extend', worker=worker, urls=list(urls))
+
+    def ack(self, worker: str, urls) -> int:
+        return self._call('ack', worker=worker, urls=list(urls))
+
+    def fail(self, worker: str, url: str, error: str = None) -> str:
+        return self._call('fail', worker=worker, url=url, error=error)
+
+    def release(self, worker: str) -> int:
+        return self._call('release', worker=worker)
+
+    def retry_failed(self, kind: str = None) -> int:
+        return self._call('retry_failed', kind=kind)
+
+    def stats(self, kind: str = None) -> dict:
+        return self._call('stats', kind=kind)
+
+    def close(self):
+        self.session.close()
+
+
+def open_queue(location: str = DEFAULT_QUEUE_DB, **kwargs):
+    """RemoteQueue for an http(s) coordinator address, otherwise a WorkQueue on a local database"""
+    if urlparse(location).scheme in ('http', 'https'):
+        return RemoteQueue(location)
+    return WorkQueue(location, **kwargs)
+
+
+def serve(work_queue: WorkQueue, host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+    """Expose work_queue to RemoteQueue workers as JSON over HTTP, from a background thread"""
+
+    class QueueHandler(BaseHTTPRequestHandler):
+        def _reply(self, code: int, payload: dict):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            # Lets an operator or a load balancer check queue progress
+            path = self.path.rstrip('/')
+            if path in ('', '/stats'):
+                self._reply(200, {'result': work_queue.stats()})
+            elif path == '/config':
+                self._reply(200, {'result': {'lease_seconds': work_queue.lease_seconds,
+                                             'max_attempts': work_queue.max_attempts}})
+            else:
+                self._reply(404, {'error': 'not found'})
+
+        def do_POST(self):
+            method = self.path.strip('/')
+            if method not in REMOTE_METHODS:
+                self._reply(404, {'error': f'unknown method {method}'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                params = json.loads(self.rfile.read(length) or b'{}')
+                self._reply(200, {'result': getattr(work_queue, method)(**params)})
+            except (TypeError, ValueError) as e:
+                self._reply(400, {'error': str(e)})
+            except sqlite3.Error as e:
+                logger.error(f"Queue {method} failed: {str(e)}")
+                self._reply(500, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), QueueHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Serving work queue {work_queue.db_path} on http://{host}:{port}")
+    return server
+
+
+def run_worker(work_queue, process, kind: str, batch_size: int = 5, worker: str = None,
+               heartbeat: float = None, poll: float = 30, max_errors: int = 5) -> dict:
+    """
+    Claim, process and ack batches of kind until the queue has nothing left
+
+    process(urls) scrapes a batch and returns the URLs that succeeded; the rest
+    are failed back to the queue. While a batch runs its leases are extended
+    every heartbeat seconds (a third of the queue's lease by default; a remote
+    queue reports the coordinator's). When nothing is pending but other workers still hold
+    leases, the worker polls, so it can pick up URLs whose leases expire.
+    """
+    worker = worker or worker_name()
+    if heartbeat is None:
+        heartbeat = work_queue.lease_seconds / 3
+    stats = {'claimed': 0, 'succeeded': 0, 'failed': 0}
+    errors = 0
+    logger.info(f"Worker {worker} taking {kind} URLs in batches of {batch_size}")
+    try:
+        while True:
+            try:
+                urls = work_queue.claim(worker, kind, batch_size)
+                errors = 0
+            except Exception as e:
+                errors += 1
+                logger.error(f"Could not claim work ({errors}/{max_errors}): {str(e)}")
+                if errors >= max_errors:
+                    break
+                time.sleep(poll)
+                continue
+            if not urls:
+                remaining = work_queue.stats(kind)
+                if remaining['leased'] == 0:
+                    break
+                logger.info(f"No pending {kind} URLs; {remaining['leased']} leased elsewhere, waiting {poll:.0f}s")
+                time.sleep(poll)
+                continue
+
+            stats['claimed'] += len(urls)
+            stop = threading.Event()
+
+            def keep_alive():
+                while not stop.wait(heartbeat):
+                    try:
+                        work_queue.extend(worker, urls)
+                    except Exception as e:
+                        logger.warning(f"Lease renewal failed: {str(e)}")
+
+            renewer = threading.Thread(target=keep_alive, daemon=True)
+            renewer.start()
+            try:
+                succeeded = set(process(urls) or ())
+            except Exception as e:
+                logger.error(f"Batch failed: {str(e)}")
+                succeeded = set()
+            finally:
+                stop.set()
+                renewer.join()
+
+            done = [url for url in urls if url in succeeded]
+            if done:
+                work_queue.ack(worker, done)
+            for url in urls:
+                if url not in succeeded:
+                    work_queue.fail(worker, url, 'scrape failed')
+            stats['succeeded'] += len(done)
+            stats['failed'] += len(urls) - len(done)
+    finally:
+        # Anything still leased (e.g. after Ctrl+C) goes straight back instead of waiting out the lease
+        try:
+            work_queue.release(worker)
+        except Exception as e:
+            logger.warning(f"Could not release leases for {worker}: {str(e)}")
+    logger.info(f"Worker {worker} finished: {stats['claimed']} claimed, {stats['succeeded']} succeeded, "
+                f"{stats['failed']} failed")
+    return stats
+
+
+def add_queue_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--queue', default=None,
+                        help='Take URLs from a shared work queue instead of the sitemap: a queue database path, '
+                             'or the http:// address of a work_queue.py coordinator')
+    parser.add_argument('--queue-batch', type=int, default=5, help='URLs claimed from the queue at a time')
+
+
+def main():
+    from sitemap_stream import SitemapStream, is_investor_list, is_investor_profile
+
+    parser = argparse.ArgumentParser(
+        description='Coordinate a crawl across worker machines with a shared work queue',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            'example:\n'
+            '  python work_queue.py enqueue lists --sitemap https://signal.nfx.com/sitemap.xml\n'
+            '  python work_queue.py serve --host 0.0.0.0\n'
+            '  python scraper.py --queue http://<coordinator>:8800   # on each worker\n'
+            '  python work_queue.py stats\n\n'
+            'Workers (scraper.py, profile_scraper.py) claim URLs in small batches under a\n'
+            'lease, renew it while they work and ack URLs once they are saved. Leases of\n'
+            'crashed workers expire after --lease-seconds and their URLs go to another\n'
+            'worker, up to --max-attempts times. On the coordinator machine --queue can\n'
+            'also be the database path.'))
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_DB, help='Queue database path or coordinator address')
+    parser.add_argument('--lease-seconds', type=float, default=900,
+                        help='Seconds a claimed URL stays leased without a heartbeat')
+    parser.add_argument('--max-attempts', type=int, default=3, help='Claims per URL before it is marked failed')
+    commands = parser.add_subparsers(dest='command', required=True)
+    enqueue = commands.add_parser('enqueue', help='Queue the sitemap URLs of one kind')
+    enqueue.add_argument('kind', choices=['lists', 'profiles'])
+    enqueue.add_argument('--sitemap', default='sitemap.xml/sitemap.xml', help='Path or URL of the sitemap')
+    coordinator = commands.add_parser('serve', help='Serve the queue to workers on other machines')
+    coordinator.add_argument('--host', default='127.0.0.1',
+                             help='Interface to listen on; use 0.0.0.0 to accept workers on a private network')
+    coordinator.add_argument('--port', type=int, default=DEFAULT_PORT)
+    commands.add_parser('stats', help='Show URL counts per kind and status')
+    retry = commands.add_parser('retry-failed', help='Re-queue URLs that ran out of attempts')
+    retry.add_argument('kind', nargs='?', choices=['lists', 'profiles'])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'serve' and urlparse(args.queue).scheme:
+        parser.error('serve needs a local queue database, not a coordinator address')
+    work_queue = open_queue(args.queue, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+    if args.command == 'enqueue':
+        predicate = is_investor_list if args.kind == 'lists' else is_investor_profile
+        added = work_queue.enqueue(SitemapStream(args.sitemap).urls(predicate), args.kind)
+        logger.info(f"Queued {added} new {args.kind} URLs")
+    elif args.command == 'serve':
+        server = serve(work_queue, args.host, args.port)
+        try:
+            while True:
+                time.sleep(60)
+                logger.info(f"Queue: {work_queue.stats()}")
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args.command == 'retry-failed':
+        logger.info(f"Re-queued {work_queue.retry_failed(args.kind)} failed URLs")
+    else:
+        for kind in ('lists', 'profiles'):
+            print(kind, json.dumps(work_queue.stats(kind)))
+    work_queue.close()
+
+
+if __name__ == '__main__':
+    main()